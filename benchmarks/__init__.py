@@ -0,0 +1,6 @@
+# Benchmarks of matplotlib_venn_wordcloud, which follow the airspeed
+# velocity (asv) conventions (see asv.conf.json); run them with
+#
+#     asv run
+#
+# or run each module as a script, e.g. python benchmarks/bench_pipeline.py
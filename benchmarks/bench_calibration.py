@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Compare the exact (two-pass), the coarse, and the estimated font size calibration.
+
+The benchmark classes follow the airspeed velocity (asv) conventions;
+alternatively, run this file as a script:
+
+    python benchmarks/bench_calibration.py
+
+That the font sizes chosen with the coarse calibration are within the
+documented tolerance of the exact calibration is checked by
+tests/test_calibration.py.
+"""
+
+import time
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from matplotlib_venn_wordcloud import venn2_wordcloud, venn3_wordcloud
+
+
+def get_ex2_sets():
+    HH = ['GLI1', 'PTCH1', 'PTCH2', 'WNT5A', 'HHIP1', 'MYCN', 'CCND1', 'CCND2', 'BCL2', 'CFLAR', 'FOXF1', 'FOXL1', 'PRDM1', 'JAG2', 'GREM1']
+    Wnt = ['GLI1', 'PTCH1', 'WNT5A', 'HHIP1', 'MYCN', 'CCND1', 'WNT7A', 'WNT2', 'CDK1', 'CK1']
+    CC = ['GLI1', 'CCNDA', 'BMP4', 'BMP7', 'MTOC2', 'CCND1']
+    return [set(HH), set(Wnt), set(CC)], None
+
+
+def get_ex3_sets():
+    just_dem = ["sincerely", "women", "service", "newsletter", "program", "families",
+                "community", "funding", "important", "million", "department"]
+    dem_and_rep = ["country", "make", "support", "state", "people", "jobs", "American",
+                   "care", "health", "president", "work", "veterans", "tax", "survey",
+                   "years", "need", "economy"]
+    just_rep = ["security", "nation", "Obama", "energy", "law", "spending",
+                "budget", "states", "committee", "passed", "job", "business"]
+    words = just_dem + dem_and_rep + just_rep
+    rng = np.random.RandomState(42)
+    frequencies = rng.choice(1. / np.arange(1000, 10000), size=len(words))
+    return [set(just_dem + dem_and_rep), set(just_rep + dem_and_rep)], dict(zip(words, frequencies))
+
+
+def get_random_sets(total_words=5000, seed=42):
+    rng = np.random.RandomState(seed)
+    vocabulary = np.array(['word{}'.format(ii) for ii in range(int(1.6 * total_words))])
+    sets = [set(rng.choice(vocabulary, total_words, replace=False)) for _ in range(2)]
+    frequencies = rng.choice(1. / np.arange(1000, 10000), size=len(vocabulary))
+    return sets, dict(zip(vocabulary, frequencies))
+
+
+INPUTS = {
+    'ex2'  : get_ex2_sets,
+    'ex3'  : get_ex3_sets,
+    '5000' : get_random_sets,
+}
+
+
+class TimeCalibration:
+
+    params = (list(INPUTS), ['exact', 'coarse', 'estimate'])
+    param_names = ['input', 'calibration']
+    timeout = 600
+
+    def setup(self, input_name, calibration):
+        self.sets, self.word_to_frequency = INPUTS[input_name]()
+
+    def teardown(self, input_name, calibration):
+        plt.close('all')
+
+    def time_venn_wordcloud(self, input_name, calibration):
+        venn_wordcloud = venn2_wordcloud if len(self.sets) == 2 else venn3_wordcloud
+        venn_wordcloud(self.sets,
+                       word_to_frequency=self.word_to_frequency,
+                       wordcloud_kwargs=dict(random_state=42),
+                       calibration=calibration)
+
+
+if __name__ == '__main__':
+
+    benchmark = TimeCalibration()
+    calibrations = TimeCalibration.params[1]
+    for input_name in INPUTS:
+        durations = dict()
+        for calibration in calibrations:
+            benchmark.setup(input_name, calibration)
+            tic = time.perf_counter()
+            benchmark.time_venn_wordcloud(input_name, calibration)
+            durations[calibration] = time.perf_counter() - tic
+            benchmark.teardown(input_name, calibration)
+        print('{:>6}: '.format(input_name) + ', '.join(
+            '{} {:6.2f}s ({:4.1f}x)'.format(calibration, durations[calibration], durations['exact'] / durations[calibration])
+            for calibration in calibrations))
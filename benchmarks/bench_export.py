@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Compare exporting the layouts of a diagram (see the .export_layout method
+of the diagrams returned by venn2_wordcloud and venn3_wordcloud) with
+rendering the diagram to PNG, i.e. the size of the payload and the time
+it takes to produce it, and time drawing an exported layout (load_layout).
+
+The benchmark classes follow the airspeed velocity (asv) conventions;
+alternatively, run this file as a script, which also checks that loading
+an exported layout draws the same words at the exported positions:
+
+    python benchmarks/bench_export.py
+"""
+
+import io
+import json
+import time
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from matplotlib_venn_wordcloud import venn2_wordcloud, venn3_wordcloud, load_layout
+
+try: # imported as part of the benchmarks package by asv
+    from .bench_pipeline import get_sets
+except ImportError: # run as a script
+    from bench_pipeline import get_sets
+
+
+def render(sets, word_to_frequency):
+    fig, ax = plt.subplots(1, 1)
+    venn_wordcloud = venn2_wordcloud if len(sets) == 2 else venn3_wordcloud
+    venn = venn_wordcloud(sets,
+                          word_to_frequency=word_to_frequency,
+                          wordcloud_kwargs=dict(random_state=42),
+                          calibration='estimate',
+                          ax=ax)
+    return fig, venn
+
+
+def to_png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png')
+    return buffer.getvalue()
+
+
+class TimeExport:
+
+    params = ([2, 3], [100, 1000])
+    param_names = ['total_sets', 'total_words']
+    timeout = 600
+
+    def setup(self, total_sets, total_words):
+        sets, word_to_frequency = get_sets(total_sets, total_words)
+        self.fig, self.venn = render(sets, word_to_frequency)
+        self.data = self.venn.export_layout()
+
+    def teardown(self, total_sets, total_words):
+        plt.close('all')
+
+    def time_export_layout(self, total_sets, total_words):
+        self.venn.export_layout()
+
+    def time_png(self, total_sets, total_words):
+        to_png(self.fig)
+
+    def time_load_layout(self, total_sets, total_words):
+        fig, ax = plt.subplots(1, 1)
+        load_layout(self.data, ax=ax)
+        fig.canvas.draw()
+
+    def track_json_bytes(self, total_sets, total_words):
+        return len(self.data.encode('utf-8'))
+
+    def track_png_bytes(self, total_sets, total_words):
+        return len(to_png(self.fig))
+
+
+def check_round_trip(venn, data):
+    """
+    Check that the loaded layout contains the placed words of each subset
+    at the exported positions.
+    """
+
+    layout = json.loads(data)
+    fig, ax = plt.subplots(1, 1)
+    word_texts = load_layout(data, ax=ax)
+    for uid, placed in venn.layouts.items():
+        words = layout['subsets'][uid]['words']
+        assert [word for (word, _), _, _, _, _ in placed] == [word for word, _, _, _, _, _ in words], \
+            "Words of subset {} are not exported!".format(uid)
+        positions = np.array([text.get_position() for text in word_texts[uid]]).reshape(-1, 2)
+        assert np.allclose(positions, np.array([[x, y] for _, x, y, _, _, _ in words]).reshape(-1, 2)), \
+            "Words of subset {} are not drawn at the exported positions!".format(uid)
+    plt.close(fig)
+
+
+if __name__ == '__main__':
+
+    for total_sets in TimeExport.params[0]:
+        for total_words in TimeExport.params[1]:
+            sets, word_to_frequency = get_sets(total_sets, total_words)
+            fig, venn = render(sets, word_to_frequency)
+
+            tic = time.perf_counter()
+            data = venn.export_layout()
+            export_duration = time.perf_counter() - tic
+
+            tic = time.perf_counter()
+            png = to_png(fig)
+            png_duration = time.perf_counter() - tic
+
+            check_round_trip(venn, data)
+            plt.close(fig)
+
+            print('{} sets {:>5} words: json {:5.3f}s {:6.1f} kB | png {:5.3f}s {:6.1f} kB'.format(
+                total_sets, total_words, export_duration, len(data.encode('utf-8')) / 1e3,
+                png_duration, len(png) / 1e3))
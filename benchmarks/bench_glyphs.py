@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Time repeated renders of diagrams with overlapping vocabularies, which
+measure and draw the same words at the same font sizes, with and without
+the process-wide caches of text extents and glyph bitmaps.
+
+The benchmark classes follow the airspeed velocity (asv) conventions;
+alternatively, run this file as a script, which also prints the hit
+rates of the caches:
+
+    python benchmarks/bench_glyphs.py
+
+That the words drawn from the cached glyphs are identical to those drawn
+by WordCloud.to_array is checked by tests/test_glyphs.py.
+"""
+
+import time
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from matplotlib_venn_wordcloud import venn3_wordcloud
+from matplotlib_venn_wordcloud._main import _glyph_cache, _text_bbox_cache
+
+try: # imported as part of the benchmarks package by asv
+    from .bench_pipeline import get_sets
+except ImportError: # run as a script
+    from bench_pipeline import get_sets
+
+
+def get_inputs(total_words, total_inputs=3):
+    # different sets with the same word frequencies, such that the same words recur at similar font sizes
+    _, word_to_frequency = get_sets(total_sets=3, total_words=total_words, seed=0)
+    return [(get_sets(total_sets=3, total_words=total_words, seed=seed)[0], word_to_frequency)
+            for seed in range(total_inputs)]
+
+
+def render(sets, word_to_frequency, calibration='exact', layout_engine='wordcloud'):
+    venn = venn3_wordcloud(sets,
+                           word_to_frequency=word_to_frequency,
+                           wordcloud_kwargs=dict(random_state=42),
+                           calibration=calibration,
+                           layout_engine=layout_engine,
+                           profile=True)
+    plt.close('all')
+    return venn
+
+
+def clear_caches():
+    _text_bbox_cache.clear()
+    _glyph_cache.clear()
+
+
+class TimeRepeatedRenders:
+
+    params = ([100, 1000], ['estimate', 'exact'], ['wordcloud', 'numpy'], [False, True])
+    param_names = ['total_words', 'calibration', 'layout_engine', 'warm']
+    number = 1
+    timeout = 600
+
+    def setup(self, total_words, calibration, layout_engine, warm):
+        self.inputs = get_inputs(total_words)
+        clear_caches()
+        if warm:
+            for sets, word_to_frequency in self.inputs:
+                render(sets, word_to_frequency, calibration, layout_engine)
+
+    def time_renders(self, total_words, calibration, layout_engine, warm):
+        for sets, word_to_frequency in self.inputs:
+            render(sets, word_to_frequency, calibration, layout_engine)
+
+
+if __name__ == '__main__':
+
+    for total_words in TimeRepeatedRenders.params[0]:
+        for calibration in TimeRepeatedRenders.params[1]:
+            for layout_engine in TimeRepeatedRenders.params[2]:
+                inputs = get_inputs(total_words)
+                clear_caches()
+                results = []
+                for ii, (sets, word_to_frequency) in enumerate(inputs):
+                    tic = time.perf_counter()
+                    venn = render(sets, word_to_frequency, calibration, layout_engine)
+                    duration = time.perf_counter() - tic
+                    hit_rates = ['{} {:3.0%}'.format(name, counts['hit_rate'] or 0.)
+                                 for name, counts in venn.profile['caches'].items() if name != 'masks']
+                    results.append('{:5.2f}s ({})'.format(duration, ', '.join(hit_rates)))
+                print('{:>5} words {:>8} {:>9}: {}'.format(total_words, calibration, layout_engine, ' | '.join(results)))
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Time the import of the package and of the code paths that plot.
+
+The benchmark functions follow the airspeed velocity (asv) conventions
+(each import is timed in a fresh interpreter); alternatively, run this
+file as a script:
+
+    python benchmarks/bench_import.py
+
+That the heavy dependencies (matplotlib, matplotlib_venn, wordcloud, PIL)
+are not imported by code paths that do not plot anything is checked by
+tests/test_import.py.
+"""
+
+import sys
+import subprocess
+
+
+STATEMENTS = {
+    'package' : "import matplotlib_venn_wordcloud",
+    'main'    : "import matplotlib_venn_wordcloud._main",
+    'venn2'   : "from matplotlib_venn_wordcloud import venn2_wordcloud",
+    'render'  : "from matplotlib_venn_wordcloud import render_to_array; render_to_array([{'a', 'b'}, {'b', 'c'}])",
+}
+
+
+def timeraw_import_package():
+    return STATEMENTS['package']
+
+
+def timeraw_import_main():
+    return STATEMENTS['main']
+
+
+def timeraw_import_venn2_wordcloud():
+    return STATEMENTS['venn2']
+
+
+def get_duration(statement):
+    """
+    Run the statement in a fresh interpreter, and return its duration.
+    """
+
+    code = "\n".join([
+        "import time",
+        "tic = time.perf_counter()",
+        statement,
+        "print(time.perf_counter() - tic)",
+    ])
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    return float(output.splitlines()[-1])
+
+
+if __name__ == '__main__':
+
+    for name, statement in STATEMENTS.items():
+        print('{:>10}: {:6.3f}s'.format(name, get_duration(statement)))
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Compare the bounding box limited, analytic mask rasterization with
+testing every pixel of the axis with Path.contains_points.
+
+The benchmark classes follow the airspeed velocity (asv) conventions;
+alternatively, run this file as a script, which also checks that both
+methods yield identical masks:
+
+    python benchmarks/bench_masks.py
+"""
+
+import time
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from matplotlib_venn import venn2, venn3
+from matplotlib_venn_wordcloud._main import (
+    _AxisImage,
+    _get_path,
+    _get_region_circles,
+    _rasterize,
+)
+
+
+def get_regions(total_sets, seed=42):
+    """
+    Returns the axis image, and the path and circles of each region
+    of a random venn diagram with the given number of sets.
+    """
+    rng = np.random.RandomState(seed)
+    sets = [set(rng.choice(200, rng.randint(1, 150), replace=False)) for _ in range(total_sets)]
+    fig, ax = plt.subplots(1,1)
+    venn = venn2(sets, ax=ax) if total_sets == 2 else venn3(sets, ax=ax)
+    img = _AxisImage(ax)
+    regions = []
+    for uid in ['10', '01', '11'] if total_sets == 2 else ['100', '010', '110', '001', '101', '011', '111']:
+        patch = venn.get_patch_by_id(uid)
+        if patch is not None:
+            regions.append((_get_path(patch), _get_region_circles(venn, uid)))
+    plt.close(fig)
+    return img, regions
+
+
+class TimeMasks:
+
+    params = [2, 3]
+    param_names = ['total_sets']
+
+    def setup(self, total_sets):
+        self.img, self.regions = get_regions(total_sets)
+        self.img.pixel_coordinates # precompute
+
+    def time_contains_points(self, total_sets):
+        for path, _ in self.regions:
+            path.contains_points(self.img.pixel_coordinates)
+
+    def time_rasterize_bbox(self, total_sets):
+        for path, _ in self.regions:
+            _rasterize(self.img, path)
+
+    def time_rasterize_circles(self, total_sets):
+        for path, circles in self.regions:
+            _rasterize(self.img, path, circles)
+
+
+if __name__ == '__main__':
+
+    durations = np.zeros(3)
+    total_regions = 0
+    for seed in range(20):
+        for total_sets in [2, 3]:
+            img, regions = get_regions(total_sets, seed)
+            for path, circles in regions:
+                tic = time.perf_counter()
+                reference = path.contains_points(img.pixel_coordinates).reshape((img.y_resolution, img.x_resolution))
+                durations[0] += time.perf_counter() - tic
+                for ii, args in enumerate([(), (circles,)], 1):
+                    tic = time.perf_counter()
+                    mask = _rasterize(img, path, *args)
+                    durations[ii] += time.perf_counter() - tic
+                    assert np.array_equal(mask, reference), "Masks differ from contains_points result!"
+                total_regions += 1
+
+    print('{} regions, identical masks'.format(total_regions))
+    for name, duration in zip(['contains_points', 'rasterize (bbox)', 'rasterize (circles)'], durations):
+        print('{:>20}: {:6.2f}s'.format(name, duration))
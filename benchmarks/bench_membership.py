@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Time the grouping of words by subset membership, i.e. the work done by
+venn2_wordcloud/venn3_wordcloud before any rendering.
+
+The benchmark classes follow the airspeed velocity (asv) conventions;
+alternatively, run this file as a script, which also checks the result
+against the naive implementation:
+
+    python benchmarks/bench_membership.py
+"""
+
+import time
+import numpy as np
+
+from matplotlib_venn_wordcloud._main import _get_words_by_id
+
+
+def get_sets(total_sets, total_words, seed=42):
+    rng = np.random.RandomState(seed)
+    vocabulary = ['word{}'.format(ii) for ii in range(int(1.6 * total_words))]
+    return [set(rng.choice(vocabulary, total_words, replace=False)) for _ in range(total_sets)]
+
+
+def naive_words_by_id(sets):
+    # previous implementation: format a membership string per word,
+    # then scan all words for each subset
+    words = list(set.union(*sets))
+    word_ids = [''.join('%d' % (word in s) for s in sets) for word in words]
+    return {uid : [word for (word, word_id) in zip(words, word_ids) if word_id==uid] for uid in set(word_ids)}
+
+
+class TimeMembership:
+
+    params = ([2, 3], [1000, 10000, 100000])
+    param_names = ['total_sets', 'total_words']
+
+    def setup(self, total_sets, total_words):
+        self.sets = get_sets(total_sets, total_words)
+
+    def time_get_words_by_id(self, total_sets, total_words):
+        words_by_id = _get_words_by_id(self.sets)
+        for uid in words_by_id:
+            words_by_id[uid]
+
+
+if __name__ == '__main__':
+
+    for total_sets in [2, 3]:
+        for total_words in [1000, 10000, 100000]:
+            sets = get_sets(total_sets, total_words)
+
+            tic = time.perf_counter()
+            expected = naive_words_by_id(sets)
+            naive = time.perf_counter() - tic
+
+            tic = time.perf_counter()
+            result = _get_words_by_id(sets)
+            indexed = time.perf_counter() - tic
+
+            assert set(result) == set(expected)
+            assert all(set(result[uid]) == set(expected[uid]) for uid in expected)
+
+            print('{} sets, {:>6} words: naive {:6.3f}s, indexed {:6.3f}s'.format(
+                total_sets, total_words, naive, indexed))
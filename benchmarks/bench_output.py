@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Time rendering and exporting a diagram with the words drawn into an image
+(output='image') or added as text (output='text'), and compare the sizes
+of the exported vector files.
+
+The benchmark classes follow the airspeed velocity (asv) conventions;
+alternatively, run this file as a script, which also checks that each
+placed word is added as one text artist:
+
+    python benchmarks/bench_output.py
+"""
+
+import io
+import time
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from matplotlib_venn_wordcloud import venn2_wordcloud, venn3_wordcloud
+
+try: # imported as part of the benchmarks package by asv
+    from .bench_pipeline import get_sets
+except ImportError: # run as a script
+    from bench_pipeline import get_sets
+
+
+def render(sets, word_to_frequency, output):
+    fig, ax = plt.subplots(1, 1)
+    venn_wordcloud = venn2_wordcloud if len(sets) == 2 else venn3_wordcloud
+    venn = venn_wordcloud(sets,
+                          word_to_frequency=word_to_frequency,
+                          wordcloud_kwargs=dict(random_state=42),
+                          calibration='estimate',
+                          ax=ax,
+                          output=output)
+    return fig, venn
+
+
+def export(fig, fmt):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt)
+    return len(buffer.getvalue())
+
+
+class TimeOutput:
+
+    params = ([2, 3], [10, 100, 1000], ['image', 'text'])
+    param_names = ['total_sets', 'total_words', 'output']
+    timeout = 600
+
+    def setup(self, total_sets, total_words, output):
+        self.sets, self.word_to_frequency = get_sets(total_sets, total_words)
+        self.fig, _ = render(self.sets, self.word_to_frequency, output)
+
+    def teardown(self, total_sets, total_words, output):
+        plt.close('all')
+
+    def time_render(self, total_sets, total_words, output):
+        render(self.sets, self.word_to_frequency, output)
+
+    def time_export_pdf(self, total_sets, total_words, output):
+        export(self.fig, 'pdf')
+
+    def time_export_svg(self, total_sets, total_words, output):
+        export(self.fig, 'svg')
+
+    def track_pdf_bytes(self, total_sets, total_words, output):
+        return export(self.fig, 'pdf')
+
+
+if __name__ == '__main__':
+
+    for total_sets in TimeOutput.params[0]:
+        for total_words in TimeOutput.params[1]:
+            sets, word_to_frequency = get_sets(total_sets, total_words)
+            results = []
+            for output in TimeOutput.params[2]:
+                tic = time.perf_counter()
+                fig, venn = render(sets, word_to_frequency, output)
+                duration = time.perf_counter() - tic
+
+                if output == 'text':
+                    for uid, layout in venn.layouts.items():
+                        words = [word for (word, _), _, _, _, _ in layout]
+                        assert words == [text.get_text() for text in venn.word_texts[uid]], \
+                            "Words of subset {} are not added as text!".format(uid)
+                    assert len(fig.axes) == 1, "Text output should not add an image axis!"
+
+                tic = time.perf_counter()
+                pdf_bytes = export(fig, 'pdf')
+                pdf_duration = time.perf_counter() - tic
+                svg_bytes = export(fig, 'svg')
+                results.append('{} {:5.2f}s, pdf {:5.2f}s {:7.1f} kB, svg {:7.1f} kB'.format(
+                    output, duration, pdf_duration, pdf_bytes / 1e3, svg_bytes / 1e3))
+                plt.close(fig)
+            print('{} sets {:>5} words: {}'.format(total_sets, total_words, ' | '.join(results)))
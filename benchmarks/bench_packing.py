@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Time the layout engines (see the layout_engine argument of venn2_wordcloud),
+i.e. WordCloud, which lays out each subset separately and requires a
+calibration pass, and the NumPy engine, which lays out all subsets in
+one pass over a shared canvas.
+
+The benchmark classes follow the airspeed velocity (asv) conventions;
+alternatively, run this file as a script, which also checks that the
+NumPy engine produces font sizes that are consistent with the word
+frequencies across subsets, and that the drawn words stay within their
+regions and do not overlap:
+
+    python benchmarks/bench_packing.py
+"""
+
+import time
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from matplotlib_venn_wordcloud import venn2_wordcloud, venn3_wordcloud
+from matplotlib_venn_wordcloud._main import _get_wordcloud_from_layout
+
+try: # imported as part of the benchmarks package by asv
+    from .bench_pipeline import get_sets
+except ImportError: # run as a script
+    from bench_pipeline import get_sets
+
+
+def render(sets, word_to_frequency, layout_engine, calibration='exact'):
+    venn_wordcloud = venn2_wordcloud if len(sets) == 2 else venn3_wordcloud
+    return venn_wordcloud(sets,
+                          word_to_frequency=word_to_frequency,
+                          wordcloud_kwargs=dict(random_state=42),
+                          calibration=calibration,
+                          layout_engine=layout_engine,
+                          profile=True)
+
+
+class TimeLayoutEngine:
+
+    params = ([2, 3], [100, 1000, 10000], ['wordcloud', 'numpy'])
+    param_names = ['total_sets', 'total_words', 'layout_engine']
+    timeout = 600
+
+    def setup(self, total_sets, total_words, layout_engine):
+        self.sets, self.word_to_frequency = get_sets(total_sets, total_words)
+
+    def teardown(self, total_sets, total_words, layout_engine):
+        plt.close('all')
+
+    def time_venn_wordcloud(self, total_sets, total_words, layout_engine):
+        render(self.sets, self.word_to_frequency, layout_engine)
+
+
+def check_layouts(venn, jobs, word_to_frequency):
+    """
+    Check that larger frequencies never have smaller font sizes, and that
+    the pixels of each word lie within its region and are not covered by
+    any other word.
+    """
+
+    placed = sorted(((word_to_frequency[word], font_size)
+                     for layout in venn.layouts.values()
+                     for (word, _), font_size, _, _, _ in layout), reverse=True)
+    font_sizes = [font_size for _, font_size in placed]
+    assert all(a >= b for a, b in zip(font_sizes, font_sizes[1:])), "Font sizes are inconsistent with the frequencies!"
+
+    for uid, mask, _ in jobs:
+        coverage = np.zeros(mask.shape, dtype=int)
+        for record in venn.layouts[uid]:
+            wc = _get_wordcloud_from_layout(mask, [record], color_func=lambda *args, **kwargs: 'black')
+            coverage += wc.to_array()[..., 3] > 0
+        assert np.all(coverage[mask == 255] == 0), "Words of subset {} leave their region!".format(uid)
+        assert np.all(coverage <= 1), "Words of subset {} overlap!".format(uid)
+
+    return len(placed)
+
+
+if __name__ == '__main__':
+
+    from unittest import mock
+    import matplotlib_venn_wordcloud._main as _main
+
+    for total_sets in (2, 3):
+        sets, word_to_frequency = get_sets(total_sets, 1000)
+
+        # keep a handle on the renderer to access the (cropped) masks
+        renderers = []
+        original = _main._WordcloudRenderer.__init__
+        def _init(self, *args, **kwargs):
+            original(self, *args, **kwargs)
+            renderers.append(self)
+        with mock.patch.object(_main._WordcloudRenderer, '__init__', _init):
+            venn = render(sets, word_to_frequency, 'numpy')
+        renderer = renderers[-1]
+        total_placed = check_layouts(venn, renderer.jobs, word_to_frequency)
+        plt.close('all')
+        print('{} sets: {} words placed; consistent font sizes, no overlaps'.format(total_sets, total_placed))
+
+    for total_sets in TimeLayoutEngine.params[0]:
+        for total_words in TimeLayoutEngine.params[1]:
+            sets, word_to_frequency = get_sets(total_sets, total_words)
+            results = []
+            for layout_engine in TimeLayoutEngine.params[2]:
+                tic = time.perf_counter()
+                venn = render(sets, word_to_frequency, layout_engine)
+                duration = time.perf_counter() - tic
+                placed = sum(len(layout) for layout in venn.layouts.values())
+                results.append('{} {:6.2f}s ({:4} words)'.format(layout_engine, duration, placed))
+                plt.close('all')
+            print('{} sets {:>6} words: {}'.format(total_sets, total_words, ', '.join(results)))
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Time the stages of the word cloud Venn diagram pipeline separately:
+
+1) geometry    : venn2 / venn3 (and venn2_circles / venn3_circles)
+2) masks       : rasterization of the subset masks (and frequency look-up)
+3) calibration : first pass of the packing algorithm (font size bounds)
+4) layout      : second pass of the packing algorithm
+5) combine     : compositing of the subset word clouds into one image
+6) imshow      : plotting the image and drawing the figure
+
+The inputs are synthetic: two or three sets drawn from a vocabulary of
+10 to 100k words, with a given fraction of words shared between sets,
+and Zipf distributed word frequencies (as in examples.ex3).
+
+The benchmark classes follow the airspeed velocity (asv) conventions;
+alternatively, run this file as a script, which saves the results as
+JSON, e.g. to compare two commits:
+
+    python benchmarks/bench_pipeline.py --output before.json
+    git checkout <other commit>
+    python benchmarks/bench_pipeline.py --output after.json --compare before.json
+
+See `python benchmarks/bench_pipeline.py --help` for further options.
+"""
+
+import os
+import sys
+import time
+import json
+import platform
+import argparse
+import subprocess
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from matplotlib_venn_wordcloud._main import (
+    _DEFAULT_STYLES,
+    _WordcloudRenderer,
+    _get_axis_image,
+    _get_extended_venn,
+    _get_headless_figure,
+    _mask_cache,
+)
+
+
+STAGES = ['geometry', 'masks', 'calibration', 'layout', 'combine', 'imshow']
+
+
+def get_sets(total_sets=2, total_words=1000, overlap=0.5, seed=42):
+    """
+    Returns total_sets sets of words and a dict mapping each word to its frequency.
+
+    A fraction of the words given by overlap is shared between two or
+    more sets; the remaining words belong to a single set. Within each
+    group, the words are distributed evenly across the subsets.
+    The frequencies follow Zipf's law (frequency ~ 1 / rank).
+    """
+
+    rng = np.random.RandomState(seed)
+    vocabulary = np.array(['word{}'.format(ii) for ii in range(total_words)])
+
+    # subsets as membership bitmasks
+    codes = np.arange(1, 2**total_sets)
+    is_shared = np.array([bin(code).count('1') > 1 for code in codes])
+    probabilities = np.where(is_shared, overlap / is_shared.sum(), (1 - overlap) / (~is_shared).sum())
+    memberships = rng.choice(codes, size=total_words, p=probabilities)
+
+    sets = [set(vocabulary[memberships & (1 << ii) > 0].tolist()) for ii in range(total_sets)]
+    frequencies = rng.permutation(1. / np.arange(1, total_words + 1))
+
+    return sets, dict(zip(vocabulary.tolist(), frequencies.tolist()))
+
+
+class Pipeline(object):
+    """
+    Run the pipeline one stage at a time (see STAGES).
+    """
+
+    def __init__(self, sets, word_to_frequency=None, calibration='exact', resolution=1000):
+        self.sets = sets
+        self.word_to_frequency = word_to_frequency
+        self.calibration_method = calibration
+        self.resolution = resolution
+        self.fig, self.ax = _get_headless_figure()
+        self._stages = iter(STAGES)
+
+    def step(self, stage):
+        assert stage == next(self._stages), "Stages need to be run in order!"
+        getattr(self, stage)()
+
+    def geometry(self):
+        set_colors, set_edgecolors, alpha = _DEFAULT_STYLES[len(self.sets)]
+        self.venn = _get_extended_venn(self.sets, None, set_colors, set_edgecolors, alpha, self.ax)
+
+    def masks(self):
+        _mask_cache.clear() # otherwise, repeated runs only measure the cache look-up
+        self.renderer = _WordcloudRenderer(self.venn, self.ax, self.word_to_frequency, self.calibration_method,
+                                           img=_get_axis_image(self.ax, self.resolution), overlay=False,
+                                           random_state=42)
+
+    def calibration(self):
+        self.renderer.step()
+
+    def layout(self):
+        self.renderer.step()
+
+    def combine(self):
+        self.renderer.step()
+
+    def imshow(self):
+        self.renderer.img.imshow(interpolation='bilinear')
+        self.fig.canvas.draw()
+
+    def close(self):
+        plt.close(self.fig)
+
+
+def measure_stages(sets, word_to_frequency=None, calibration='exact', resolution=1000, repeat=3):
+    """
+    Returns the shortest duration of each stage across repeat runs of the pipeline.
+    """
+
+    durations = {stage : [] for stage in STAGES}
+    for _ in range(repeat):
+        pipeline = Pipeline(sets, word_to_frequency, calibration, resolution)
+        for stage in STAGES:
+            tic = time.perf_counter()
+            pipeline.step(stage)
+            durations[stage].append(time.perf_counter() - tic)
+        pipeline.close()
+    return {stage : min(values) for stage, values in durations.items()}
+
+
+class _TimeStage:
+
+    params = ([2, 3], [10, 100, 1000, 10000, 100000], [0.1, 0.5, 0.9])
+    param_names = ['total_sets', 'total_words', 'overlap']
+    number = 1 # stages cannot be repeated without running the preceding stages again
+    timeout = 600
+
+    def setup(self, total_sets, total_words, overlap):
+        sets, word_to_frequency = get_sets(total_sets, total_words, overlap)
+        self.pipeline = Pipeline(sets, word_to_frequency)
+        for stage in STAGES[:STAGES.index(self.stage)]:
+            self.pipeline.step(stage)
+
+    def teardown(self, total_sets, total_words, overlap):
+        self.pipeline.close()
+
+    def time_stage(self, total_sets, total_words, overlap):
+        self.pipeline.step(self.stage)
+
+
+class TimeGeometry(_TimeStage):
+    stage = 'geometry'
+
+
+class TimeMasks(_TimeStage):
+    stage = 'masks'
+
+
+class TimeCalibration(_TimeStage):
+    stage = 'calibration'
+
+
+class TimeLayout(_TimeStage):
+    stage = 'layout'
+
+
+class TimeCombine(_TimeStage):
+    stage = 'combine'
+
+
+class TimeImshow(_TimeStage):
+    stage = 'imshow'
+
+
+def get_metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    import wordcloud, matplotlib_venn
+    return dict(
+        commit     = commit,
+        date       = time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        machine    = platform.machine(),
+        processor  = platform.processor(),
+        python     = platform.python_version(),
+        numpy      = np.__version__,
+        matplotlib = matplotlib.__version__,
+        matplotlib_venn = matplotlib_venn.__version__,
+        wordcloud  = wordcloud.__version__,
+    )
+
+
+def compare(results, reference):
+    """
+    Print the ratio of the durations in results to those in reference for matching inputs.
+    """
+
+    def _get_key(result):
+        return tuple(result[name] for name in ('total_sets', 'total_words', 'overlap', 'calibration', 'resolution'))
+
+    print('\nDuration relative to {}:'.format(reference.get('commit') or 'reference'))
+    reference = {_get_key(result) : result['durations'] for result in reference['results']}
+    for result in results['results']:
+        key = _get_key(result)
+        if key in reference:
+            print('{:>2} sets {:>6} words {:4.2f} overlap: '.format(*key[:3]) + ' '.join(
+                '{} {:5.2f}x'.format(stage, result['durations'][stage] / max(reference[key][stage], 1e-9))
+                for stage in STAGES))
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description='Time the stages of the word cloud Venn diagram pipeline.')
+    parser.add_argument('--sets', type=int, nargs='+', default=[2, 3], help='number of sets')
+    parser.add_argument('--words', type=int, nargs='+', default=[10, 1000, 100000], help='number of words')
+    parser.add_argument('--overlap', type=float, nargs='+', default=[0.5], help='fraction of shared words')
+    parser.add_argument('--calibration', default='exact', choices=['exact', 'coarse', 'estimate'])
+    parser.add_argument('--resolution', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs; the shortest duration is reported')
+    parser.add_argument('--output', help='path of the JSON file with the results')
+    parser.add_argument('--compare', help='path of a JSON file with reference results')
+    args = parser.parse_args(argv)
+
+    results = dict(get_metadata(), results=[])
+    print(' ' * 34 + ' '.join('{:>11}'.format(stage) for stage in STAGES))
+    for total_sets in args.sets:
+        for total_words in args.words:
+            for overlap in args.overlap:
+                sets, word_to_frequency = get_sets(total_sets, total_words, overlap)
+                durations = measure_stages(sets, word_to_frequency, args.calibration, args.resolution, args.repeat)
+                results['results'].append(dict(total_sets=total_sets, total_words=total_words, overlap=overlap,
+                                               calibration=args.calibration, resolution=args.resolution,
+                                               durations=durations))
+                print('{:>2} sets {:>6} words {:4.2f} overlap: '.format(total_sets, total_words, overlap)
+                      + ' '.join('{:10.3f}s'.format(durations[stage]) for stage in STAGES))
+                sys.stdout.flush()
+
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(results, fh, indent=2)
+
+    if args.compare:
+        with open(args.compare) as fh:
+            compare(results, json.load(fh))
+
+
+if __name__ == '__main__':
+    main()
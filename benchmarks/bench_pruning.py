@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Time the rendering of a word cloud Venn diagram for large vocabularies,
+with and without passing only the max_words most frequent words of each
+subset to the packing algorithm.
+
+The benchmark classes follow the airspeed velocity (asv) conventions;
+alternatively, run this file as a script, which also checks that
+pruning does not change the layouts:
+
+    python benchmarks/bench_pruning.py
+"""
+
+import time
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from unittest import mock
+
+import matplotlib_venn_wordcloud._main
+from matplotlib_venn_wordcloud import venn2_wordcloud
+
+
+def get_sets(total_words, seed=42):
+    # Zipf distributed integer frequencies, i.e. with many ties
+    rng = np.random.RandomState(seed)
+    vocabulary = ['word{}'.format(ii) for ii in range(total_words)]
+    sets = [set(vocabulary[:int(0.6 * total_words)]), set(vocabulary[int(0.4 * total_words):])]
+    frequencies = rng.zipf(1.5, size=total_words).astype(float)
+    return sets, dict(zip(vocabulary, frequencies))
+
+
+def _get_all_indices(frequencies, *args, **kwargs):
+    return np.arange(len(frequencies))
+
+
+def render(sets, word_to_frequency, pruning=True, **wordcloud_kwargs):
+    with mock.patch.object(matplotlib_venn_wordcloud._main, '_get_top_indices',
+                           matplotlib_venn_wordcloud._main._get_top_indices if pruning else _get_all_indices):
+        return venn2_wordcloud(sets,
+                               word_to_frequency=word_to_frequency,
+                               wordcloud_kwargs=dict(random_state=42, **wordcloud_kwargs),
+                               calibration='estimate')
+
+
+class TimePruning:
+
+    params = ([1000, 10000, 100000], [True, False])
+    param_names = ['total_words', 'pruning']
+    timeout = 600
+
+    def setup(self, total_words, pruning):
+        self.sets, self.word_to_frequency = get_sets(total_words)
+
+    def teardown(self, total_words, pruning):
+        plt.close('all')
+
+    def time_venn_wordcloud(self, total_words, pruning):
+        render(self.sets, self.word_to_frequency, pruning)
+
+
+if __name__ == '__main__':
+
+    sets, word_to_frequency = get_sets(20000)
+    for wordcloud_kwargs in (dict(), dict(max_words=2000)):
+        pruned = render(sets, word_to_frequency, True, **wordcloud_kwargs)
+        unpruned = render(sets, word_to_frequency, False, **wordcloud_kwargs)
+        assert pruned.layouts == unpruned.layouts, "Pruning changed the layouts!"
+        plt.close('all')
+        print('{}: identical layouts; dropped words: {}'.format(wordcloud_kwargs or 'defaults', pruned.dropped_word_counts))
+
+    benchmark = TimePruning()
+    for total_words in TimePruning.params[0]:
+        durations = dict()
+        for pruning in TimePruning.params[1]:
+            benchmark.setup(total_words, pruning)
+            tic = time.perf_counter()
+            benchmark.time_venn_wordcloud(total_words, pruning)
+            durations[pruning] = time.perf_counter() - tic
+            benchmark.teardown(total_words, pruning)
+        print('{:>6} words: pruning {:6.2f}s, no pruning {:6.2f}s'.format(
+            total_words, durations[True], durations[False]))
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Time the rendering of a word cloud Venn diagram as a function of the
+resolution of the word cloud image.
+
+The benchmark classes follow the airspeed velocity (asv) conventions;
+alternatively, run this file as a script:
+
+    python benchmarks/bench_resolution.py
+"""
+
+import time
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from matplotlib_venn_wordcloud import venn3_wordcloud
+from matplotlib_venn_wordcloud._main import _get_axis_image
+try: # imported as part of the benchmarks package by asv
+    from .bench_calibration import get_ex2_sets
+except ImportError: # run as a script
+    from bench_calibration import get_ex2_sets
+
+
+# thumbnail, screen, print
+FIGURES = {
+    'thumbnail' : ((2, 2), 72),
+    'screen'    : ((6.4, 4.8), 100),
+    'print'     : ((6.4, 4.8), 300),
+}
+
+
+class TimeResolution:
+
+    params = ([250, 500, 1000, 2000], ['exact', 'estimate'])
+    param_names = ['resolution', 'calibration']
+    timeout = 600
+
+    def setup(self, resolution, calibration):
+        self.sets, self.word_to_frequency = get_ex2_sets()
+
+    def teardown(self, resolution, calibration):
+        plt.close('all')
+
+    def time_venn_wordcloud(self, resolution, calibration):
+        venn3_wordcloud(self.sets,
+                        word_to_frequency=self.word_to_frequency,
+                        wordcloud_kwargs=dict(random_state=42),
+                        calibration=calibration,
+                        resolution=resolution)
+
+
+class TimeAutoResolution:
+
+    params = (list(FIGURES),)
+    param_names = ['figure']
+    timeout = 600
+
+    def setup(self, figure):
+        self.sets, self.word_to_frequency = get_ex2_sets()
+
+    def teardown(self, figure):
+        plt.close('all')
+
+    def time_venn_wordcloud(self, figure):
+        figsize, dpi = FIGURES[figure]
+        fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
+        venn3_wordcloud(self.sets,
+                        ax=ax,
+                        word_to_frequency=self.word_to_frequency,
+                        wordcloud_kwargs=dict(random_state=42),
+                        resolution='auto')
+
+
+if __name__ == '__main__':
+
+    benchmark = TimeResolution()
+    for resolution in TimeResolution.params[0]:
+        durations = dict()
+        for calibration in TimeResolution.params[1]:
+            benchmark.setup(resolution, calibration)
+            tic = time.perf_counter()
+            benchmark.time_venn_wordcloud(resolution, calibration)
+            durations[calibration] = time.perf_counter() - tic
+            benchmark.teardown(resolution, calibration)
+        print('resolution {:>5}: exact {:6.2f}s, estimate {:6.2f}s'.format(
+            resolution, durations['exact'], durations['estimate']))
+
+    benchmark = TimeAutoResolution()
+    for figure, (figsize, dpi) in FIGURES.items():
+        fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
+        resolution = _get_axis_image(ax, 'auto').x_resolution
+        plt.close(fig)
+
+        benchmark.setup(figure)
+        tic = time.perf_counter()
+        benchmark.time_venn_wordcloud(figure)
+        duration = time.perf_counter() - tic
+        benchmark.teardown(figure)
+        print('{:>9} ({:>4} px): {:6.2f}s'.format(figure, resolution, duration))
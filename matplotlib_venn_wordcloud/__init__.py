@@ -68,6 +68,33 @@ venn_wordcloud.venn2_wordcloud(sets)
 
 """
 
-from matplotlib_venn_wordcloud._main import venn2_wordcloud, venn3_wordcloud
-__all__ = ['venn2_wordcloud', 'venn3_wordcloud']
+import importlib
+
+__all__ = ['venn2_wordcloud', 'venn3_wordcloud', 'venn_wordcloud_batch', 'venn_wordcloud_from_tokens', 'render_to_array', 'render_to_png', 'LayoutCache', 'load_layout']
 __version__ = '0.2.6'
+
+# The public functions and classes are imported on first access,
+# such that importing the package (e.g. in worker processes) is cheap.
+_modules = {
+    'venn2_wordcloud'            : '_main',
+    'venn3_wordcloud'            : '_main',
+    'venn_wordcloud_batch'       : '_main',
+    'venn_wordcloud_from_tokens' : '_main',
+    'render_to_array'            : '_main',
+    'render_to_png'              : '_main',
+    'LayoutCache'                : '_cache',
+    'load_layout'                : '_export',
+}
+
+
+def __getattr__(name):
+    if name in _modules:
+        module = importlib.import_module(__name__ + '.' + _modules[name])
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
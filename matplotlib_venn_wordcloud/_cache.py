@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# _cache.py --- Persistent cache of word cloud layouts.
+
+# Copyright (C) 2017 Paul Brodersen <paulbrodersen+matplotlib_venn_wordcloud@gmail.com>
+
+# Author: Paul Brodersen <paulbrodersen+matplotlib_venn_wordcloud@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# Except as contained in this notice, the name(s) of the above copyright
+# holders shall not be used in advertising or otherwise to promote the sale,
+# use or other dealings in this Software without prior written authorization.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+Persistent cache of word cloud layouts.
+"""
+
+import os
+import json
+import zlib
+import zipfile
+import tempfile
+import numpy as np
+
+
+class LayoutCache(object):
+    """
+    Persistent cache of word cloud layouts, stored in a directory.
+
+    For each rendered diagram, the layout of each subset word cloud
+    and the combined word cloud image are stored in one (compressed)
+    numpy .npz file. Entries are evicted in least recently used order
+    once the total size of the cache exceeds max_size.
+
+    The cache can be shared by several processes. Entries are written
+    atomically, and unreadable entries are treated as missing.
+
+    Arguments:
+    ----------
+    path: str
+        cache directory; created if it does not exist
+
+    max_size: int (default: 2**30, i.e. 1 GiB)
+        maximum total size of all entries in bytes
+
+    Attributes:
+    -----------
+    hits, misses: int
+        number of successful and unsuccessful look-ups by this instance
+
+    Example:
+    --------
+    cache = LayoutCache('~/.cache/venn_wordcloud')
+    venn2_wordcloud(sets, wordcloud_kwargs=dict(random_state=42), cache=cache)
+
+    """
+
+    _suffix = '.npz'
+
+    def __init__(self, path, max_size=2**30):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.path, exist_ok=True)
+
+
+    def __len__(self):
+        return len(self._get_entries())
+
+
+    def __repr__(self):
+        return '{}({!r}, max_size={})'.format(self.__class__.__name__, self.path, self.max_size)
+
+
+    def get(self, key):
+        """
+        Returns the entry stored under the given key (a dict with the
+        items 'layouts', 'rgba', and 'color_key'), or None.
+        """
+        filename = self._get_filename(key)
+        try:
+            with np.load(filename, allow_pickle=False) as data:
+                entry = dict(
+                    layouts   = json.loads(str(data['layouts'])),
+                    rgba      = data['rgba'],
+                    color_key = str(data['color_key']) or None,
+                )
+            os.utime(filename) # mark as recently used
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile, zlib.error): # missing or corrupt
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+
+    def put(self, key, layouts, rgba, color_key=None):
+        """
+        Store the layouts (a JSON serialisable object), the combined
+        image (an uint8 RGBA array), and the key of the colour settings
+        used to render the image (or None) under the given key.
+        """
+        handle, temporary = tempfile.mkstemp(suffix=self._suffix, dir=self.path)
+        try:
+            with os.fdopen(handle, 'wb') as fh:
+                np.savez_compressed(fh,
+                                    layouts=np.array(json.dumps(layouts)),
+                                    rgba=rgba,
+                                    color_key=np.array(color_key or ''))
+            os.replace(temporary, self._get_filename(key))
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        self._evict()
+
+
+    def clear(self):
+        for _, _, filename in self._get_entries():
+            _remove(filename)
+        self.hits = 0
+        self.misses = 0
+
+
+    def _get_filename(self, key):
+        return os.path.join(self.path, key + self._suffix)
+
+
+    def _get_entries(self):
+        # (last use, size, filename), ordered from least to most recently used
+        entries = []
+        for item in os.scandir(self.path):
+            if item.name.endswith(self._suffix) and not item.name.startswith('tmp'):
+                try:
+                    stat = item.stat()
+                except OSError: # removed by another process
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, item.path))
+        return sorted(entries)
+
+
+    def _evict(self):
+        entries = self._get_entries()
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, filename in entries:
+            if total_size <= self.max_size:
+                break
+            _remove(filename)
+            total_size -= size
+
+
+def _remove(filename):
+    try:
+        os.remove(filename)
+    except FileNotFoundError: # removed by another process
+        pass
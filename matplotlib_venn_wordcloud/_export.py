@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# _export.py --- Export and load word cloud layouts.
+
+# Copyright (C) 2017 Paul Brodersen <paulbrodersen+matplotlib_venn_wordcloud@gmail.com>
+
+# Author: Paul Brodersen <paulbrodersen+matplotlib_venn_wordcloud@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# Except as contained in this notice, the name(s) of the above copyright
+# holders shall not be used in advertising or otherwise to promote the sale,
+# use or other dealings in this Software without prior written authorization.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+Export and load word cloud layouts.
+
+An exported layout describes the diagram in data coordinates, such that
+it can be drawn without laying out the word clouds again, e.g. by a
+web client. It is a dict with the items
+
+    'version'    : format version (1),
+    'xlim'       : [x0, x1] of the axis,
+    'ylim'       : [y0, y1] of the axis,
+    'font'       : path of the font file that the words were laid out with,
+    'subsets'    : dict mapping each unique ID to a dict with the items
+                   'patch' : list of polygons (lists of [x, y]) outlining the region, or None,
+                   'color' : face colour of the region ('#rrggbbaa'),
+                   'words' : list of [word, x, y, font_size, rotation, color];
+                             x, y is the point on the baseline at the centre of the word,
+                             font_size is the em size in data units,
+                             rotation is in degrees counter-clockwise (0 or 90),
+                             color is '#rrggbb' or '#rrggbbaa',
+    'circles'    : list of dicts with the items 'center' ([x, y]), 'radius', and,
+                   if the circles are drawn, 'edgecolor' and 'linewidth' (in points),
+    'set_labels' : list of dicts with the items 'text', 'x', 'y', 'fontsize' (in points),
+                   'ha', and 'va', or None.
+
+The layouts are serialized as compact JSON or, if the msgpack package
+is installed, as msgpack.
+"""
+
+import os
+import json
+
+
+_FORMAT_VERSION = 1
+
+
+def load_layout(data, ax=None, font_path=None):
+    """
+    Draw an exported layout (see the .export_layout method of the
+    diagrams returned by venn2_wordcloud and venn3_wordcloud) without
+    laying out the word clouds again.
+
+    Arguments:
+    ----------
+    data: str, bytes, or dict
+        layout as JSON, as msgpack, or as already decoded dict
+
+    ax: matplotlib.axes._subplots.AxesSubplot instance or None
+        axis to plot on
+
+    font_path: str or None (default: None)
+        font file used to draw the words; defaults to the font of the
+        layout if it exists on this machine, and to the default font of
+        matplotlib otherwise (in which case the words can overlap)
+
+    Returns:
+    --------
+    word_texts: dict
+        maps each unique ID to the matplotlib.text.Text instances of the words
+
+    """
+
+    layout = _loads(data)
+    assert layout.get('version') == _FORMAT_VERSION, \
+        "Layout format version needs to be {}, not {}!".format(_FORMAT_VERSION, layout.get('version'))
+
+    from matplotlib.path import Path
+    from matplotlib.patches import Circle, PathPatch
+
+    if not ax:
+        import matplotlib.pyplot as plt
+        fig, ax = plt.subplots(1,1)
+
+    # as matplotlib_venn
+    ax.set_aspect('equal')
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.set_xlim(layout['xlim'])
+    ax.set_ylim(layout['ylim'])
+    ax.set_axis_off()
+
+    for subset in layout['subsets'].values():
+        if subset['patch']:
+            path = Path.make_compound_path(*[Path(polygon, closed=True) for polygon in subset['patch']])
+            ax.add_patch(PathPatch(path, facecolor=subset['color'], edgecolor='none'))
+
+    for circle in layout['circles']:
+        if 'edgecolor' in circle:
+            ax.add_patch(Circle(circle['center'], circle['radius'], facecolor='none',
+                                edgecolor=circle['edgecolor'], linewidth=circle['linewidth']))
+
+    for label in layout['set_labels'] or []:
+        ax.text(label['x'], label['y'], label['text'], fontsize=label['fontsize'],
+                horizontalalignment=label['ha'], verticalalignment=label['va'])
+
+    if font_path is None and os.path.isfile(layout['font']):
+        font_path = layout['font']
+
+    return {uid : _add_word_texts(ax, subset['words'], font_path) for uid, subset in layout['subsets'].items()}
+
+
+def _add_word_texts(ax, words, font_path=None):
+    """
+    Add words given as (word, x, y, font_size, rotation, color) to the axis
+    (see the module docstring); the font sizes are converted from data
+    units to points at the current size of the axis.
+    Returns the matplotlib.text.Text instances.
+    """
+
+    from matplotlib.font_manager import FontProperties
+
+    font = FontProperties(fname=font_path) if font_path else FontProperties()
+    points_per_unit = _get_points_per_unit(ax)
+    return [ax.text(x, y, word, fontproperties=font, fontsize=font_size * points_per_unit, color=color,
+                    rotation=rotation, rotation_mode='anchor',
+                    horizontalalignment='center', verticalalignment='baseline')
+            for word, x, y, font_size, rotation, color in words]
+
+
+def _get_points_per_unit(ax):
+    # venn diagrams have an equal aspect ratio, which shrinks the axis
+    ax.apply_aspect()
+    (x0, _), (x1, _) = ax.transData.transform([(0., 0.), (1., 0.)])
+    return (x1 - x0) * 72. / ax.get_figure().dpi
+
+
+def _dumps(layout, fmt='json'):
+    """
+    Serialize a layout as JSON (str) or msgpack (bytes).
+    """
+
+    assert fmt in ('json', 'msgpack'), "Format needs to be one of 'json' or 'msgpack'!"
+    if fmt == 'json':
+        return json.dumps(layout, ensure_ascii=False, separators=(',', ':'))
+    return _get_msgpack().packb(layout, use_bin_type=True)
+
+
+def _loads(data):
+    """
+    Deserialize a layout from JSON or msgpack; dicts are returned as they are.
+    """
+
+    if isinstance(data, dict):
+        return data
+    if isinstance(data, (bytes, bytearray)) and not data.lstrip().startswith(b'{'):
+        return _get_msgpack().unpackb(data, raw=False)
+    return json.loads(data)
+
+
+def _get_msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError("Layouts can only be (de)serialized as msgpack if the msgpack package is installed!")
+    return msgpack
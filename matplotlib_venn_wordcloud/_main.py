@@ -69,12 +69,27 @@ venn2_wordcloud(sets)
 
 """
 
+import os
+import time
+import functools
+import heapq
+import hashlib
+import inspect
+import logging
+import threading
 import numpy as np
-import matplotlib.pyplot as plt
 
-from matplotlib.patches import Circle
-from wordcloud import WordCloud
-from matplotlib_venn import venn2, venn3, venn2_circles, venn3_circles
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+from matplotlib_venn_wordcloud._cache import LayoutCache
+from matplotlib_venn_wordcloud._export import _FORMAT_VERSION, _add_word_texts, _dumps
+
+# matplotlib.pyplot, matplotlib_venn, wordcloud, and PIL are imported
+# where they are needed, such that importing this module remains cheap,
+# e.g. for worker processes that only lay out word clouds, or for code
+# that only groups words or reads cached layouts.
+# Note that matplotlib_venn itself imports pyplot.
 
 
 def _default_color_func(*args, **kwargs):
@@ -88,7 +103,15 @@ def venn2_wordcloud(sets,
                     alpha=0.4,
                     ax=None,
                     word_to_frequency=None,
-                    wordcloud_kwargs={'color_func':_default_color_func}):
+                    wordcloud_kwargs={'color_func':_default_color_func},
+                    calibration='exact',
+                    n_jobs=None,
+                    executor=None,
+                    resolution=1000,
+                    cache=None,
+                    profile=False,
+                    layout_engine='wordcloud',
+                    output='image'):
 
     """
     Plot a Venn diagram based on two sets of words.
@@ -115,8 +138,10 @@ def venn2_wordcloud(sets,
     ax: matplotlib.axes._subplots.AxesSubplot instance or None
         axis to plot on
 
-    word_to_frequency: dict or None (default: None)
-        maps words to relative frequencies; used to scale word fontsizes
+    word_to_frequency: dict, pandas.Series, (words, frequencies), or None (default: None)
+        maps words to relative frequencies; used to scale word fontsizes;
+        can also be given as a pair of parallel sequences (e.g. numpy arrays)
+        of words and frequencies, or as a pandas Series indexed by the words
 
     wordcloud_kwargs: dict
         passed to wordcloud.WordCloud;
@@ -125,6 +150,72 @@ def venn2_wordcloud(sets,
             - mode ("RGBA")
             - mask (computed based on subset patches)
 
+    calibration: 'exact', 'coarse', or 'estimate' (default: 'exact')
+        how the font sizes are made consistent across subsets;
+        'exact' runs the packing algorithm twice for each subset,
+        first to determine the largest and smallest font size that fit
+        into each patch, and then again with the reconciled font sizes;
+        'coarse' runs the first pass on downsampled masks (faster; font
+        size bounds typically within 10% of 'exact', see _get_coarse_font_size_bounds);
+        'estimate' predicts the font size bounds from the patch area and
+        the glyph extents of the words, and hence only runs the packing
+        algorithm once for each subset (faster but less precise)
+
+    n_jobs: int or None (default: None)
+        number of worker processes used to lay out the word clouds of the
+        different subsets in parallel; -1 uses all available cores;
+        None or 1 lays out the word clouds one after another;
+        in either case, the wordcloud_kwargs need to be picklable,
+        and the result is only reproducible if the random_state is an int
+
+    executor: concurrent.futures.Executor instance or None (default: None)
+        executor used to lay out the word clouds in parallel; supersedes n_jobs
+
+    resolution: int or 'auto' (default: 1000)
+        width of the word cloud image in pixels (the height follows from the aspect ratio);
+        'auto' matches the number of pixels that the axis occupies in the figure
+        at the figure dpi, such that the layout cost scales with the displayed size,
+        but is at least 500 pixels, as the minimum font size is given in pixels;
+        for exports at a higher dpi, set the figure dpi before plotting;
+        subsets whose patches are too small to fit any word at the given
+        resolution are skipped with a warning
+
+    cache: LayoutCache instance, str, or None (default: None)
+        persistent cache of the word cloud layouts (or the path to its directory);
+        on a cache hit, no layout work is done and the word clouds are only redrawn;
+        only used if wordcloud_kwargs contains an integer random_state
+
+    profile: bool or callable (default: False)
+        if True, the wall time of each stage of the rendering
+        (geometry, masks, calibration, layout, combine, imshow;
+        restore instead of calibration, layout, and combine on a cache hit;
+        no calibration unless the layout engine is 'wordcloud'),
+        and the wall time, the number of free mask pixels, and the number of
+        words, dropped words, and placed words of each subset, as well as the
+        hit rates of the caches are recorded;
+        the results are attached to the returned diagram (.profile),
+        and logged (at level INFO) to the 'matplotlib_venn_wordcloud' logger;
+        if a callable, it is additionally called with the results
+
+    layout_engine: 'wordcloud', 'numpy', or callable (default: 'wordcloud')
+        how the words are packed into the patches;
+        'wordcloud' lays out the word cloud of each subset separately with
+        wordcloud.WordCloud, and makes the font sizes consistent as set by calibration;
+        'numpy' lays out the words of all subsets in one pass over a shared canvas,
+        in order of decreasing frequency, such that the font sizes are consistent
+        by construction, and calibration is not needed (see _packing.pack_words);
+        a callable is used instead of _packing.pack_words (same signature and return value);
+        in either case, the words are drawn by WordCloud
+
+    output: 'image' or 'text' (default: 'image')
+        how the words are drawn;
+        'image' draws the word clouds into one image, which is plotted on top of the axis;
+        'text' adds each word to the axis as a matplotlib.text.Text instance instead,
+        such that vector exports (PDF, SVG) contain text rather than an embedded image
+        (for SVG, set rcParams['svg.fonttype'] to 'none' to keep the words as text);
+        the font sizes are converted to points for the current size of the axis,
+        so the words do not scale if the figure is resized afterwards
+
     Returns:
     --------
     ExtendendVennDiagram:
@@ -136,62 +227,68 @@ def venn2_wordcloud(sets,
             venn2: ('10', '01', '11')
             venn3: ('100', '010', '110', '001', '101', '011', '111')
 
+        .words_by_id
+            dict mapping each unique ID to the list of words in the corresponding subset
+
         .get_words_by_id(uid)
             Returns a list of words associated with each given subset.
 
         .get_circles_by_idx(idx)
             Returns the circle patch corresponding to each idx (idx as in .id2idx).
 
-    """
-
-    # check input as requirements for "sets" are more stringent than for venn2 "subsets"
-    assert np.all(type(elem) == set for elem in sets), "All elements of 'sets' arguments need to be sets!"
-    assert len(sets) == 2, "Number of sets needs to be 2!"
-    assert np.all([len(s) > 0 for s in sets]), "All sets need to have at least one element!"
-
-    # create venn diagram, grab ax
-    if not ax:
-        fig, ax = plt.subplots(1,1)
-
-    venn = venn2(sets,
-                 set_labels=set_labels,
-                 set_colors=set_colors,
-                 alpha=alpha,
-                 ax=ax)
-
-    # set edge color;
-    # cannot use edgecolor attribute of patches returned by venn2
-    # venn2 patches correspond to subsets and edges of patches are composed of several circles
-    if set_edgecolors:
-        venn_circles = venn2_circles(sets, ax=ax)
-        for ii, patch in enumerate(venn_circles):
-            patch.set_edgecolor(set_edgecolors[ii])
-            patch.set_linewidth(3)
-
-        # add circle handles to venn
-        def _func(idx):
-            return venn_circles[idx]
-
-        venn.get_circle_by_idx = _func
-
-    # make default set labels larger
-    if set_labels:
-        for label in venn.set_labels:
-            label.set_fontsize(24.)
-
-    # for each word compute its subset id
-    words = list(set.union(*sets))
-    word_ids = ['%d%d' % (word in sets[0], word in sets[1]) for word in words]
-
-    # extend VennDiagram object
-    venn.uids = set(word_ids)
-
-    def _func(uid):
-        return [word for (word, word_id) in zip(words, word_ids) if word_id==uid]
+        .layouts
+            dict mapping each unique ID to the layout of the corresponding word cloud
+            (a WordCloud.layout_ list); positions are relative to the layout offset
+
+        .layout_offsets
+            dict mapping each unique ID to the (row, column) of the image pixel
+            at which the canvas of the corresponding word cloud starts
+
+        .word_texts
+            only if output is 'text'; dict mapping each unique ID to
+            the matplotlib.text.Text instances of the corresponding words
+
+        .recolor(color_func=None, colormap=None, random_state=None)
+            Recolor the words without laying out the word clouds again.
+
+        .restyle(set_colors=None, set_edgecolors=None, alpha=None, set_labels=None, color_func=None)
+            Change the appearance of the diagram without laying out the word clouds again;
+            arguments that are None are left unchanged.
+
+        .update(added=None, removed=None, new_frequencies=None)
+            Add words to / remove words from the sets (given as one iterable of words per set),
+            and/or change word frequencies (given as a dict word : frequency);
+            if word_to_frequency was given, added words that it does not contain need to be in new_frequencies.
+            Only the word clouds of subsets whose words or font sizes change are laid out again.
+            The circles are not resized; plot the diagram from scratch to update the areas.
+
+        .export_layout(fmt='json', precision=4)
+            Returns the geometry of the diagram and the position, font size, orientation,
+            and colour of each word in data coordinates as compact JSON (str) or msgpack (bytes),
+            with coordinates rounded to the given number of decimals;
+            draw it with load_layout (see _export for the format).
+
+        .dropped_word_counts
+            dict mapping each unique ID to the number of words that were not passed
+            to the packing algorithm, as they are not among the max_words most
+            frequent words of the subset (see wordcloud_kwargs)
+
+        .profile
+            only if profile is given; dict with the items
+            'total'   : total wall time in seconds,
+            'stages'  : dict mapping each stage to its wall time in seconds,
+            'subsets' : dict mapping each unique ID to a dict with the items
+                        'pixels', 'words', 'words_dropped', 'words_placed', and
+                        'seconds' (a dict mapping each stage to its wall time in seconds),
+            'caches'  : dict mapping each process-wide cache ('masks', 'text_extents', 'glyphs')
+                        to a dict with the items 'hits', 'misses', and 'hit_rate'
+                        (look-ups in worker processes are not included)
 
-    venn.get_words_by_id = _func
+    """
 
-    return _venn_wordcloud(venn, ax, word_to_frequency, **wordcloud_kwargs)
+    return _venn_wordcloud_from_sets(sets, 2, set_labels, set_colors, set_edgecolors, alpha, ax,
+                                     word_to_frequency, wordcloud_kwargs, calibration, n_jobs, executor, resolution,
+                                     cache, profile, layout_engine, output)
 
 
 def venn3_wordcloud(sets,
@@ -201,7 +298,15 @@ def venn3_wordcloud(sets,
                     alpha=0.8,
                     ax=None,
                     word_to_frequency=None,
-                    wordcloud_kwargs={'color_func':_default_color_func}):
+                    wordcloud_kwargs={'color_func':_default_color_func},
+                    calibration='exact',
+                    n_jobs=None,
+                    executor=None,
+                    resolution=1000,
+                    cache=None,
+                    profile=False,
+                    layout_engine='wordcloud',
+                    output='image'):
 
     """
     Plot a Venn diagram based on two sets of words.
@@ -228,8 +333,10 @@ def venn3_wordcloud(sets,
     ax: matplotlib.axes._subplots.AxesSubplot instance or None
         axis to plot on
 
-    word_to_frequency: dict or None (default: None)
-        maps words to relative frequencies; used to scale word fontsizes
+    word_to_frequency: dict, pandas.Series, (words, frequencies), or None (default: None)
+        maps words to relative frequencies; used to scale word fontsizes;
+        can also be given as a pair of parallel sequences (e.g. numpy arrays)
+        of words and frequencies, or as a pandas Series indexed by the words
 
     wordcloud_kwargs: dict
         passed to wordcloud.WordCloud;
@@ -238,6 +345,72 @@ def venn3_wordcloud(sets,
             - mode ("RGBA")
             - mask (computed based on subset patches)
 
+    calibration: 'exact', 'coarse', or 'estimate' (default: 'exact')
+        how the font sizes are made consistent across subsets;
+        'exact' runs the packing algorithm twice for each subset,
+        first to determine the largest and smallest font size that fit
+        into each patch, and then again with the reconciled font sizes;
+        'coarse' runs the first pass on downsampled masks (faster; font
+        size bounds typically within 10% of 'exact', see _get_coarse_font_size_bounds);
+        'estimate' predicts the font size bounds from the patch area and
+        the glyph extents of the words, and hence only runs the packing
+        algorithm once for each subset (faster but less precise)
+
+    n_jobs: int or None (default: None)
+        number of worker processes used to lay out the word clouds of the
+        different subsets in parallel; -1 uses all available cores;
+        None or 1 lays out the word clouds one after another;
+        in either case, the wordcloud_kwargs need to be picklable,
+        and the result is only reproducible if the random_state is an int
+
+    executor: concurrent.futures.Executor instance or None (default: None)
+        executor used to lay out the word clouds in parallel; supersedes n_jobs
+
+    resolution: int or 'auto' (default: 1000)
+        width of the word cloud image in pixels (the height follows from the aspect ratio);
+        'auto' matches the number of pixels that the axis occupies in the figure
+        at the figure dpi, such that the layout cost scales with the displayed size,
+        but is at least 500 pixels, as the minimum font size is given in pixels;
+        for exports at a higher dpi, set the figure dpi before plotting;
+        subsets whose patches are too small to fit any word at the given
+        resolution are skipped with a warning
+
+    cache: LayoutCache instance, str, or None (default: None)
+        persistent cache of the word cloud layouts (or the path to its directory);
+        on a cache hit, no layout work is done and the word clouds are only redrawn;
+        only used if wordcloud_kwargs contains an integer random_state
+
+    profile: bool or callable (default: False)
+        if True, the wall time of each stage of the rendering
+        (geometry, masks, calibration, layout, combine, imshow;
+        restore instead of calibration, layout, and combine on a cache hit;
+        no calibration unless the layout engine is 'wordcloud'),
+        and the wall time, the number of free mask pixels, and the number of
+        words, dropped words, and placed words of each subset, as well as the
+        hit rates of the caches are recorded;
+        the results are attached to the returned diagram (.profile),
+        and logged (at level INFO) to the 'matplotlib_venn_wordcloud' logger;
+        if a callable, it is additionally called with the results
+
+    layout_engine: 'wordcloud', 'numpy', or callable (default: 'wordcloud')
+        how the words are packed into the patches;
+        'wordcloud' lays out the word cloud of each subset separately with
+        wordcloud.WordCloud, and makes the font sizes consistent as set by calibration;
+        'numpy' lays out the words of all subsets in one pass over a shared canvas,
+        in order of decreasing frequency, such that the font sizes are consistent
+        by construction, and calibration is not needed (see _packing.pack_words);
+        a callable is used instead of _packing.pack_words (same signature and return value);
+        in either case, the words are drawn by WordCloud
+
+    output: 'image' or 'text' (default: 'image')
+        how the words are drawn;
+        'image' draws the word clouds into one image, which is plotted on top of the axis;
+        'text' adds each word to the axis as a matplotlib.text.Text instance instead,
+        such that vector exports (PDF, SVG) contain text rather than an embedded image
+        (for SVG, set rcParams['svg.fonttype'] to 'none' to keep the words as text);
+        the font sizes are converted to points for the current size of the axis,
+        so the words do not scale if the figure is resized afterwards
+
     Returns:
     --------
     ExtendendVennDiagram:
@@ -249,274 +422,2763 @@ def venn3_wordcloud(sets,
             venn2: ('10', '01', '11')
             venn3: ('100', '010', '110', '001', '101', '011', '111')
 
+        .words_by_id
+            dict mapping each unique ID to the list of words in the corresponding subset
+
         .get_words_by_id(uid)
             Returns a list of words associated with each given subset.
 
         .get_circles_by_idx(idx)
             Returns the circle patch corresponding to each idx (idx as in .id2idx).
 
+        .layouts
+            dict mapping each unique ID to the layout of the corresponding word cloud
+            (a WordCloud.layout_ list); positions are relative to the layout offset
+
+        .layout_offsets
+            dict mapping each unique ID to the (row, column) of the image pixel
+            at which the canvas of the corresponding word cloud starts
+
+        .word_texts
+            only if output is 'text'; dict mapping each unique ID to
+            the matplotlib.text.Text instances of the corresponding words
+
+        .recolor(color_func=None, colormap=None, random_state=None)
+            Recolor the words without laying out the word clouds again.
+
+        .restyle(set_colors=None, set_edgecolors=None, alpha=None, set_labels=None, color_func=None)
+            Change the appearance of the diagram without laying out the word clouds again;
+            arguments that are None are left unchanged.
+
+        .update(added=None, removed=None, new_frequencies=None)
+            Add words to / remove words from the sets (given as one iterable of words per set),
+            and/or change word frequencies (given as a dict word : frequency);
+            if word_to_frequency was given, added words that it does not contain need to be in new_frequencies.
+            Only the word clouds of subsets whose words or font sizes change are laid out again.
+            The circles are not resized; plot the diagram from scratch to update the areas.
+
+        .export_layout(fmt='json', precision=4)
+            Returns the geometry of the diagram and the position, font size, orientation,
+            and colour of each word in data coordinates as compact JSON (str) or msgpack (bytes),
+            with coordinates rounded to the given number of decimals;
+            draw it with load_layout (see _export for the format).
+
+        .dropped_word_counts
+            dict mapping each unique ID to the number of words that were not passed
+            to the packing algorithm, as they are not among the max_words most
+            frequent words of the subset (see wordcloud_kwargs)
+
+        .profile
+            only if profile is given; dict with the items
+            'total'   : total wall time in seconds,
+            'stages'  : dict mapping each stage to its wall time in seconds,
+            'subsets' : dict mapping each unique ID to a dict with the items
+                        'pixels', 'words', 'words_dropped', 'words_placed', and
+                        'seconds' (a dict mapping each stage to its wall time in seconds),
+            'caches'  : dict mapping each process-wide cache ('masks', 'text_extents', 'glyphs')
+                        to a dict with the items 'hits', 'misses', and 'hit_rate'
+                        (look-ups in worker processes are not included)
+
     """
 
-    # check input as requirements for "sets" differs from venn3 "subsets"
-    assert np.all(type(elem) == set for elem in sets), "All elements of 'sets' arguments need to be sets!"
-    assert len(sets) == 3, "Number of sets needs to be 3!"
-    assert np.all([len(s) > 0 for s in sets]), "All sets need to have at least one element!"
+    return _venn_wordcloud_from_sets(sets, 3, set_labels, set_colors, set_edgecolors, alpha, ax,
+                                     word_to_frequency, wordcloud_kwargs, calibration, n_jobs, executor, resolution,
+                                     cache, profile, layout_engine, output)
+
+
+def venn_wordcloud_batch(list_of_sets,
+                         set_labels=None,
+                         set_colors=None,
+                         set_edgecolors=None,
+                         alpha=None,
+                         word_to_frequency=None,
+                         wordcloud_kwargs={'color_func':_default_color_func},
+                         calibration='exact',
+                         output='figure',
+                         figsize=None,
+                         dpi=None,
+                         n_jobs=None,
+                         executor=None,
+                         max_pending=None,
+                         resolution=1000,
+                         cache=None,
+                         layout_engine='wordcloud'):
 
-    # create venn diagram, grab ax
-    if not ax:
-        fig, ax = plt.subplots(1,1)
+    """
+    Plot many Venn diagrams with word clouds on top.
+    The word clouds of all diagrams are laid out using one shared pool
+    of workers, and the diagrams are returned one by one as they finish.
 
-    venn = venn3(sets,
-                 set_labels=set_labels,
-                 set_colors=set_colors,
-                 alpha=alpha,
-                 ax=ax)
+    Arguments:
+    ----------
+    list_of_sets: iterable of [set_1, set_2] or [set_1, set_2, set_3]
+        each item is plotted as in venn2_wordcloud or venn3_wordcloud;
+        may be a generator, in which case the items are only
+        consumed as needed
 
-    # set edge color
-    # cannot use edgecolor attribute of patches returned by venn2
-    # venn2 patches correspond to subsets and edges of patches are composed of several circles
-    if set_edgecolors:
-        venn_circles = venn3_circles(sets, ax=ax)
-        for ii, patch in enumerate(venn_circles):
-            patch.set_edgecolor(set_edgecolors[ii])
-            patch.set_linewidth(3)
+    set_labels, set_colors, set_edgecolors, alpha:
+        as in venn2_wordcloud / venn3_wordcloud; applied to all diagrams;
+        None uses the defaults of venn2_wordcloud / venn3_wordcloud
 
-        # add circle handles to venn
-        def _func(idx):
-            return venn_circles[idx]
+    word_to_frequency, wordcloud_kwargs, calibration:
+        as in venn2_wordcloud / venn3_wordcloud; applied to all diagrams
 
-        venn.get_circle_by_idx = _func
+    output: 'figure' or 'array' (default: 'figure')
+        'figure' returns matplotlib.figure.Figure instances (not managed by pyplot);
+        'array' returns the rendered figures as uint8 RGBA arrays (see render_to_array)
 
-    # make default set labels larger
-    if set_labels:
-        for label in venn.set_labels:
-            label.set_fontsize(24.)
+    figsize, dpi:
+        passed to matplotlib.figure.Figure
 
-    # for each word compute its subset id
-    words = list(set.union(*sets))
-    word_ids = ['%d%d%d' % (word in sets[0], word in sets[1], word in sets[2]) for word in words]
+    n_jobs: int or None (default: None)
+        number of worker processes; -1 uses all available cores;
+        None or 1 lays out the word clouds one after another
 
-    # extend VennDiagram object
-    venn.uids = set(word_ids)
+    executor: concurrent.futures.Executor instance or None (default: None)
+        executor used to lay out the word clouds; supersedes n_jobs
 
-    def _func(uid):
-        return [word for (word, word_id) in zip(words, word_ids) if word_id==uid]
+    max_pending: int or None (default: None)
+        maximum number of diagrams in flight; bounds the memory usage;
+        defaults to twice the number of available cores
+
+    resolution: int or 'auto' (default: 1000)
+        as in venn2_wordcloud / venn3_wordcloud; only used if output is 'figure',
+        as arrays are always rendered with resolution 'auto' (see render_to_array)
 
-    venn.get_words_by_id = _func
+    cache: LayoutCache instance, str, or None (default: None)
+        as in venn2_wordcloud / venn3_wordcloud
 
-    return _venn_wordcloud(venn, ax, word_to_frequency, **wordcloud_kwargs)
+    layout_engine: 'wordcloud', 'numpy', or callable (default: 'wordcloud')
+        as in venn2_wordcloud / venn3_wordcloud
 
+    Returns:
+    --------
+    generator
+        yields a figure or an RGBA array per item in list_of_sets, in order
 
-def _venn_wordcloud(ExtendedVennDiagram, ax, word_to_frequency=None, **wordcloud_kwargs):
     """
-    Adds a wordcloud to an ExtendedVennDiagram.
+
+    assert output in ('figure', 'array'), "Output needs to be one of 'figure' or 'array'!"
+    _check_calibration(calibration)
+    _check_layout_engine(layout_engine)
+    _check_resolution(resolution)
+    cache = _get_layout_cache(cache)
+    word_to_frequency = _get_word_to_frequency(word_to_frequency) # convert once for all diagrams
+
+    if (executor is None) and (n_jobs not in (None, 1)):
+        with ProcessPoolExecutor(max_workers=None if n_jobs == -1 else n_jobs) as executor:
+            for result in venn_wordcloud_batch(list_of_sets, set_labels, set_colors, set_edgecolors, alpha,
+                                               word_to_frequency, wordcloud_kwargs, calibration, output,
+                                               figsize, dpi, executor=executor, max_pending=max_pending,
+                                               resolution=resolution, cache=cache, layout_engine=layout_engine):
+                yield result
+        return
+
+    if max_pending is None:
+        max_pending = 2 * (os.cpu_count() or 1)
+
+    list_of_sets = iter(list_of_sets)
+    exhausted = False
+    pending = deque()
+    while True:
+
+        # start new diagrams
+        while (not exhausted) and (len(pending) < max_pending):
+            try:
+                sets = next(list_of_sets)
+            except StopIteration:
+                exhausted = True
+                break
+
+            _check_sets(sets)
+
+            fig, ax = _get_headless_figure(figsize, dpi)
+
+            default_colors, default_edgecolors, default_alpha = _DEFAULT_STYLES[len(sets)]
+            venn = _get_extended_venn(sets, set_labels,
+                                      set_colors or default_colors,
+                                      set_edgecolors or default_edgecolors,
+                                      default_alpha if alpha is None else alpha, ax)
+
+            if output == 'figure':
+                renderer = _WordcloudRenderer(venn, ax, word_to_frequency, calibration,
+                                              img=_get_axis_image(ax, resolution), cache=cache,
+                                              layout_engine=layout_engine, **wordcloud_kwargs)
+            else:
+                renderer = _get_headless_renderer(venn, ax, word_to_frequency, calibration, cache,
+                                                  layout_engine, **wordcloud_kwargs)
+            renderer.step(executor)
+            pending.append((fig, renderer))
+
+        if not pending:
+            return
+
+        # advance each diagram whose submitted work has completed
+        futures = [future for _, renderer in pending for future in renderer.futures if not future.done()]
+        if futures:
+            wait(futures, return_when=FIRST_COMPLETED)
+
+        for _, renderer in pending:
+            if (not renderer.done) and all(future.done() for future in renderer.futures):
+                renderer.step(executor)
+
+        # return finished diagrams in order
+        while pending and pending[0][1].done:
+            fig, renderer = pending.popleft()
+            if output == 'figure':
+                yield fig
+            else:
+                yield _composite(fig, renderer.img)
+
+
+def venn_wordcloud_from_tokens(sources,
+                               top_k=500,
+                               tokenize=None,
+                               encoding='utf-8',
+                               set_labels=None,
+                               set_colors=None,
+                               set_edgecolors=None,
+                               alpha=None,
+                               ax=None,
+                               wordcloud_kwargs={'color_func':_default_color_func},
+                               calibration='exact',
+                               n_jobs=None,
+                               executor=None,
+                               resolution=1000,
+                               cache=None,
+                               profile=False,
+                               layout_engine='wordcloud',
+                               output='image'):
+
+    """
+    Plot a Venn diagram based on two or three streams of tokens
+    (e.g. words of a corpus). The most frequent words of each subset are
+    plotted as a word cloud on top, with font sizes scaled by the word counts.
+
+    The tokens are consumed in a single pass, and only the count and the
+    set membership of each distinct token are kept, such that the memory
+    requirements scale with the size of the vocabulary rather than the size of
+    the corpus. The areas of the diagram reflect the full subsets, even
+    if only the top_k words of each subset are plotted.
 
     Arguments:
     ----------
+    sources: [source_1, source_2] or [source_1, source_2, source_3]
+        each source is an iterable of tokens (any hashable objects, usually strings),
+        or the path to a text file, whose lines are split into tokens with tokenize
+
+    top_k: int or None (default: 500)
+        maximum number of words plotted per subset; the most frequent words are kept;
+        only a few hundred words fit into a typical subset patch anyway;
+        None keeps all words
+
+    tokenize: callable or None (default: None)
+        function that splits a string into a list of tokens;
+        applied to each line of text files (default: str.split), and,
+        if given, to each item of iterable sources (e.g. to split documents into tokens)
+
+    encoding: str (default: 'utf-8')
+        encoding of text files
+
+    set_labels, set_colors, set_edgecolors, alpha, ax:
+        as in venn2_wordcloud / venn3_wordcloud;
+        None uses the defaults of venn2_wordcloud / venn3_wordcloud
+
+    wordcloud_kwargs, calibration, n_jobs, executor, resolution, cache, profile, layout_engine, output:
+        as in venn2_wordcloud / venn3_wordcloud;
+        if profiling, counting the tokens is recorded as an additional stage ('tokens')
+
+    Returns:
+    --------
     ExtendendVennDiagram:
-        matplotlib_venn.VennDiagram instance
-        with the addition of the following methods and attributes:
+        as returned by venn2_wordcloud / venn3_wordcloud,
+        with the addition of the attribute
 
-        .uids
-            tuple of unique IDs
-            venn2: ('10', '01', '11')
-            venn3: ('100', '010', '110', '001', '101', '011', '111')
+        .subset_sizes
+            dict mapping each unique ID to the number of distinct words in the
+            corresponding subset (before removing all but the top_k words)
 
-        .get_words_by_id(uid)
-            Returns a list of words associated with each given subset.
+    Example:
+    --------
+    venn_wordcloud_from_tokens(['corpus_1.txt', 'corpus_2.txt'], tokenize=lambda line: line.lower().split())
 
-    ax:
-        matplotlib.axes._subplots.AxesSubplot instance
+    """
+
+    assert len(sources) in _GEOMETRY_BACKENDS, \
+        "Number of sources needs to be one of {}!".format(', '.join(str(n) for n in sorted(_GEOMETRY_BACKENDS)))
+    assert (top_k is None) or (top_k > 0), "top_k needs to be a positive integer or None!"
+    _check_calibration(calibration)
+    _check_layout_engine(layout_engine)
+    _check_resolution(resolution)
+    _check_output(output)
+
+    profiler = _Profiler(profile) if profile else None
+    if profiler:
+        profiler.begin('tokens')
+
+    word_to_count, memberships = _count_tokens(sources, tokenize, encoding)
+    assert len(word_to_count) > 0, "The sources do not contain any tokens!"
+    words_by_id, subset_sizes = _get_top_words_by_id(word_to_count, memberships, len(sources), top_k)
+
+    # create venn diagram, grab ax
+    if not ax:
+        ax = _get_axis()
+
+    if profiler:
+        profiler.begin('geometry')
+
+    default_colors, default_edgecolors, default_alpha = _DEFAULT_STYLES[len(sources)]
+    venn = _get_extended_venn(None, set_labels,
+                              set_colors or default_colors,
+                              set_edgecolors or default_edgecolors,
+                              default_alpha if alpha is None else alpha, ax,
+                              words_by_id=words_by_id, subset_sizes=subset_sizes)
+    venn.subset_sizes = subset_sizes
+
+    return _venn_wordcloud(venn, ax, word_to_count, calibration, n_jobs, executor, resolution,
+                           _get_layout_cache(cache), profiler, layout_engine, output, **wordcloud_kwargs)
+
+
+def render_to_array(sets,
+                    width=800,
+                    height=800,
+                    dpi=100,
+                    set_labels=None,
+                    set_colors=None,
+                    set_edgecolors=None,
+                    alpha=None,
+                    word_to_frequency=None,
+                    wordcloud_kwargs={'color_func':_default_color_func},
+                    calibration='exact',
+                    n_jobs=None,
+                    executor=None,
+                    resolution='auto',
+                    cache=None,
+                    layout_engine='wordcloud'):
+
+    """
+    Render a Venn diagram with word clouds on top into an RGBA array.
+
+    The figure is drawn with the Agg backend without involving pyplot,
+    and the word clouds are laid out at the pixel resolution of the
+    axis (by default) and composited directly onto the rendered figure.
+    Hence this function can also be used in worker threads.
+
+    Arguments:
+    ----------
+    sets: [set_1, set_2] or [set_1, set_2, set_3]
+        list of sets of words (or any strings)
+
+    width, height: int (default: 800)
+        size of the image in pixels
+
+    dpi: float (default: 100)
+        resolution of the figure; determines the size of the set labels
+        and the line widths relative to the image size
+
+    set_labels, set_colors, set_edgecolors, alpha:
+        as in venn2_wordcloud / venn3_wordcloud;
+        None uses the defaults of venn2_wordcloud / venn3_wordcloud
+
+    word_to_frequency, wordcloud_kwargs, calibration, n_jobs, executor, cache, layout_engine:
+        as in venn2_wordcloud / venn3_wordcloud
+
+    resolution: int or 'auto' (default: 'auto')
+        width of the word cloud image in pixels; 'auto' matches the pixels
+        that the axis occupies in the image, but the word clouds of small
+        images are laid out at a minimum width of 500 pixels;
+        word cloud images that do not match the axis are resampled
 
     Returns:
     --------
-    ExtendedVennDiagram
+    rgba: numpy.ndarray
+        uint8 array with shape (height, width, 4)
 
     """
 
-    # remove default subset labels; we will put a word cloud there instead
-    for mpl_text in ExtendedVennDiagram.subset_labels:
-        if mpl_text: # set intersection may not exist
-            mpl_text.set_text('')
-
-    # initialise an image that spans the axis
-    img = _AxisImage(ax)
-
-    # --------------------------------------------------------------------------------
-    # Here be dragons!
-
-    # The issue is that fontsizes need to be consistent (i.e. reflect
-    # the overall word frequency) across the different patches
-    # (subsets of the venn diagram). However, you can only figure out
-    # the maximum/minimum fontsize for each patch by running the
-    # packing algorithm. So you need to run wordcloud twice, first
-    # without setting the maximum/minimum font size, then with setting
-    # the maximum/minimum fontsize such that the relative word
-    # frequencies appear consistent across patches.
-
-    # figure out maximum fontsize for each set/wordcloud,
-    # such that the fontsizes across sets/wordclouds are consistent with the relative frequencies
-    # TODO: also take word bbox width into account
-    given_max_font_size = wordcloud_kwargs.pop('max_font_size', None)
-    given_min_font_size = wordcloud_kwargs.pop('min_font_size', None)
-
-    max_font_sizes                 = np.full((len(ExtendedVennDiagram.uids)), np.nan)
-    min_font_sizes                 = np.full_like(max_font_sizes, np.nan)
-    max_font_size_word_frequencies = np.ones_like(max_font_sizes)
-    min_font_size_word_frequencies = np.ones_like(max_font_sizes)
-    # max_bbox_widths = np.zeros_like(max_font_sizes)
-    for ii, uid in enumerate(ExtendedVennDiagram.uids):
-        patch = ExtendedVennDiagram.get_patch_by_id(uid)
-        words = ExtendedVennDiagram.get_words_by_id(uid)
-        if (patch is None) and (len(words) > 0):
-            msg = "Patch corresponding to subset {uid} does not exist even though the set appears to be non-empty:\n"
-            for word in words:
-                msg += '    {}\n'.format(word)
-            msg += 'Skipping creation of wordcloud for subset {uid}'.format(uid=uid)
-            import warnings
-            warnings.warn(msg)
-            continue
+    _check_sets(sets)
+    _check_calibration(calibration)
+    _check_layout_engine(layout_engine)
+    _check_resolution(resolution)
 
-        wc = _get_wordcloud(img, patch, words, word_to_frequency, **wordcloud_kwargs)
+    if (executor is None) and (n_jobs not in (None, 1)):
+        with ProcessPoolExecutor(max_workers=None if n_jobs == -1 else n_jobs) as executor:
+            return render_to_array(sets, width, height, dpi, set_labels, set_colors, set_edgecolors, alpha,
+                                   word_to_frequency, wordcloud_kwargs, calibration, executor=executor,
+                                   resolution=resolution, cache=cache, layout_engine=layout_engine)
 
-        # bbox_widths = [len(item[0][0]) * item[1] for item in wc.layout_] # word, freq
-        font_sizes = [item[1] for item in wc.layout_]
-        max_idx = np.argmax(font_sizes)
-        min_idx = np.argmin(font_sizes)
-        max_font_sizes[ii] = font_sizes[max_idx]
-        min_font_sizes[ii] = font_sizes[min_idx]
+    fig, ax = _get_headless_figure((width / dpi, height / dpi), dpi)
 
-        if word_to_frequency:
-            max_font_size_word = wc.layout_[max_idx][0][0]
-            max_font_size_word_frequencies[ii] = word_to_frequency[max_font_size_word]
-            min_font_size_word = wc.layout_[min_idx][0][0]
-            min_font_size_word_frequencies[ii] = word_to_frequency[min_font_size_word]
+    default_colors, default_edgecolors, default_alpha = _DEFAULT_STYLES[len(sets)]
+    venn = _get_extended_venn(sets, set_labels,
+                              set_colors or default_colors,
+                              set_edgecolors or default_edgecolors,
+                              default_alpha if alpha is None else alpha, ax)
 
-    valid = ~np.isnan(max_font_sizes)
-    max_font_sizes                 = max_font_sizes                [valid]
-    min_font_sizes                 = min_font_sizes                [valid]
-    max_font_size_word_frequencies = max_font_size_word_frequencies[valid]
-    min_font_size_word_frequencies = min_font_size_word_frequencies[valid]
+    renderer = _get_headless_renderer(venn, ax, word_to_frequency, calibration,
+                                      _get_layout_cache(cache), layout_engine, resolution, **wordcloud_kwargs)
+    while not renderer.done:
+        # errors are raised when the renderer retrieves the results in the next step
+        wait(renderer.step(executor))
 
-    idx = np.argmin(max_font_sizes / max_font_size_word_frequencies)
-    max_font_sizes = max_font_size_word_frequencies * max_font_sizes[idx] / max_font_size_word_frequencies[idx]
+    return _composite(fig, renderer.img)
 
-    idx = np.argmin(min_font_sizes / min_font_size_word_frequencies)
-    min_font_sizes = min_font_size_word_frequencies * min_font_sizes[idx] / min_font_size_word_frequencies[idx]
 
-    # rescale min/max font sizes if a value is specified by the user
-    if given_max_font_size:
-        if given_max_font_size >= np.max(max_font_sizes):
-            # Ignore the argument.
-            # As is, we already don't have enough space for text objects of that
-            # size in at least one of the patches.
-            pass
-        else:
-            max_font_sizes *= given_max_font_size / np.max(max_font_sizes)
+def render_to_png(sets, *args, **kwargs):
+    """
+    Render a Venn diagram with word clouds on top into PNG data.
 
-    if given_min_font_size:
-        if given_min_font_size < np.min(min_font_sizes):
-            # Ignore the argument. All minimum font sizes are larger.
-            pass
-        else:
-            min_font_sizes *= given_min_font_size / np.min(min_font_sizes)
+    Arguments:
+    ----------
+    sets, *args, **kwargs:
+        as in render_to_array
 
-    # --------------------------------------------------------------------------------
+    Returns:
+    --------
+    png: bytes
 
-    # create a word cloud for each patch region and combine word clouds into one image
-    ctr = 0
-    for ii, uid in enumerate(ExtendedVennDiagram.uids):
-        patch = ExtendedVennDiagram.get_patch_by_id(uid)
-        words = ExtendedVennDiagram.get_words_by_id(uid)
-        if (patch is None):
-            ctr += 1
-            continue
-        wc = _get_wordcloud(img, patch, words, word_to_frequency,
-                            max_font_size=max_font_sizes[ii-ctr],
-                            min_font_size=min_font_sizes[ii-ctr],
-                            **wordcloud_kwargs)
+    """
 
-        # matplotlib alpha values are between 0.-1.,
-        # not 0-255 as returned by wordcloud
-        img.rgba += wc.to_array() / 255.
+    from io import BytesIO
+    from PIL import Image
 
-    img.imshow(interpolation='bilinear')
+    rgba = render_to_array(sets, *args, **kwargs)
+    buffer = BytesIO()
+    Image.fromarray(rgba, mode='RGBA').save(buffer, format='png')
+    return buffer.getvalue()
 
-    return ExtendedVennDiagram
 
+# geometry backends by number of sets: names of the matplotlib_venn (venn function, venn circles function)
+_GEOMETRY_BACKENDS = {
+    2 : ('venn2', 'venn2_circles'),
+    3 : ('venn3', 'venn3_circles'),
+}
 
-def _get_wordcloud(img, patch, words, word_to_frequency=None, **wordcloud_kwargs):
 
-    # get the boolean mask corresponding to each patch
-    if isinstance(patch, Circle):
-        # We need to solve two problems here:
-        # 1) The path of Circle patches is always the unit circle.
-        #    We need to apply the circle transform to the `path` attribute to get
-        #    the correct path.
-        # 2) The Circle object returned by matplotlib-venn is messed up.
-        #    The transform is not doing what it should do.
-        # path = transform.transform_path(old_path)
+def _get_geometry_backend(total_sets):
+    import matplotlib_venn
+    return tuple(getattr(matplotlib_venn, name) for name in _GEOMETRY_BACKENDS[total_sets])
 
-        # Create a new patch with the same parameters as the given Circle patch.
-        dummy = Circle(patch.center, patch.radius)
 
-        # Apply transform to get the correct path.
-        transform = dummy.get_transform()
-        unit_circle_path = dummy.get_path()
-        path = transform.transform_path(unit_circle_path)
+def _get_axis():
+    # pyplot is only imported if no axis is given
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots(1,1)
+    return ax
+
+
+# default appearance by number of sets: (set_colors, set_edgecolors, alpha)
+_DEFAULT_STYLES = {
+    2 : (['w', 'w'], ['k', 'k'], 0.4),
+    3 : (['w', 'w', 'w'], ['k', 'k', 'k'], 0.8),
+}
+
+
+def _venn_wordcloud_from_sets(sets, total_sets, set_labels, set_colors, set_edgecolors, alpha, ax,
+                              word_to_frequency, wordcloud_kwargs, calibration, n_jobs, executor, resolution, cache,
+                              profile=False, layout_engine='wordcloud', output='image'):
+    """
+    Shared implementation of venn2_wordcloud and venn3_wordcloud.
+    """
+
+    _check_sets(sets, total_sets)
+    _check_calibration(calibration)
+    _check_layout_engine(layout_engine)
+    _check_resolution(resolution)
+    _check_output(output)
+
+    # create venn diagram, grab ax
+    if not ax:
+        ax = _get_axis()
+
+    profiler = _Profiler(profile) if profile else None
+    if profiler:
+        profiler.begin('geometry')
+
+    venn = _get_extended_venn(sets, set_labels, set_colors, set_edgecolors, alpha, ax)
+
+    return _venn_wordcloud(venn, ax, word_to_frequency, calibration, n_jobs, executor, resolution,
+                           _get_layout_cache(cache), profiler, layout_engine, output, **wordcloud_kwargs)
+
+
+def _check_calibration(calibration):
+    assert calibration in ('exact', 'coarse', 'estimate'), \
+        "Calibration needs to be one of 'exact', 'coarse', or 'estimate'!"
+
+
+def _check_layout_engine(layout_engine):
+    assert (layout_engine in ('wordcloud', 'numpy')) or callable(layout_engine), \
+        "Layout engine needs to be one of 'wordcloud', 'numpy', or a callable!"
+
+
+def _get_layout_engine(layout_engine):
+    """
+    Returns the function that lays out the words of all subsets at once
+    (see _packing.pack_words for the signature), or None for WordCloud,
+    which lays out the word cloud of each subset separately.
+    """
+    _check_layout_engine(layout_engine)
+    if layout_engine == 'wordcloud':
+        return None
+    if layout_engine == 'numpy':
+        from matplotlib_venn_wordcloud._packing import pack_words
+        return pack_words
+    return layout_engine
+
+
+def _check_output(output):
+    assert output in ('image', 'text'), "Output needs to be one of 'image' or 'text'!"
+
+
+def _check_resolution(resolution):
+    assert (resolution == 'auto') or (int(resolution) == resolution and resolution > 0), \
+        "Resolution needs to be a positive integer or 'auto'!"
+
+
+def _check_sets(sets, total_sets=None):
+    # check input as requirements for "sets" are more stringent than for venn2/venn3 "subsets"
+    assert np.all([type(elem) == set for elem in sets]), "All elements of 'sets' arguments need to be sets!"
+    if total_sets:
+        assert len(sets) == total_sets, "Number of sets needs to be {}!".format(total_sets)
     else:
-        path = patch.get_path()
+        assert len(sets) in _GEOMETRY_BACKENDS, \
+            "Number of sets needs to be one of {}!".format(', '.join(str(n) for n in sorted(_GEOMETRY_BACKENDS)))
+    assert np.all([len(s) > 0 for s in sets]), "All sets need to have at least one element!"
 
-    mask = path.contains_points(img.pixel_coordinates).reshape((img.y_resolution, img.x_resolution))
 
-    # make mask matplotlib-venn compatible
-    mask = (~mask * 255).astype(np.uint8) # black indicates mask position
-    mask = np.flipud(mask) # origin is in upper left
+def _get_headless_figure(figsize=None, dpi=None):
+    """
+    Create a figure with an Agg canvas that is not managed by pyplot.
+    """
 
-    # create wordcloud
-    wc = WordCloud(mask=mask,
-                   background_color=None,
-                   mode="RGBA",
-                   **wordcloud_kwargs)
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
 
-    if not word_to_frequency:
-        # create mapping word : int
-        word_to_frequency = dict()
-        for word in words:
-            try:
-                word_to_frequency[word] += 1
-            except KeyError:
-                word_to_frequency[word] = 1
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
+    return fig, ax
 
-    wc.generate_from_frequencies({word: word_to_frequency[word] for word in words})
 
-    return wc
+def _get_headless_renderer(ExtendedVennDiagram, ax, word_to_frequency=None, calibration='exact', cache=None,
+                           layout_engine='wordcloud', resolution='auto', **wordcloud_kwargs):
+    """
+    Create a _WordcloudRenderer, whose image is composited onto the
+    rendered figure (see _composite). By default, the image matches the
+    pixels that the axis occupies in the rendered figure, such that the
+    word clouds can be composited without resampling (see _get_axis_image).
+    """
 
+    return _WordcloudRenderer(ExtendedVennDiagram, ax, word_to_frequency, calibration,
+                              img=_get_axis_image(ax, resolution), overlay=False, cache=cache,
+                              layout_engine=layout_engine, **wordcloud_kwargs)
 
-class _AxisImage(object):
+
+# Minimum width (in pixels) of the word cloud image in the 'auto' resolution mode.
+# As the minimum font size is given in pixels, the regions of small axes
+# cannot fit any words otherwise, and the image is resampled instead.
+_MIN_AUTO_RESOLUTION = 500
+
+
+def _get_axis_image(ax, resolution=1000):
     """
-    Create an image that spans the given axis.
+    Create an _AxisImage with the given resolution;
+    'auto' matches the pixels that the axis occupies in the rendered figure,
+    but is at least _MIN_AUTO_RESOLUTION pixels wide.
     """
 
-    def __init__(self, ax, resolution=1000):
-        self.ax = ax
-        self.x_resolution = resolution
+    if resolution == 'auto':
+        r0, r1, c0, c1 = _get_axis_pixel_extent(ax)
+        if c1 - c0 < _MIN_AUTO_RESOLUTION:
+            return _AxisImage(ax, resolution=_MIN_AUTO_RESOLUTION)
+        return _AxisImage(ax, resolution=c1-c0, y_resolution=r1-r0)
+    return _AxisImage(ax, resolution=int(resolution))
 
-        # set resolution in y
-        xlim = ax.get_xlim()
-        ylim = ax.get_ylim()
-        width = xlim[1] - xlim[0]
-        height = ylim[1] - ylim[0]
-        self.y_resolution = int(height * self.x_resolution / width)
 
-        # determine pixel coordinates
-        x = np.linspace(xlim[0], xlim[1], self.x_resolution)
-        y = np.linspace(ylim[0], ylim[1], self.y_resolution)
-        xgrid, ygrid = np.meshgrid(x, y)
-        self.pixel_coordinates = np.c_[xgrid.ravel(), ygrid.ravel()]
+def _get_axis_pixel_extent(ax):
+    """
+    Returns the rows and columns (r0, r1, c0, c1) of the rendered
+    figure that are covered by the axis.
+    """
+
+    # venn diagrams have an equal aspect ratio, which shrinks the axis when the figure is drawn
+    ax.apply_aspect()
+    bbox = ax.get_window_extent()
+    total_rows = int(round(ax.get_figure().bbox.height))
+    c0, c1 = int(round(bbox.x0)), int(round(bbox.x1))
+    r0, r1 = total_rows - int(round(bbox.y1)), total_rows - int(round(bbox.y0))
+    return r0, r1, c0, c1
+
+
+def _composite(fig, img):
+    """
+    Draw the figure and composite the image (an _AxisImage created
+    by _get_headless_renderer) onto the axis, resampling it if its
+    resolution does not match the pixels that the axis occupies.
+    Returns the result as an uint8 RGBA array.
+    """
+
+    fig.canvas.draw()
+    rgba = np.array(fig.canvas.buffer_rgba())
+
+    r0, r1, c0, c1 = _get_axis_pixel_extent(img.ax)
+    background = rgba[r0:r1, c0:c1] / 255.
+    foreground = _resample(img.rgba, (r1 - r0, c1 - c0)) / 255.
+
+    # alpha compositing ("over" operator)
+    alpha = foreground[..., 3:]
+    combined = np.empty_like(background)
+    combined[..., 3:] = alpha + background[..., 3:] * (1 - alpha)
+    combined[..., :3] = (foreground[..., :3] * alpha + background[..., :3] * background[..., 3:] * (1 - alpha)) \
+                        / np.maximum(combined[..., 3:], 1e-12)
+
+    rgba[r0:r1, c0:c1] = np.round(combined * 255).astype(np.uint8)
+    return rgba
+
+
+def _resample(rgba, shape):
+    """
+    Resample the uint8 RGBA array to the given shape (rows, columns);
+    arrays that already have the shape are returned as they are.
+    """
+
+    if rgba.shape[:2] == tuple(shape):
+        return rgba
+
+    from PIL import Image
+
+    # Pillow resamples RGBA images with premultiplied alpha
+    image = Image.fromarray(rgba, mode='RGBA').resize((shape[1], shape[0]), Image.BOX)
+    return np.asarray(image)
+
+
+def _get_extended_venn(sets, set_labels, set_colors, set_edgecolors, alpha, ax,
+                       words_by_id=None, subset_sizes=None):
+    """
+    Plot the venn diagram (without word clouds) and extend the returned
+    VennDiagram instance (see venn2_wordcloud).
+
+    Instead of the sets, the words of each subset (words_by_id) and the
+    size of each subset (subset_sizes, a dict uid : int) can be given;
+    the sizes determine the geometry, such that the words can be a
+    subsample of the subsets (see venn_wordcloud_from_tokens).
+    """
+
+    subsets = sets if subset_sizes is None else subset_sizes
+    total_sets = len(sets) if subset_sizes is None else len(next(iter(subset_sizes)))
+    venn_function, venn_circles_function = _get_geometry_backend(total_sets)
+
+    venn = venn_function(subsets,
+                         set_labels=set_labels,
+                         set_colors=set_colors,
+                         alpha=alpha,
+                         ax=ax)
+
+    # set edge color;
+    # cannot use edgecolor attribute of patches returned by venn2/venn3
+    # venn2/venn3 patches correspond to subsets and edges of patches are composed of several circles
+    if set_edgecolors:
+        venn_circles = venn_circles_function(subsets, ax=ax)
+        for ii, patch in enumerate(venn_circles):
+            patch.set_edgecolor(set_edgecolors[ii])
+            patch.set_linewidth(3)
+
+        # add circle handles to venn
+        def _func(idx):
+            return venn_circles[idx]
+
+        venn.get_circle_by_idx = _func
+
+    # make default set labels larger
+    if set_labels:
+        for label in venn.set_labels:
+            label.set_fontsize(24.)
+
+    _add_words(venn, sets, words_by_id)
+
+    return venn
+
+
+def _add_words(ExtendedVennDiagram, sets, words_by_id=None):
+    """
+    Group the words by subset id and attach them to the diagram
+    (.uids, .words_by_id, .get_words_by_id).
+    If the words are already grouped (words_by_id), the sets are ignored.
+    """
+
+    if words_by_id is None:
+        words_by_id = _get_words_by_id(sets)
+
+    ExtendedVennDiagram.uids = set(words_by_id)
+    ExtendedVennDiagram.words_by_id = words_by_id
+
+    def _func(uid):
+        return words_by_id.get(uid, [])
+
+    ExtendedVennDiagram.get_words_by_id = _func
+
+    return ExtendedVennDiagram
+
+
+def _get_words_by_id(sets):
+    """
+    Group the words by the subsets of the venn diagram that they belong to.
+
+    The membership of each word is encoded as a bitmask (bit ii is set
+    if the word is an element of sets[ii]), which is computed in a single
+    pass over all sets. The words are then grouped by bitmask using numpy.
+
+    Returns:
+    --------
+    words_by_id: dict uid : list of words
+        unique IDs as in VennDiagram.id2idx, e.g. '10', '01', '11' for two sets
+
+    """
+
+    memberships = dict()
+    for ii, s in enumerate(sets):
+        bit = 1 << ii
+        for word in s:
+            memberships[word] = memberships.get(word, 0) | bit
+
+    return _group_by_membership(memberships, len(sets))
+
+
+def _group_by_membership(memberships, total_sets):
+    """
+    Group the words by their membership bitmask (see _get_words_by_id).
+
+    Arguments:
+    ----------
+    memberships: dict word : int
+        membership bitmask of each word
+
+    total_sets: int
+        number of sets
+
+    Returns:
+    --------
+    words_by_id: dict uid : list of words
+
+    """
+
+    words = np.empty(len(memberships), dtype=object)
+    words[:] = list(memberships)
+    codes = np.fromiter(memberships.values(), dtype=np.int64, count=len(memberships))
+
+    order = np.argsort(codes, kind='stable')
+    codes, idx = np.unique(codes[order], return_index=True)
+    groups = np.split(words[order], idx[1:])
+
+    words_by_id = dict()
+    for code, group in zip(codes, groups):
+        uid = ''.join('1' if code & (1 << ii) else '0' for ii in range(total_sets))
+        words_by_id[uid] = group.tolist()
+
+    return words_by_id
+
+
+def _count_tokens(sources, tokenize=None, encoding='utf-8'):
+    """
+    Count the tokens of all sources in a single pass.
+
+    Returns:
+    --------
+    word_to_count: dict word : int
+        total number of occurrences of each token across all sources
+
+    memberships: dict word : int
+        membership bitmask of each token (bit ii is set if the token occurs in sources[ii])
+
+    """
+
+    word_to_count = dict()
+    memberships = dict()
+    for ii, source in enumerate(sources):
+        bit = 1 << ii
+        # Counter counts in C; the totals are then updated once per distinct token
+        for word, count in Counter(_iterate_tokens(source, tokenize, encoding)).items():
+            word_to_count[word] = word_to_count.get(word, 0) + count
+            memberships[word] = memberships.get(word, 0) | bit
+
+    return word_to_count, memberships
+
+
+def _iterate_tokens(source, tokenize=None, encoding='utf-8'):
+    if isinstance(source, (str, bytes, os.PathLike)):
+        tokenize = tokenize or str.split
+        with open(source, encoding=encoding) as fh:
+            for line in fh:
+                yield from tokenize(line)
+    elif tokenize:
+        for item in source:
+            yield from tokenize(item)
+    else:
+        yield from source
+
+
+def _get_top_words_by_id(word_to_count, memberships, total_sets, top_k=None):
+    """
+    Group the words by subset, and keep only the top_k most frequent words of each subset.
+
+    Returns:
+    --------
+    words_by_id: dict uid : list of words
+
+    subset_sizes: dict uid : int
+        number of words in each subset before pruning
+
+    """
+
+    words_by_id = _group_by_membership(memberships, total_sets)
+    subset_sizes = {uid : len(words) for uid, words in words_by_id.items()}
+
+    if top_k is not None:
+        for uid, words in words_by_id.items():
+            if len(words) > top_k:
+                # bounded heap of size top_k
+                words_by_id[uid] = heapq.nlargest(top_k, words, key=word_to_count.__getitem__)
+
+    return words_by_id, subset_sizes
+
+
+def _venn_wordcloud(ExtendedVennDiagram, ax, word_to_frequency=None, calibration='exact',
+                    n_jobs=None, executor=None, resolution=1000, cache=None, profiler=None, layout_engine='wordcloud',
+                    output='image', **wordcloud_kwargs):
+    """
+    Adds a wordcloud to an ExtendedVennDiagram.
+
+    Arguments:
+    ----------
+    ExtendendVennDiagram:
+        matplotlib_venn.VennDiagram instance
+        with the addition of the following methods and attributes:
+
+        .uids
+            tuple of unique IDs
+            venn2: ('10', '01', '11')
+            venn3: ('100', '010', '110', '001', '101', '011', '111')
+
+        .get_words_by_id(uid)
+            Returns a list of words associated with each given subset.
+
+        .get_patch_by_id(uid)
+            Returns the patch delineating each given subset.
+
+        Any other object providing these methods and attributes can be
+        used as well, e.g. to fill arbitrary regions with word clouds;
+        see _add_words to attach the words to such an object.
+        If available, the circle geometry (.centers, .radii)
+        is used to compute the region masks more quickly.
+
+    ax:
+        matplotlib.axes._subplots.AxesSubplot instance
+
+    calibration: 'exact', 'coarse', or 'estimate' (default: 'exact')
+        method used to determine the font size bounds for each subset
+
+    n_jobs: int or None (default: None)
+        number of worker processes used to lay out the word clouds
+
+    executor: concurrent.futures.Executor instance or None (default: None)
+        executor used to lay out the word clouds; supersedes n_jobs
+
+    resolution: int or 'auto' (default: 1000)
+        width of the word cloud image in pixels (see _get_axis_image)
+
+    cache: LayoutCache instance or None (default: None)
+        persistent cache of the word cloud layouts
+
+    profiler: _Profiler instance or None (default: None)
+        records the wall time of each stage; the results are attached as .profile
+
+    layout_engine: 'wordcloud', 'numpy', or callable (default: 'wordcloud')
+        how the words are packed into the patches (see _get_layout_engine)
+
+    output: 'image' or 'text' (default: 'image')
+        whether the words are drawn into an image or added as text (see _WordcloudRenderer)
+
+    Returns:
+    --------
+    ExtendedVennDiagram
+
+    """
+
+    if (executor is None) and (n_jobs not in (None, 1)):
+        with ProcessPoolExecutor(max_workers=None if n_jobs == -1 else n_jobs) as executor:
+            return _venn_wordcloud(ExtendedVennDiagram, ax, word_to_frequency, calibration,
+                                   executor=executor, resolution=resolution, cache=cache, profiler=profiler,
+                                   layout_engine=layout_engine, output=output, **wordcloud_kwargs)
+
+    renderer = _WordcloudRenderer(ExtendedVennDiagram, ax, word_to_frequency, calibration,
+                                  img=_get_axis_image(ax, resolution), cache=cache, profiler=profiler,
+                                  layout_engine=layout_engine, output=output, **wordcloud_kwargs)
+    while not renderer.done:
+        # errors are raised when the renderer retrieves the results in the next step
+        wait(renderer.step(executor))
+
+    _add_restyling(ExtendedVennDiagram, renderer)
+    _add_updating(ExtendedVennDiagram, renderer)
+    _add_exporting(ExtendedVennDiagram, renderer)
+    ExtendedVennDiagram.dropped_word_counts = renderer.dropped_word_counts
+
+    if profiler:
+        profiler.end()
+        for uid, layout in renderer.layouts.items():
+            profiler.record(uid, words=len(ExtendedVennDiagram.get_words_by_id(uid)),
+                            words_dropped=renderer.dropped_word_counts[uid], words_placed=len(layout))
+        ExtendedVennDiagram.profile = profiler.report()
+
+    return ExtendedVennDiagram
+
+
+def _add_restyling(ExtendedVennDiagram, renderer):
+    """
+    Extend the ExtendedVennDiagram such that its appearance can be
+    changed without laying out the word clouds again
+    (.layouts, .layout_offsets, .word_texts, .recolor, .restyle; see venn2_wordcloud).
+
+    The layouts are kept as they are. Note that plotting the diagram from
+    scratch with a different color_func can result in different layouts,
+    as WordCloud draws the colours from the same random state as the positions.
+    """
+
+    ExtendedVennDiagram.layouts = renderer.layouts
+    ExtendedVennDiagram.layout_offsets = renderer.offsets
+    if renderer.output == 'text':
+        ExtendedVennDiagram.word_texts = renderer.texts
+
+    def _recolor(color_func=None, colormap=None, random_state=None):
+        renderer.recolor(color_func, colormap, random_state)
+        return ExtendedVennDiagram
+
+    def _restyle(set_colors=None, set_edgecolors=None, alpha=None, set_labels=None, color_func=None):
+
+        if (set_colors is not None) or (alpha is not None):
+            # id2idx contains the unique IDs of both, venn2 and venn3 diagrams
+            total_sets = len(next(iter(ExtendedVennDiagram.uids)))
+            for uid in ExtendedVennDiagram.id2idx:
+                if len(uid) != total_sets:
+                    continue
+                patch = ExtendedVennDiagram.get_patch_by_id(uid)
+                if patch is None: # set intersection may not exist
+                    continue
+                if set_colors is not None:
+                    patch.set_facecolor(_get_region_color(set_colors, uid))
+                if alpha is not None:
+                    patch.set_alpha(alpha)
+
+        if set_edgecolors is not None:
+            assert hasattr(ExtendedVennDiagram, 'get_circle_by_idx'), \
+                "Edge colours can only be changed if set_edgecolors were given initially!"
+            for ii, color in enumerate(set_edgecolors):
+                ExtendedVennDiagram.get_circle_by_idx(ii).set_edgecolor(color)
+
+        if set_labels is not None:
+            assert ExtendedVennDiagram.set_labels is not None, \
+                "Set labels can only be changed if set_labels were given initially!"
+            for label, text in zip(ExtendedVennDiagram.set_labels, set_labels):
+                label.set_text(text)
+
+        if color_func is not None:
+            renderer.recolor(color_func)
+        else:
+            renderer.img.draw_idle()
+
+        return ExtendedVennDiagram
+
+    ExtendedVennDiagram.recolor = _recolor
+    ExtendedVennDiagram.restyle = _restyle
+
+    return ExtendedVennDiagram
+
+
+def _add_updating(ExtendedVennDiagram, renderer):
+    """
+    Extend the ExtendedVennDiagram such that words can be added and
+    removed, and frequencies changed, without laying out all word
+    clouds again (.update; see venn2_wordcloud).
+    """
+
+    def _update(added=None, removed=None, new_frequencies=None):
+        renderer.update(added, removed, new_frequencies)
+        return ExtendedVennDiagram
+
+    ExtendedVennDiagram.update = _update
+
+    return ExtendedVennDiagram
+
+
+def _add_exporting(ExtendedVennDiagram, renderer):
+    """
+    Extend the ExtendedVennDiagram such that the layouts can be
+    exported in data coordinates (.export_layout; see venn2_wordcloud).
+    """
+
+    def _export_layout(fmt='json', precision=4):
+        return _dumps(_get_layout_data(renderer, precision), fmt)
+
+    ExtendedVennDiagram.export_layout = _export_layout
+
+    return ExtendedVennDiagram
+
+
+def _get_layout_data(renderer, precision=4):
+    """
+    Collect the geometry of the diagram and the words of each subset
+    in data coordinates (see _export for the format).
+    """
+
+    from matplotlib.colors import to_hex
+
+    venn = renderer.ExtendedVennDiagram
+    font_path = _get_font_path(renderer.wordcloud_kwargs)
+
+    def _round(values):
+        return [round(float(value), precision) for value in values]
+
+    # id2idx contains the unique IDs of both, venn2 and venn3 diagrams
+    subsets = dict()
+    for uid in getattr(venn, 'id2idx', venn.uids):
+        if len(uid) != renderer.total_sets:
+            continue
+        patch = venn.get_patch_by_id(uid)
+        words = []
+        if uid in renderer.layouts:
+            positions = _get_word_positions(renderer.img, renderer.layouts[uid], font_path, *renderer.offsets[uid])
+            for word, x, y, font_size, rotation, color in positions:
+                words.append([word] + _round((x, y, font_size)) + [rotation, color])
+        if (patch is None) and not words:
+            continue
+        subsets[uid] = dict(
+            patch = None if patch is None else [[_round(point) for point in polygon]
+                                                for polygon in _get_path(patch).to_polygons(closed_only=False)],
+            color = None if patch is None else to_hex(patch.get_facecolor(), keep_alpha=True),
+            words = words,
+        )
+
+    circles = []
+    for ii, (center, radius, _) in enumerate(_get_region_circles(venn, '1' * renderer.total_sets) or []):
+        circle = dict(center=_round(center), radius=round(radius, precision))
+        if hasattr(venn, 'get_circle_by_idx'):
+            patch = venn.get_circle_by_idx(ii)
+            circle.update(edgecolor=to_hex(patch.get_edgecolor(), keep_alpha=True), linewidth=patch.get_linewidth())
+        circles.append(circle)
+
+    set_labels = None
+    if getattr(venn, 'set_labels', None):
+        set_labels = [dict(text=label.get_text(), x=round(float(label.get_position()[0]), precision),
+                           y=round(float(label.get_position()[1]), precision), fontsize=label.get_fontsize(),
+                           ha=label.get_horizontalalignment(), va=label.get_verticalalignment())
+                      for label in venn.set_labels if label is not None]
+
+    return dict(version=_FORMAT_VERSION, xlim=_round(renderer.img.xlim), ylim=_round(renderer.img.ylim),
+                font=font_path, subsets=subsets, circles=circles, set_labels=set_labels)
+
+
+def _get_region_color(set_colors, uid):
+    """
+    Compute the face colour of a subset as in venn2/venn3.
+    """
+
+    from matplotlib.colors import to_rgb
+    from matplotlib_venn._common import mix_colors
+    colors = [np.array(to_rgb(color)) for color, bit in zip(set_colors, uid) if bit == '1']
+    return colors[0] if len(colors) == 1 else mix_colors(*colors)
+
+
+class _WordcloudRenderer(object):
+    """
+    Adds a wordcloud to an ExtendedVennDiagram in stages:
+
+    1) determine the font size bounds for each subset,
+    2) lay out the word cloud for each subset,
+    3) combine the word clouds into one image.
+
+    The work of each stage is submitted to an (optional) executor;
+    step() returns the futures that need to complete before the next
+    call to step(). This allows to interleave the stages of several
+    renderers that share one executor (see venn_wordcloud_batch).
+
+    If overlay is False, the combined image is not plotted; instead,
+    it can be composited onto the rendered figure (see _composite).
+
+    If a LayoutCache is given and the layouts are found in the cache,
+    the first step redraws the cached layouts, and no further steps
+    are needed. The layouts of each subset are stored in .layouts.
+
+    If a _Profiler is given, the wall time of each stage, and of each
+    subset within each stage, is recorded.
+
+    If a layout engine other than WordCloud is given (see _get_layout_engine),
+    the words of all subsets are laid out in one go instead, and the
+    stages are 1) lay out all word clouds, 2) draw them into one image.
+
+    If output is 'text', the words are not drawn into the image; instead,
+    each word is added to the axis as a matplotlib.text.Text instance
+    (see _add_texts), which are stored in .texts.
+    """
+
+    def __init__(self, ExtendedVennDiagram, ax, word_to_frequency=None, calibration='exact',
+                 img=None, overlay=True, cache=None, profiler=None, layout_engine='wordcloud', output='image',
+                 **wordcloud_kwargs):
+
+        self.profiler = profiler
+        if profiler:
+            profiler.begin('masks')
+
+        self.ExtendedVennDiagram = ExtendedVennDiagram
+        self.word_to_frequency = _get_word_to_frequency(word_to_frequency)
+        self.total_sets = len(next(iter(ExtendedVennDiagram.uids)))
+        self.done = False
+
+        # remove default subset labels; we will put a word cloud there instead
+        for mpl_text in getattr(ExtendedVennDiagram, 'subset_labels', []):
+            if mpl_text: # set intersection may not exist
+                mpl_text.set_text('')
+
+        # initialise an image that spans the axis
+        self.img = _AxisImage(ax) if img is None else img
+        self.overlay = overlay
+        self.output = output
+        self.texts = dict()
+
+        # --------------------------------------------------------------------------------
+        # Here be dragons!
+
+        # The issue is that fontsizes need to be consistent (i.e. reflect
+        # the overall word frequency) across the different patches
+        # (subsets of the venn diagram). However, you can only figure out
+        # the maximum/minimum fontsize for each patch by running the
+        # packing algorithm. So you need to run wordcloud twice, first
+        # without setting the maximum/minimum font size, then with setting
+        # the maximum/minimum fontsize such that the relative word
+        # frequencies appear consistent across patches.
+        # The first run can be made cheaper by running it on a coarser
+        # mask (see _get_coarse_font_size_bounds), or skipped altogether
+        # by estimating the maximum/minimum fontsizes (see _estimate_font_size_bounds).
+
+        # figure out maximum fontsize for each set/wordcloud,
+        # such that the fontsizes across sets/wordclouds are consistent with the relative frequencies
+        # TODO: also take word bbox width into account
+        self.given_max_font_size = wordcloud_kwargs.pop('max_font_size', None)
+        self.given_min_font_size = wordcloud_kwargs.pop('min_font_size', None)
+        self.wordcloud_kwargs = wordcloud_kwargs
+
+        self._alignment = 1 # of the cropped masks (see _get_crop_extent)
+        if calibration == 'exact':
+            self.get_font_size_bounds = _get_font_size_bounds
+        elif calibration == 'coarse':
+            # the downsampling factor depends on the image, not on the (cropped) masks
+            factor = max(1, self.img.x_resolution // _COARSE_RESOLUTION)
+            self.get_font_size_bounds = functools.partial(_get_coarse_font_size_bounds, factor=factor)
+            self._alignment = factor
+        elif calibration == 'estimate':
+            self.get_font_size_bounds = _estimate_font_size_bounds
+        else:
+            raise ValueError("Calibration needs to be one of 'exact', 'coarse', or 'estimate', not '{}'.".format(calibration))
+
+        # None: each subset is laid out separately by WordCloud (see above)
+        self.layout_engine = _get_layout_engine(layout_engine)
+
+        # Collect the inputs for the packing algorithm for each subset.
+        # Each mask is computed once, as it is required for both passes.
+        # Only masks and frequency dicts are passed to the packing algorithm,
+        # such that it can run in another process.
+        # Only the max_words most frequent words of each subset are passed on,
+        # as WordCloud ignores the others anyway; otherwise, the cost of sorting
+        # and copying the words scales with the size of the vocabulary.
+        # Similarly, each word cloud is laid out on a canvas that only spans
+        # the bounding box of the patch, such that its cost scales with the
+        # area of the patch rather than the area of the image (see _get_crop_extent).
+        self.jobs = []
+        self.offsets = dict()
+        self.dropped_word_counts = dict()
+        for uid in ExtendedVennDiagram.uids:
+            patch = ExtendedVennDiagram.get_patch_by_id(uid)
+            words = ExtendedVennDiagram.get_words_by_id(uid)
+            if (patch is None) and (len(words) > 0):
+                msg = "Patch corresponding to subset {uid} does not exist even though the set appears to be non-empty:\n"
+                for word in words:
+                    msg += '    {}\n'.format(word)
+                msg += 'Skipping creation of wordcloud for subset {uid}'.format(uid=uid)
+                import warnings
+                warnings.warn(msg)
+                continue
+
+            tic = time.perf_counter()
+            mask = self._get_mask(patch, uid)
+            self.jobs.append((uid, mask, self._get_frequencies(uid, words)))
+            if profiler:
+                profiler.add_time(uid, 'masks', time.perf_counter() - tic)
+                profiler.record(uid, pixels=int(np.count_nonzero(mask != 255)))
+
+        # look up the layouts in the (optional) persistent cache
+        self.cache = cache
+        self.cache_key = None
+        self._cached = None
+        if cache is not None:
+            self.cache_key = _get_layout_key(self.jobs, self.offsets, self.img.rgba.shape, calibration,
+                                             self.given_max_font_size, self.given_min_font_size,
+                                             self.wordcloud_kwargs, layout_engine)
+            if self.cache_key is not None:
+                self._cached = cache.get(self.cache_key)
+
+        if (self._cached is None) and (self.layout_engine is None):
+            self._stages = iter([self._submit_calibration, self._submit_layout, self._combine])
+        elif self._cached is None:
+            self._stages = iter([self._submit_packing, self._draw])
+        else:
+            self._stages = iter([self._restore])
+        self.futures = []
+        self.layouts = dict()
+        self.font_size_bounds = dict()
+        self.max_font_sizes = dict()
+        self.min_font_sizes = dict()
+        self._uid_by_word = None
+
+
+    def _get_mask(self, patch, uid):
+        # mask cropped to the bounding box of the patch; the offset of the crop is stored in .offsets
+        mask = _get_mask(self.img, patch, _get_region_circles(self.ExtendedVennDiagram, uid))
+        r0, r1, c0, c1 = _get_crop_extent(mask, self._alignment)
+        self.offsets[uid] = (int(r0), int(c0))
+        return mask[r0:r1, c0:c1]
+
+
+    def _add(self, uid, mask, wc):
+        row, column = self.offsets[uid]
+        if self.output == 'text':
+            self._remove_texts(uid)
+            self.texts[uid] = _add_texts(self.img.ax, self.img, wc.layout_, wc.font_path, row, column)
+            return
+
+        # words are only placed within the patch, so only its bounding box needs to be touched
+        r0, r1, c0, c1 = _get_mask_extent(mask)
+        if wc.contour_width or (wc.scale != 1):
+            rgba = wc.to_array()[r0:r1, c0:c1]
+        else:
+            rgba = _draw_layout(wc.layout_, (r1 - r0, c1 - c0), wc.font_path, r0, c0)
+        self.img.add(rgba, row + r0, column + c0)
+
+
+    def _get_frequencies(self, uid, words):
+        # frequencies of the max_words most frequent words, which are the only words that WordCloud considers
+        frequencies = _get_frequencies(words, self.word_to_frequency)
+        kept = _get_top_indices(frequencies, self.wordcloud_kwargs.get('max_words', 200))
+        self.dropped_word_counts[uid] = len(words) - len(kept)
+        return _get_frequency_dict(words, frequencies, kept)
+
+
+    def step(self, executor=None):
+        """
+        Advance to the next stage. Returns the submitted futures.
+        """
+        stage = next(self._stages)
+        if self.profiler:
+            # a stage lasts until the next stage begins, i.e. it includes waiting for its futures
+            self.profiler.begin(self._stage_names[stage.__name__])
+        self.futures = stage(executor)
+        self.done = stage in (self._combine, self._draw, self._restore)
+        return self.futures
+
+
+    _stage_names = dict(_submit_calibration='calibration', _submit_layout='layout',
+                        _combine='combine', _restore='restore',
+                        _submit_packing='layout', _draw='combine')
+
+
+    def _submit(self, executor, function, *args, **kwargs):
+        # if profiling, the function is timed where it runs, i.e. possibly in another process
+        if self.profiler:
+            return _submit(executor, _call_timed, function, *args, **kwargs)
+        return _submit(executor, function, *args, **kwargs)
+
+
+    def _get_result(self, uid, future, stage):
+        # uid is None for work that spans all subsets
+        if self.profiler:
+            result, seconds = future.result()
+            if uid is not None:
+                self.profiler.add_time(uid, stage, seconds)
+            return result
+        return future.result()
+
+
+    def _submit_calibration(self, executor):
+        return [self._submit(executor, self.get_font_size_bounds, mask, frequencies, **self.wordcloud_kwargs)
+                for _, mask, frequencies in self.jobs]
+
+
+    def _submit_layout(self, executor):
+
+        self.font_size_bounds = dict()
+        for (uid, _, _), future in zip(list(self.jobs), self.futures):
+            try:
+                self.font_size_bounds[uid] = self._get_result(uid, future, 'calibration')
+            except ValueError as error:
+                self._skip(uid, error)
+        self._reconcile_font_sizes()
+
+        # create a word cloud for each patch region
+        return [self._submit(executor, _get_wordcloud, mask, frequencies,
+                             self.max_font_sizes[uid], self.min_font_sizes[uid], **self.wordcloud_kwargs)
+                for uid, mask, frequencies in self.jobs]
+
+
+    def _skip(self, uid, error):
+        # The packing algorithm raises a ValueError if the patch is too small
+        # to fit any word at the minimum font size (at the resolution of the image).
+        import warnings
+        warnings.warn("Patch corresponding to subset {uid} is too small to fit any word ({error}); skipping creation of wordcloud for subset {uid}".format(uid=uid, error=error))
+        self.jobs = [job for job in self.jobs if job[0] != uid]
+
+
+    def _reconcile_font_sizes(self):
+
+        if not self.jobs:
+            self.max_font_sizes, self.min_font_sizes = dict(), dict()
+            return
+
+        font_size_bounds = [self.font_size_bounds[uid] for uid, _, _ in self.jobs]
+
+        max_font_sizes                 = np.array([bounds[0] for bounds in font_size_bounds], dtype=float)
+        min_font_sizes                 = np.array([bounds[1] for bounds in font_size_bounds], dtype=float)
+        max_font_size_word_frequencies = np.ones_like(max_font_sizes)
+        min_font_size_word_frequencies = np.ones_like(max_font_sizes)
+        # max_bbox_widths = np.zeros_like(max_font_sizes)
+        if self.word_to_frequency:
+            max_font_size_word_frequencies = _get_frequencies([bounds[2] for bounds in font_size_bounds], self.word_to_frequency)
+            min_font_size_word_frequencies = _get_frequencies([bounds[3] for bounds in font_size_bounds], self.word_to_frequency)
+
+        max_font_sizes, min_font_sizes = _reconcile_font_sizes(
+            max_font_sizes, min_font_sizes,
+            max_font_size_word_frequencies, min_font_size_word_frequencies,
+            self.given_max_font_size, self.given_min_font_size)
+
+        # keep the chosen font sizes for inspection
+        self.max_font_sizes = dict(zip([uid for uid, _, _ in self.jobs], max_font_sizes))
+        self.min_font_sizes = dict(zip([uid for uid, _, _ in self.jobs], min_font_sizes))
+
+        # --------------------------------------------------------------------------------
+
+
+    def _combine(self, executor):
+
+        # combine word clouds into one image
+        for (uid, mask, _), future in zip(self.jobs, self.futures):
+            wc = self._get_result(uid, future, 'layout')
+            tic = time.perf_counter()
+            self._add(uid, mask, wc)
+            self.layouts[uid] = wc.layout_
+            if self.profiler:
+                self.profiler.add_time(uid, 'combine', time.perf_counter() - tic)
+
+        self._finish()
+        return []
+
+
+    def _submit_packing(self, executor):
+        # lay out the word clouds of all subsets at once
+        return [self._submit(executor, self.layout_engine, self.jobs, self.offsets, self.img.rgba.shape,
+                             self.given_max_font_size, self.given_min_font_size, **self.wordcloud_kwargs)]
+
+
+    def _draw(self, executor):
+        self.layouts = self._get_result(None, self.futures[0], 'layout')
+        self._redraw(self.wordcloud_kwargs.get('random_state'))
+        self._finish()
+        return []
+
+
+    def _finish(self):
+
+        if self.cache_key is not None:
+            # without a colour key, the (empty) image of the text output is never reused
+            self.cache.put(self.cache_key,
+                           {uid : _layout_to_records(layout) for uid, layout in self.layouts.items()},
+                           self.img.rgba,
+                           _get_color_key(self.wordcloud_kwargs) if self.output == 'image' else None)
+
+        self._show()
+
+
+    def _show(self):
+        # plot the image on top of the axis (words added as text are part of the axis already);
+        # in headless mode, the image is composited onto the rendered figure instead
+        if self.overlay and (self.output == 'image'):
+            if self.profiler:
+                self.profiler.begin('imshow')
+            self.img.imshow(interpolation='bilinear')
+
+
+    def _refresh(self):
+        # show the changed words
+        if self.output == 'text':
+            self.img.draw_idle()
+        elif self.overlay:
+            self.img.update()
+
+
+    def _restore(self, executor):
+
+        cached = self._cached
+        self.layouts = {uid : _records_to_layout(records) for uid, records in cached['layouts'].items()}
+        # subsets that were skipped (see _skip) have no layout
+        self.jobs = [job for job in self.jobs if job[0] in self.layouts]
+
+        # reuse the cached image if it was rendered with the same colours;
+        # otherwise, redraw the word clouds with the current colours
+        color_key = _get_color_key(self.wordcloud_kwargs)
+        if (self.output == 'image') and (color_key is not None) and (color_key == cached['color_key']):
+            self.img.rgba[...] = cached['rgba']
+        else:
+            self._redraw(self.wordcloud_kwargs.get('random_state'))
+
+        self._show()
+        return []
+
+
+    def recolor(self, color_func=None, colormap=None, random_state=None):
+        """
+        Recolor the words without changing the layouts, and update the image.
+        """
+
+        if color_func is not None:
+            self.wordcloud_kwargs['color_func'] = color_func
+            self.wordcloud_kwargs.pop('colormap', None)
+        elif colormap is not None:
+            self.wordcloud_kwargs['colormap'] = colormap
+            self.wordcloud_kwargs.pop('color_func', None)
+
+        if random_state is None:
+            random_state = self.wordcloud_kwargs.get('random_state')
+
+        self._clear_all()
+        self._redraw(random_state)
+        self._refresh()
+
+
+    def update(self, added=None, removed=None, new_frequencies=None):
+        """
+        Add words to / remove words from the sets, and/or change word
+        frequencies. Only the word clouds of subsets whose words or
+        reconciled font sizes change are laid out again.
+        """
+
+        venn = self.ExtendedVennDiagram
+        words_by_id = venn.words_by_id
+        uid_by_word = self._get_uid_by_word()
+
+        # determine the new subset of each affected word
+        new_uids = dict()
+        for bit, changes in (('1', added), ('0', removed)):
+            for ii, words in enumerate(changes or []):
+                for word in (words or []):
+                    uid = new_uids.get(word, uid_by_word.get(word, '0' * self.total_sets))
+                    new_uids[word] = uid[:ii] + bit + uid[ii+1:]
+
+        # validate the changes before any state is modified
+        if new_frequencies:
+            assert self.word_to_frequency, "Frequencies can only be changed if word_to_frequency was given initially!"
+        if self.word_to_frequency:
+            missing = [word for word, uid in new_uids.items()
+                       if ('1' in uid) and (word not in self.word_to_frequency) and (word not in (new_frequencies or {}))]
+            assert not missing, \
+                "New words need a frequency in word_to_frequency or new_frequencies: {}".format(', '.join(map(str, missing)))
+
+        dirty = set()
+        for word, uid in new_uids.items():
+            old_uid = uid_by_word.get(word)
+            if old_uid == uid:
+                continue
+            if (old_uid is None) and ('1' not in uid): # removed, but in no set to begin with
+                continue
+            if old_uid:
+                dirty.add(old_uid)
+            if '1' in uid:
+                uid_by_word[word] = uid
+                dirty.add(uid)
+            else: # no longer in any set
+                del uid_by_word[word]
+
+        for uid in dirty:
+            words = [word for word in words_by_id.get(uid, []) if uid_by_word.get(word) == uid]
+            known = set(words)
+            words += [word for word, new_uid in new_uids.items() if (new_uid == uid) and (word not in known)]
+            if words:
+                words_by_id[uid] = words
+            else:
+                words_by_id.pop(uid, None)
+        venn.uids = set(words_by_id)
+
+        if new_frequencies:
+            self.word_to_frequency = dict(self.word_to_frequency)
+            self.word_to_frequency.update(new_frequencies)
+            dirty.update(uid_by_word[word] for word in new_frequencies if word in uid_by_word)
+
+        # update the inputs of the packing algorithm and the font size bounds of the dirty subsets
+        jobs = OrderedDict((uid, (mask, frequencies)) for uid, mask, frequencies in self.jobs)
+        for uid in dirty:
+            self._clear(uid, jobs)
+            words = venn.get_words_by_id(uid)
+            if not words:
+                jobs.pop(uid, None)
+                self.dropped_word_counts.pop(uid, None)
+                continue
+            if uid in jobs:
+                mask = jobs[uid][0]
+            else:
+                patch = venn.get_patch_by_id(uid)
+                if patch is None:
+                    import warnings
+                    warnings.warn("Patch corresponding to subset {uid} does not exist; skipping creation of wordcloud for subset {uid}".format(uid=uid))
+                    continue
+                mask = self._get_mask(patch, uid)
+            jobs[uid] = (mask, self._get_frequencies(uid, words))
+            self.font_size_bounds.pop(uid, None)
+        self.jobs = [(uid, mask, frequencies) for uid, (mask, frequencies) in jobs.items()]
+
+        if self.layout_engine is not None:
+            # the word clouds share one canvas, so all of them are laid out again
+            self._clear_all()
+            self.layouts.clear() # shared with the ExtendedVennDiagram
+            self.layouts.update(self.layout_engine(self.jobs, self.offsets, self.img.rgba.shape,
+                                                   self.given_max_font_size, self.given_min_font_size,
+                                                   **self.wordcloud_kwargs))
+            self._redraw(self.wordcloud_kwargs.get('random_state'))
+            self._refresh()
+            return
+
+        for uid, mask, frequencies in list(self.jobs):
+            if uid not in self.font_size_bounds: # also the case if the layouts were restored from the cache
+                try:
+                    self.font_size_bounds[uid] = self.get_font_size_bounds(mask, frequencies, **self.wordcloud_kwargs)
+                except ValueError as error:
+                    self._skip(uid, error)
+
+        # keep the font sizes consistent across subsets;
+        # subsets whose font sizes change need to be laid out again
+        old_font_sizes = {uid : (self.max_font_sizes.get(uid), self.min_font_sizes.get(uid)) for uid, _, _ in self.jobs}
+        self._reconcile_font_sizes()
+        for uid, _, _ in self.jobs:
+            if old_font_sizes.get(uid) != (self.max_font_sizes[uid], self.min_font_sizes[uid]):
+                dirty.add(uid)
+
+        for uid, mask, frequencies in self.jobs:
+            if uid in dirty:
+                self._clear(uid, jobs)
+                wc = _get_wordcloud(mask, frequencies, self.max_font_sizes[uid], self.min_font_sizes[uid],
+                                    **self.wordcloud_kwargs)
+                self._add(uid, mask, wc)
+                self.layouts[uid] = wc.layout_
+
+        self._refresh()
+
+
+    def _get_uid_by_word(self):
+        if self._uid_by_word is None:
+            self._uid_by_word = {word : uid for uid, words in self.ExtendedVennDiagram.words_by_id.items() for word in words}
+        return self._uid_by_word
+
+
+    def _clear(self, uid, jobs):
+        # remove the words of a subset from the image (or the axis)
+        if uid in self.layouts:
+            if self.output == 'text':
+                self._remove_texts(uid)
+            else:
+                self.img.clear(jobs[uid][0], *self.offsets[uid])
+            del self.layouts[uid]
+
+
+    def _clear_all(self):
+        # remove the words of all subsets
+        self.img.rgba[...] = 0
+        for uid in list(self.texts):
+            self._remove_texts(uid)
+
+
+    def _remove_texts(self, uid):
+        for text in self.texts.pop(uid, []):
+            text.remove()
+
+
+    def _redraw(self, random_state):
+        # draw the words of the existing layouts in the current colours
+        for uid, mask, _ in self.jobs:
+            wc = _get_wordcloud_from_layout(mask, self.layouts[uid], **self.wordcloud_kwargs)
+            wc.recolor(random_state=random_state)
+            self._add(uid, mask, wc)
+            self.layouts[uid] = wc.layout_
+
+
+def _reconcile_font_sizes(max_font_sizes, min_font_sizes,
+                          max_font_size_word_frequencies, min_font_size_word_frequencies,
+                          given_max_font_size=None, given_min_font_size=None):
+    """
+    Scale the maximum and minimum font sizes of each subset such that
+    the font sizes across subsets are consistent with the relative
+    word frequencies.
+    """
+
+    idx = np.argmin(max_font_sizes / max_font_size_word_frequencies)
+    max_font_sizes = max_font_size_word_frequencies * max_font_sizes[idx] / max_font_size_word_frequencies[idx]
+
+    idx = np.argmin(min_font_sizes / min_font_size_word_frequencies)
+    min_font_sizes = min_font_size_word_frequencies * min_font_sizes[idx] / min_font_size_word_frequencies[idx]
+
+    # rescale min/max font sizes if a value is specified by the user
+    if given_max_font_size:
+        if given_max_font_size >= np.max(max_font_sizes):
+            # Ignore the argument.
+            # As is, we already don't have enough space for text objects of that
+            # size in at least one of the patches.
+            pass
+        else:
+            max_font_sizes *= given_max_font_size / np.max(max_font_sizes)
+
+    if given_min_font_size:
+        if given_min_font_size < np.min(min_font_sizes):
+            # Ignore the argument. All minimum font sizes are larger.
+            pass
+        else:
+            min_font_sizes *= given_min_font_size / np.min(min_font_sizes)
+
+    return max_font_sizes, min_font_sizes
+
+
+def _submit(executor, function, *args, **kwargs):
+    """
+    Submit function(*args, **kwargs) to the given concurrent.futures.Executor;
+    if the executor is None, the function is called immediately, and, as
+    with an executor, exceptions are raised when the result is retrieved.
+    """
+    if executor is None:
+        future = Future()
+        try:
+            future.set_result(function(*args, **kwargs))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+    return executor.submit(function, *args, **kwargs)
+
+
+def _call_timed(function, *args, **kwargs):
+    """
+    Returns the result and the wall time (in seconds) of function(*args, **kwargs).
+    """
+    tic = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - tic
+
+
+_logger = logging.getLogger('matplotlib_venn_wordcloud')
+
+
+class _Profiler(object):
+    """
+    Records the wall time of each stage of the rendering, and the wall
+    time and other statistics of each subset (see venn2_wordcloud).
+
+    A stage lasts from its beginning until the beginning of the next stage
+    (or until end() is called). If a callable is given, it is called with
+    the results (see report).
+
+    The hits and misses of the process-wide caches (see _get_cache_counts)
+    are counted from the creation of the profiler until the report.
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback if callable(callback) else None
+        self.stages = OrderedDict()
+        self.subsets = dict()
+        self._stage = None
+        self._tic = None
+        self._cache_counts = _get_cache_counts()
+
+
+    def begin(self, stage):
+        self.end()
+        self._stage = stage
+        self._tic = time.perf_counter()
+
+
+    def end(self):
+        if self._stage is not None:
+            self.stages[self._stage] = self.stages.get(self._stage, 0.) + time.perf_counter() - self._tic
+            self._stage = None
+
+
+    def add_time(self, uid, stage, seconds):
+        subset_seconds = self._get_subset(uid)['seconds']
+        subset_seconds[stage] = subset_seconds.get(stage, 0.) + seconds
+
+
+    def record(self, uid, **values):
+        self._get_subset(uid).update(values)
+
+
+    def _get_subset(self, uid):
+        if uid not in self.subsets:
+            self.subsets[uid] = dict(seconds=dict())
+        return self.subsets[uid]
+
+
+    def report(self):
+        """
+        Returns the results as a dict, logs them, and passes them to the callback.
+        """
+
+        caches = dict()
+        for name, (hits, misses) in _get_cache_counts().items():
+            hits   -= self._cache_counts[name][0]
+            misses -= self._cache_counts[name][1]
+            caches[name] = dict(hits=hits, misses=misses, hit_rate=hits / (hits + misses) if hits + misses else None)
+
+        results = dict(total=sum(self.stages.values()), stages=dict(self.stages), subsets=self.subsets, caches=caches)
+
+        _logger.info('Rendered word cloud Venn diagram in %.3fs (%s)', results['total'],
+                     ', '.join('{} {:.3f}s'.format(stage, seconds) for stage, seconds in self.stages.items()),
+                     extra=dict(profile=results))
+
+        if self.callback:
+            self.callback(results)
+
+        return results
+
+
+class _LRUCache(object):
+    """
+    Mapping with a maximum total size of its entries, where the size of
+    each entry is given by get_size (default: one, i.e. maxsize is the
+    maximum number of entries); the least recently used entries are
+    discarded first.
+
+    The caches are shared by all renders of the process, which can run
+    in different threads (see render_to_array); hence access is locked.
+    """
+
+    def __init__(self, maxsize, get_size=None):
+        self.maxsize = maxsize
+        self.get_size = get_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    def __len__(self):
+        return len(self._data)
+
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data[key] = value
+            self.hits += 1
+            return value
+
+
+    def put(self, key, value):
+        with self._lock:
+            if key in self._data:
+                self.size -= self._get_size(self._data.pop(key))
+            self._data[key] = value
+            self.size += self._get_size(value)
+            while self.size > self.maxsize:
+                _, discarded = self._data.popitem(last=False)
+                self.size -= self._get_size(discarded)
+
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+
+
+    def _get_size(self, value):
+        return 1 if self.get_size is None else self.get_size(value)
+
+
+# Masks are reused across calls that result in the same venn diagram layout.
+# At the default resolution, each mask takes up about 1 MB.
+_mask_cache = _LRUCache(maxsize=32)
+
+
+# bumped whenever the layouts for a given input change
+_LAYOUT_CACHE_VERSION = 2
+
+# wordcloud_kwargs that only affect the colours of the words
+_COLOR_KWARGS = ('color_func', 'colormap')
+
+
+def _get_layout_cache(cache):
+    if (cache is None) or isinstance(cache, LayoutCache):
+        return cache
+    return LayoutCache(cache)
+
+
+def _get_layout_key(jobs, offsets, image_shape, calibration, given_max_font_size, given_min_font_size, wordcloud_kwargs,
+                    layout_engine='wordcloud'):
+    """
+    Compute a stable hash of all inputs that determine the layouts of
+    the word clouds and the combined image, i.e. the words, frequencies,
+    masks, and mask offsets of all subsets, the image shape, the layout
+    engine, and the calibration and wordcloud arguments (except for the
+    colours, see _get_color_key).
+
+    Layouts are only reproducible (and hence cacheable) if the random
+    state is an integer; otherwise, None is returned. None is also
+    returned if an argument has no stable representation
+    (e.g. a callable layout engine).
+    """
+
+    random_state = wordcloud_kwargs.get('random_state')
+    if isinstance(random_state, bool) or not isinstance(random_state, (int, np.integer)):
+        return None
+
+    try:
+        arguments = _get_stable_repr(dict(
+            version             = _LAYOUT_CACHE_VERSION,
+            image_shape         = tuple(image_shape),
+            wordcloud_version   = _get_wordcloud_version(),
+            calibration         = calibration,
+            layout_engine       = layout_engine,
+            given_max_font_size = given_max_font_size,
+            given_min_font_size = given_min_font_size,
+            wordcloud_kwargs    = {key : value for key, value in wordcloud_kwargs.items() if key not in _COLOR_KWARGS},
+        ))
+    except TypeError:
+        return None
+
+    hash_ = hashlib.blake2b(arguments.encode(), digest_size=20)
+    for uid, mask, frequencies in sorted(jobs, key=lambda job: job[0]):
+        hash_.update(uid.encode())
+        hash_.update(repr((tuple(offsets[uid]), mask.shape)).encode())
+        hash_.update(np.ascontiguousarray(mask).tobytes())
+        hash_.update(_get_stable_repr(frequencies).encode())
+    return hash_.hexdigest()
+
+
+def _get_wordcloud_version():
+    import wordcloud
+    return getattr(wordcloud, '__version__', None)
+
+
+def _get_color_key(wordcloud_kwargs):
+    """
+    Describe the colour arguments in wordcloud_kwargs as a string.
+    Returns None if they cannot be identified across processes,
+    e.g. if the color_func is a lambda or a closure.
+    """
+
+    parts = []
+    for name in _COLOR_KWARGS:
+        value = wordcloud_kwargs.get(name)
+        if (value is None) or isinstance(value, str):
+            pass
+        elif inspect.isfunction(value) or inspect.isbuiltin(value):
+            if '<' in value.__qualname__: # lambda or local function
+                return None
+            value = '{}.{}'.format(value.__module__, value.__qualname__)
+        elif isinstance(getattr(value, 'name', None), str): # matplotlib colormap
+            value = '{}({})'.format(type(value).__name__, value.name)
+        else:
+            return None
+        parts.append('{}={}'.format(name, value))
+    return ';'.join(parts)
+
+
+def _get_stable_repr(value):
+    """
+    A representation of (nested) builtin containers and numbers that is
+    independent of the iteration order of sets and dicts.
+    Raises a TypeError for other objects.
+    """
+
+    if isinstance(value, np.generic):
+        value = value.item()
+    if (value is None) or isinstance(value, (bool, int, float, str, bytes)):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return '[' + ','.join(_get_stable_repr(item) for item in value) + ']'
+    if isinstance(value, (set, frozenset)):
+        return '{' + ','.join(sorted(_get_stable_repr(item) for item in value)) + '}'
+    if isinstance(value, dict):
+        return '{' + ','.join(sorted(_get_stable_repr(key) + ':' + _get_stable_repr(item)
+                                     for key, item in value.items())) + '}'
+    raise TypeError("No stable representation for objects of type {}.".format(type(value)))
+
+
+def _get_mask(img, patch, circles=None):
+    """
+    Compute the wordcloud mask corresponding to the given patch,
+    i.e. an uint8 array with the resolution of the image that is 0 inside
+    the patch and 255 outside.
+
+    If the patch is a boolean combination of circles, these can be
+    given as a list of (center, radius, inside) tuples (see
+    _get_region_circles), which speeds up the computation considerably.
+
+    Masks are cached (see _mask_cache) and hence read-only.
+    """
+
+    path = _get_path(patch)
+    key = (img.x_resolution, img.y_resolution, img.xlim, img.ylim,
+           path.vertices.tobytes(), None if path.codes is None else path.codes.tobytes())
+
+    mask = _mask_cache.get(key)
+    if mask is None:
+        mask = _rasterize(img, path, circles)
+
+        # make mask matplotlib-venn compatible
+        mask = (~mask * 255).astype(np.uint8) # black indicates mask position
+        mask = np.flipud(mask) # origin is in upper left
+
+        mask.flags.writeable = False
+        _mask_cache.put(key, mask)
+
+    return mask
+
+
+def _get_mask_extent(mask):
+    """
+    Returns the rows and columns (r0, r1, c0, c1) of the bounding box of
+    the region of a wordcloud mask (see _get_mask).
+    """
+
+    inside = mask == 0
+    rows, = np.where(np.any(inside, axis=1))
+    columns, = np.where(np.any(inside, axis=0))
+    if len(rows) == 0:
+        return 0, 0, 0, 0
+    return rows[0], rows[-1] + 1, columns[0], columns[-1] + 1
+
+
+def _get_crop_extent(mask, alignment=1):
+    """
+    Returns the rows and columns (r0, r1, c0, c1) of the smallest part
+    of a wordcloud mask (see _get_mask) on which the packing algorithm
+    places the words exactly as on the whole mask (up to the offset).
+
+    WordCloud never places words on the first and last row and column of
+    the mask, so the bounding box of the region is extended by one pixel
+    on each side. If alignment is larger than one, the bounding box is
+    instead extended by alignment pixels, and aligned to multiples of
+    alignment, such that the crop of a downsampled mask equals the
+    downsampled crop (see _get_coarse_font_size_bounds).
+    """
+
+    total_rows, total_columns = mask.shape
+    r0, r1, c0, c1 = _get_mask_extent(mask)
+    if r0 == r1: # empty region
+        return 0, total_rows, 0, total_columns
+
+    r0 = max(0, (r0 - alignment) // alignment * alignment)
+    c0 = max(0, (c0 - alignment) // alignment * alignment)
+    r1 = min(total_rows, -(-(r1 + alignment) // alignment) * alignment)
+    c1 = min(total_columns, -(-(c1 + alignment) // alignment) * alignment)
+
+    return r0, r1, c0, c1
+
+
+def _get_region_circles(ExtendedVennDiagram, uid):
+    """
+    Describe the subset with the given uid as a boolean combination of
+    the venn diagram circles, i.e. as a list of (center, radius, inside) tuples.
+    Returns None if the circle geometry is not available.
+    """
+
+    try:
+        centers = ExtendedVennDiagram.centers
+        radii = ExtendedVennDiagram.radii
+    except AttributeError:
+        return None
+
+    if (centers is None) or (radii is None) or (len(centers) != len(uid)):
+        return None
+
+    circles = []
+    for center, radius, bit in zip(centers, radii, uid):
+        # matplotlib_venn >= 1.0 returns Point2D instances
+        center = center.asarray() if hasattr(center, 'asarray') else np.asarray(center, dtype=float)
+        circles.append((center, float(radius), bit == '1'))
+
+    return circles
+
+
+def _rasterize(img, path, circles=None):
+    """
+    Determine which pixels of the image lie within the given path.
+
+    Only pixels within the bounding box of the path are evaluated.
+    If the path is a boolean combination of circles (see _get_mask),
+    pixels are classified by their squared distance to the circle
+    centers; only pixels close to a circle boundary are tested with
+    path.contains_points, as contains_points approximates the path by
+    a polygon, which can deviate noticeably from the circles (see
+    _get_polygon_deviation). The result is identical to
+
+    path.contains_points(img.pixel_coordinates).reshape((img.y_resolution, img.x_resolution))
+
+    """
+
+    x = np.linspace(img.xlim[0], img.xlim[1], img.x_resolution)
+    y = np.linspace(img.ylim[0], img.ylim[1], img.y_resolution)
+
+    # pixel ranges covering the bounding box of the polygon approximation
+    # of the path that is used by contains_points (plus one pixel on each side)
+    mask = np.zeros((img.y_resolution, img.x_resolution), dtype=bool)
+    polygons = path.to_polygons(closed_only=False)
+    if not polygons:
+        return mask
+    vertices = np.concatenate(polygons)
+    (x0, y0), (x1, y1) = np.min(vertices, axis=0), np.max(vertices, axis=0)
+    c0 = max(np.searchsorted(x, x0) - 1, 0)
+    c1 = min(np.searchsorted(x, x1) + 1, img.x_resolution)
+    r0 = max(np.searchsorted(y, y0) - 1, 0)
+    r1 = min(np.searchsorted(y, y1) + 1, img.y_resolution)
+    if (c0 >= c1) or (r0 >= r1):
+        return mask
+
+    x = x[c0:c1]
+    y = y[r0:r1]
+
+    if circles is None:
+        xgrid, ygrid = np.meshgrid(x, y)
+        inside = path.contains_points(np.c_[xgrid.ravel(), ygrid.ravel()]).reshape((len(y), len(x)))
+    else:
+        # pixels within this distance of a circle boundary may be classified differently by contains_points;
+        # the small offset guards against round-off errors
+        tolerance = _get_polygon_deviation(polygons, circles) * (1 + 1e-6) + 1e-9
+        inside = np.ones((len(y), len(x)), dtype=bool)
+        boundary = np.zeros_like(inside)
+        for (cx, cy), radius, is_inside in circles:
+            squared_distance = ((y - cy)**2)[:, np.newaxis] + ((x - cx)**2)[np.newaxis, :]
+            if is_inside:
+                inside &= squared_distance < radius**2
+            else:
+                inside &= squared_distance >= radius**2
+            boundary |= (max(radius - tolerance, 0)**2 <= squared_distance) & (squared_distance <= (radius + tolerance)**2)
+
+        rows, columns = np.nonzero(boundary)
+        inside[rows, columns] = path.contains_points(np.c_[x[columns], y[rows]])
+
+    mask[r0:r1, c0:c1] = inside
+
+    return mask
+
+
+def _get_polygon_deviation(polygons, circles):
+    """
+    Determine the largest distance between any point on the polygon
+    approximation of a path (as used by path.contains_points) and the
+    nearest circle.
+    """
+
+    deviation = 0.
+    for polygon in polygons:
+        start = polygon
+        stop = np.roll(polygon, -1, axis=0)
+        delta = stop - start
+        squared_length = np.maximum(np.sum(delta**2, axis=1), np.finfo(float).tiny)
+
+        edge_deviations = np.full(len(polygon), np.inf)
+        for center, radius, _ in circles:
+            # The distance to the center along each edge is convex, so it
+            # is bounded by the distances at the end points and at the
+            # point of closest approach.
+            t = np.clip(np.sum((center - start) * delta, axis=1) / squared_length, 0., 1.)
+            closest = np.linalg.norm(start + t[:, np.newaxis] * delta - center, axis=1)
+            distances = np.c_[np.linalg.norm(start - center, axis=1), np.linalg.norm(stop - center, axis=1), closest]
+            edge_deviations = np.minimum(edge_deviations, np.max(np.abs(distances - radius), axis=1))
+
+        deviation = max(deviation, np.max(edge_deviations))
+
+    return deviation
+
+
+def _get_path(patch):
+    """
+    Get the path of the patch in data coordinates.
+    """
+
+    from matplotlib.patches import Circle
+
+    if isinstance(patch, Circle):
+        # We need to solve two problems here:
+        # 1) The path of Circle patches is always the unit circle.
+        #    We need to apply the circle transform to the `path` attribute to get
+        #    the correct path.
+        # 2) The Circle object returned by matplotlib-venn is messed up.
+        #    The transform is not doing what it should do.
+        # path = transform.transform_path(old_path)
+
+        # Create a new patch with the same parameters as the given Circle patch.
+        dummy = Circle(patch.center, patch.radius)
+
+        # Apply transform to get the correct path.
+        transform = dummy.get_transform()
+        unit_circle_path = dummy.get_path()
+        path = transform.transform_path(unit_circle_path)
+    else:
+        path = patch.get_path()
+
+    return path
+
+
+def _get_wordcloud(mask, frequencies, max_font_size=None, min_font_size=None, **wordcloud_kwargs):
+
+    from wordcloud import WordCloud
+
+    if min_font_size is not None:
+        wordcloud_kwargs['min_font_size'] = min_font_size
+
+    # create wordcloud
+    wc = WordCloud(mask=mask,
+                   background_color=None,
+                   mode="RGBA",
+                   max_font_size=max_font_size,
+                   **wordcloud_kwargs)
+
+    wc.generate_from_frequencies(frequencies)
+
+    return wc
+
+
+def _get_wordcloud_from_layout(mask, layout, **wordcloud_kwargs):
+    """
+    Create a WordCloud instance with the given layout (i.e. a WordCloud.layout_ list)
+    without running the packing algorithm.
+    """
+
+    from wordcloud import WordCloud
+
+    wc = WordCloud(mask=mask,
+                   background_color=None,
+                   mode="RGBA",
+                   **wordcloud_kwargs)
+    wc.layout_ = layout
+    return wc
+
+
+def _layout_to_records(layout):
+    """
+    Convert a WordCloud.layout_ list into JSON serialisable records:
+    [word, frequency, font_size, row, column, orientation, color]
+    """
+    records = []
+    for (word, frequency), font_size, (row, column), orientation, color in layout:
+        records.append([word, float(frequency), int(font_size), int(row), int(column),
+                        None if orientation is None else int(orientation),
+                        color if isinstance(color, str) else [int(value) for value in color]])
+    return records
+
+
+def _records_to_layout(records):
+    """
+    Inverse of _layout_to_records.
+    """
+    layout = []
+    for word, frequency, font_size, row, column, orientation, color in records:
+        layout.append(((word, frequency), font_size, (row, column), orientation,
+                       color if isinstance(color, str) else tuple(color)))
+    return layout
+
+
+def _get_word_to_frequency(word_to_frequency):
+    """
+    Convert the different forms of word_to_frequency (see venn2_wordcloud)
+    into a dict word : frequency.
+    """
+
+    if (word_to_frequency is None) or isinstance(word_to_frequency, dict):
+        return word_to_frequency
+
+    if isinstance(word_to_frequency, tuple):
+        words, frequencies = word_to_frequency
+    elif hasattr(word_to_frequency, 'index') and hasattr(word_to_frequency, 'to_numpy'): # pandas.Series
+        words, frequencies = word_to_frequency.index, word_to_frequency.to_numpy()
+    else: # any other mapping
+        return dict(word_to_frequency)
+
+    words = np.asarray(words)
+    frequencies = np.asarray(frequencies, dtype=float)
+    assert (words.ndim == 1) and (words.shape == frequencies.shape), \
+        "Words and frequencies need to be one-dimensional sequences of the same length!"
+
+    # tolist converts numpy scalars into python objects, such that the words compare equal to those in the sets
+    return dict(zip(words.tolist(), frequencies.tolist()))
+
+
+def _get_frequencies(words, word_to_frequency=None):
+    """
+    Returns the frequency of each word as an array.
+    Without word frequencies, each word counts once (the words of a set are unique).
+    """
+
+    if not word_to_frequency:
+        return np.ones(len(words))
+
+    return np.fromiter(map(word_to_frequency.__getitem__, words), dtype=float, count=len(words))
+
+
+def _get_frequency_dict(words, frequencies, indices=None):
+    # the frequencies dict expected by WordCloud.generate_from_frequencies
+    if (indices is not None) and (len(indices) < len(words)):
+        words = [words[ii] for ii in indices.tolist()]
+        frequencies = frequencies[indices]
+    return dict(zip(words, frequencies.tolist()))
+
+
+# error raised if a mask has no space for any word (as raised by WordCloud)
+_NO_SPACE_ERROR = "Couldn't find space to draw. Either the Canvas size is too small or too much of the image is masked out."
+
+
+def _get_font_size_bounds(mask, frequencies, **wordcloud_kwargs):
+    """
+    Run the packing algorithm and determine the largest and smallest
+    font size in the resulting layout.
+
+    Returns:
+    --------
+    max_font_size, min_font_size, max_font_size_word, min_font_size_word
+
+    """
+
+    wc = _get_wordcloud(mask, frequencies, **wordcloud_kwargs)
+    if not wc.layout_:
+        raise ValueError(_NO_SPACE_ERROR)
+
+    # bbox_widths = [len(item[0][0]) * item[1] for item in wc.layout_] # word, freq
+    font_sizes = [item[1] for item in wc.layout_]
+    max_idx = np.argmax(font_sizes)
+    min_idx = np.argmin(font_sizes)
+
+    return font_sizes[max_idx], font_sizes[min_idx], wc.layout_[max_idx][0][0], wc.layout_[min_idx][0][0]
+
+
+# Minimum width (in pixels) of the masks used for the coarse font size calibration;
+# finer masks are downsampled by an integer factor.
+_COARSE_RESOLUTION = 500
+
+# WordCloud default
+_MIN_FONT_SIZE = 4
+
+
+def _get_coarse_font_size_bounds(mask, frequencies, factor=None, **wordcloud_kwargs):
+    """
+    Determine the largest and smallest font size as in _get_font_size_bounds,
+    but run the packing algorithm on a downsampled mask, and determine
+    the corresponding font sizes at the resolution of the mask.
+
+    WordCloud derives the font size of each word from the font size of
+    the previous word, rounded to an integer; as the rounding stalls at
+    small font sizes, the coarse font sizes cannot simply be scaled up.
+    Instead, the font sizes are recomputed (see _get_full_resolution_font_sizes),
+    such that only the shrinking of words that did not fit is taken
+    from the coarse layout.
+
+    Compared to _get_font_size_bounds, the font size bounds typically
+    deviate by less than 10% plus the downsampling factor (in pixels);
+    see tests/test_calibration.py, which checks this tolerance.
+    However, many words often share the smallest font size, and the word
+    returned for it (the first of these) can differ, such that the
+    minimum font sizes reconciled across subsets (which scale with the
+    frequency of that word) can deviate further. Without word
+    frequencies, the smallest font size only depends on how tightly the
+    words happen to pack, and varies as much between exact runs with
+    different word orders.
+
+    The downsampling factor defaults to the mask width divided by _COARSE_RESOLUTION;
+    for cropped masks, pass the factor corresponding to the uncropped mask.
+
+    Returns:
+    --------
+    max_font_size, min_font_size, max_font_size_word, min_font_size_word
+
+    """
+
+    if factor is None:
+        factor = max(1, mask.shape[1] // _COARSE_RESOLUTION)
+    if factor == 1:
+        return _get_font_size_bounds(mask, frequencies, **wordcloud_kwargs)
+
+    # a coarse pixel is only available if all corresponding pixels of the mask are available
+    total_rows, total_columns = mask.shape[0] // factor, mask.shape[1] // factor
+    coarse_mask = mask[:total_rows * factor, :total_columns * factor]
+    coarse_mask = coarse_mask.reshape(total_rows, factor, total_columns, factor).max(axis=(1, 3))
+
+    # scale the other pixel sizes accordingly
+    wordcloud_kwargs = dict(wordcloud_kwargs)
+    wordcloud_kwargs['min_font_size'] = max(1, int(round(_MIN_FONT_SIZE / factor)))
+    wordcloud_kwargs['margin'] = int(round(wordcloud_kwargs.get('margin', 2) / factor))
+
+    wc = _get_wordcloud(coarse_mask, frequencies, **wordcloud_kwargs)
+    font_sizes = _get_full_resolution_font_sizes(wc.layout_, factor, wc.relative_scaling)
+    if not font_sizes:
+        raise ValueError(_NO_SPACE_ERROR)
+    max_idx = np.argmax(font_sizes)
+    min_idx = np.argmin(font_sizes)
+
+    return font_sizes[max_idx], font_sizes[min_idx], wc.layout_[max_idx][0][0], wc.layout_[min_idx][0][0]
+
+
+def _get_full_resolution_font_sizes(layout, factor, relative_scaling):
+    """
+    Recompute the font sizes of a layout on a mask downsampled by the
+    given factor as WordCloud.generate_from_frequencies would choose
+    them at full resolution: the font size of each word follows from
+    the font size of the previous word and the ratio of their
+    frequencies; if the word was shrunk to fit into the coarse mask,
+    it is shrunk to the largest font size at full resolution that
+    corresponds to its coarse font size. Words that fall below the
+    minimum font size are dropped.
+    """
+
+    font_sizes = []
+    coarse_font_size = layout[0][1]
+    font_size = coarse_font_size * factor
+    last_frequency = 1.
+    for (_, frequency), placed_font_size, _, _, _ in layout:
+        if relative_scaling != 0:
+            scale = relative_scaling * frequency / last_frequency + (1 - relative_scaling)
+            coarse_font_size = int(round(scale * coarse_font_size))
+            font_size = int(round(scale * font_size))
+        if placed_font_size < coarse_font_size:
+            font_size = min(font_size, (placed_font_size + 1) * factor - 1)
+        if font_size < _MIN_FONT_SIZE:
+            break
+        coarse_font_size = placed_font_size
+        last_frequency = frequency
+        font_sizes.append(font_size)
+    return font_sizes
+
+
+# Parameters of the font size estimate (fitted against the exact two-pass procedure):
+# - font size at which the glyph extents are measured;
+#   extents at other font sizes are extrapolated linearly
+_REFERENCE_FONT_SIZE = 100
+# - ratio between the summed bounding box areas of all placed words and the free mask area;
+#   can exceed one as WordCloud only marks the glyph pixels themselves as occupied
+_PACKING_DENSITY = 1.5
+# - fraction of the remaining area that a single bounding box can occupy ...
+_MAXIMUM_WORD_FILL = 0.035
+# - ... which shrinks further as the remaining area becomes more fragmented
+_FRAGMENTATION_EXPONENT = 3
+
+
+def _estimate_font_size_bounds(mask, frequencies, **wordcloud_kwargs):
+    """
+    Estimate the largest and smallest font size that the packing
+    algorithm would choose for the given words and mask, without
+    running the packing algorithm itself.
+
+    The estimate mimics wordcloud.WordCloud.generate_from_frequencies:
+
+    1) The initial font size is determined by fitting the bounding
+       boxes of the two most frequent words into the mask.
+    2) The font sizes of subsequent words are derived from the
+       relative word frequencies (taking into account the
+       `relative_scaling` parameter).
+    3) If the bounding box of a word exceeds the space that is
+       (likely) still available, the font size is reduced until it
+       does fit; words that only fit below the minimum font size
+       are dropped.
+
+    Glyph extents are measured once at a reference font size and
+    scaled linearly.
+
+    Returns:
+    --------
+    max_font_size, min_font_size, max_font_size_word, min_font_size_word
+
+    """
+
+    font_path         = _get_font_path(wordcloud_kwargs)
+    margin            = wordcloud_kwargs.get('margin', 2)
+    max_words         = wordcloud_kwargs.get('max_words', 200)
+    min_font_size     = wordcloud_kwargs.get('min_font_size', 4)
+    font_step         = wordcloud_kwargs.get('font_step', 1)
+    relative_scaling  = wordcloud_kwargs.get('relative_scaling', 'auto')
+    if relative_scaling == 'auto':
+        relative_scaling = 0 if wordcloud_kwargs.get('repeat', False) else .5
+
+    # sort and normalize frequencies as in WordCloud
+    frequencies = sorted(frequencies.items(), key=lambda item: item[1], reverse=True)
+    frequencies = frequencies[:max_words]
+    words = [word for word, _ in frequencies]
+    frequencies = np.array([frequency for _, frequency in frequencies], dtype=float)
+    frequencies /= frequencies[0]
+
+    # glyph extents (height, width) at the reference font size, i.e. the bottom right corners of the bounding boxes
+    extents = np.array([_get_text_bbox(word, font_path, _REFERENCE_FONT_SIZE)[:-3:-1] for word in words], dtype=float)
+    extents /= _REFERENCE_FONT_SIZE
+
+    def get_box(ii, font_size):
+        return np.ceil(extents[ii] * font_size).astype(int) + margin
+
+    # restrict the occupancy map to the bounding box of the free space
+    occupied = mask == 255
+    if np.all(occupied):
+        raise ValueError(_NO_SPACE_ERROR)
+    rows = np.where(~np.all(occupied, axis=1))[0]
+    columns = np.where(~np.all(occupied, axis=0))[0]
+    occupied = np.pad(occupied[rows[0]:rows[-1]+1, columns[0]:columns[-1]+1], 1, constant_values=True)
+    free_area = np.sum(~occupied)
+
+    def get_largest_font_size(ii, occupied):
+        # Largest font size at which the word fits into the free space.
+        # WordCloud only tries the vertical orientation at the initial
+        # font size; while shrinking the word, it remains horizontal.
+        integral = _get_integral_image(occupied)
+        lo, hi = 0, mask.shape[0]
+        while lo < hi:
+            font_size = (lo + hi + 1) // 2
+            if _box_fits(integral, *get_box(ii, font_size)):
+                lo = font_size
+            else:
+                hi = font_size - 1
+        return lo
+
+    # 1) initial font size
+    font_size = get_largest_font_size(0, occupied)
+    if len(words) > 1:
+        # place the first word in the middle of the valid positions and fit the second word into the remainder
+        box = get_box(0, font_size)
+        position = _get_median_position(_get_integral_image(occupied), *box)
+        if position is not None:
+            occupied = occupied.copy()
+            occupied[position[0]:position[0]+box[0], position[1]:position[1]+box[1]] = True
+        second_font_size = int(round((relative_scaling * frequencies[1] + (1 - relative_scaling)) * font_size))
+        second_font_size = min(second_font_size, get_largest_font_size(1, occupied))
+        if font_size + second_font_size > 0:
+            font_size = int(2 * font_size * second_font_size / (font_size + second_font_size))
+
+    # 2) & 3) font size of each word
+    font_sizes = []
+    available_area = _PACKING_DENSITY * free_area
+    last_frequency = 1.
+    for ii, frequency in enumerate(frequencies):
+        if relative_scaling != 0:
+            font_size = int(round((relative_scaling * (frequency / last_frequency) + (1 - relative_scaling)) * font_size))
+        maximum_area = _MAXIMUM_WORD_FILL * available_area * (available_area / free_area) ** _FRAGMENTATION_EXPONENT
+        while (ii > 0) and (font_size >= min_font_size) and (np.prod(get_box(ii, font_size)) > maximum_area):
+            font_size -= font_step
+        if font_size < min_font_size:
+            break
+        font_sizes.append(font_size)
+        available_area -= np.prod(get_box(ii, font_size))
+        last_frequency = frequency
+
+    if not font_sizes:
+        # nothing fits; the packing algorithm will resort to the minimum font size
+        return min_font_size, min_font_size, words[0], words[0]
+
+    max_idx = np.argmax(font_sizes)
+    min_idx = np.argmin(font_sizes)
+
+    return font_sizes[max_idx], font_sizes[min_idx], words[max_idx], words[min_idx]
+
+
+def _get_integral_image(occupied):
+    return np.cumsum(np.cumsum(occupied, axis=0, dtype=np.int32), axis=1)
+
+
+def _get_box_areas(integral, height, width):
+    # Occupied area of each box of the given size; same indexing
+    # convention as wordcloud.query_integral_image.
+    return (integral[:-height, :-width] + integral[height:, width:]
+            - integral[height:, :-width] - integral[:-height, width:])
+
+
+def _box_fits(integral, height, width):
+    if (height >= integral.shape[0]) or (width >= integral.shape[1]):
+        return False
+    return np.any(_get_box_areas(integral, height, width) == 0)
+
+
+def _get_median_position(integral, height, width):
+    if (height >= integral.shape[0]) or (width >= integral.shape[1]):
+        return None
+    rows, columns = np.where(_get_box_areas(integral, height, width) == 0)
+    if len(rows) == 0:
+        return None
+    idx = len(rows) // 2
+    return rows[idx] + 1, columns[idx] + 1
+
+
+def _get_font_path(wordcloud_kwargs):
+    if wordcloud_kwargs.get('font_path'):
+        return wordcloud_kwargs['font_path']
+    from wordcloud.wordcloud import FONT_PATH
+    return FONT_PATH
+
+
+# The same words are measured and drawn at the same font sizes in
+# different subsets, in both passes, and in diagrams with overlapping
+# vocabularies, so their extents and bitmaps are cached for the process.
+_font_cache = _LRUCache(maxsize=128)
+_text_bbox_cache = _LRUCache(maxsize=2**16)
+_glyph_cache = _LRUCache(maxsize=2**26, get_size=lambda glyph: glyph.nbytes) # 64 MB
+
+
+def _get_cache_counts():
+    """
+    Returns the hits and misses of each process-wide cache; note that
+    look-ups in worker processes (see n_jobs) are not included.
+    """
+    return dict(masks        = (_mask_cache.hits, _mask_cache.misses),
+                text_extents = (_text_bbox_cache.hits, _text_bbox_cache.misses),
+                glyphs       = (_glyph_cache.hits, _glyph_cache.misses))
+
+
+def _get_font(font_path, font_size):
+    key = (font_path, font_size)
+    font = _font_cache.get(key)
+    if font is None:
+        from PIL import ImageFont
+        font = ImageFont.truetype(font_path, font_size)
+        _font_cache.put(key, font)
+    return font
+
+
+def _get_text_bbox(word, font_path, font_size):
+    """
+    Returns the bounding box (left, top, right, bottom) of the horizontal
+    word at the given font size, anchored at the left top (cached).
+    """
+    key = (word, font_path, font_size)
+    bbox = _text_bbox_cache.get(key)
+    if bbox is None:
+        bbox = _get_font(font_path, font_size).getbbox(word, anchor='lt')
+        _text_bbox_cache.put(key, bbox)
+    return bbox
+
+
+def _get_text_extents(word, font_path, font_size, orientation=None):
+    """
+    Returns the height and width of the word as measured by WordCloud,
+    i.e. of the bounding box of the word in a PIL.ImageFont.TransposedFont
+    with the given orientation (None or PIL.Image.ROTATE_90).
+    """
+    left, top, right, bottom = _get_text_bbox(word, font_path, font_size)
+    if orientation is None:
+        return bottom - top, right - left
+    return right - left, bottom - top
+
+
+def _get_glyph(word, font_path, font_size, orientation=None):
+    """
+    Returns the coverage of the pixels of the word as drawn by WordCloud
+    at the top left corner of its extents (a read-only uint8 array; cached).
+    """
+    key = (word, font_path, font_size, orientation)
+    glyph = _glyph_cache.get(key)
+    if glyph is None:
+        from PIL import Image, ImageDraw, ImageFont
+        height, width = _get_text_extents(word, font_path, font_size, orientation)
+        img = Image.new('L', (max(width, 1), max(height, 1)))
+        font = ImageFont.TransposedFont(_get_font(font_path, font_size), orientation=orientation)
+        ImageDraw.Draw(img).text((0, 0), word, fill=255, font=font)
+        glyph = np.array(img)
+        glyph.flags.writeable = False
+        _glyph_cache.put(key, glyph)
+    return glyph
+
+
+def _draw_layout(layout, shape, font_path, row=0, column=0):
+    """
+    Draw the words of a layout (a WordCloud.layout_ list) into an RGBA
+    array of the given shape, which starts at the given pixel of the word
+    cloud. The result equals WordCloud.to_array (without contour and
+    scaling), but the glyphs are taken from the glyph cache.
+
+    As the glyphs of a layout do not overlap, each pixel is covered by at
+    most one word, and is set as PIL draws text onto a transparent image:
+    the colour of the word, with the alpha value scaled by the coverage.
+    """
+
+    rgba = np.zeros((shape[0], shape[1], 4), dtype=np.uint8)
+    for (word, _), font_size, position, orientation, color in layout:
+        glyph = _get_glyph(word, font_path, int(font_size), orientation)
+        r0, c0 = int(position[0]) - row, int(position[1]) - column
+        r1, c1 = r0 + glyph.shape[0], c0 + glyph.shape[1]
+        # clip to the array
+        rr0, rr1, cc0, cc1 = max(r0, 0), min(r1, shape[0]), max(c0, 0), min(c1, shape[1])
+        if (rr0 >= rr1) or (cc0 >= cc1):
+            continue
+        glyph = glyph[rr0 - r0:rr1 - r0, cc0 - c0:cc1 - c0]
+        covered = glyph > 0
+        target = rgba[rr0:rr1, cc0:cc1]
+
+        ink = _get_ink(color)
+        target[covered, :3] = ink[:3]
+        # integer division by 255 with rounding, as in PIL
+        alpha = glyph[covered].astype(np.uint32) * ink[3] + 128
+        target[covered, 3] = ((alpha >> 8) + alpha) >> 8
+
+    return rgba
+
+
+def _get_ink(color):
+    """
+    Convert a colour returned by a WordCloud color_func (a string as
+    understood by PIL.ImageColor, or a tuple of integers between 0 and 255)
+    to an RGBA tuple of integers between 0 and 255.
+    """
+    if isinstance(color, str):
+        from PIL import ImageColor
+        return ImageColor.getcolor(color, 'RGBA')
+    color = tuple(int(value) for value in color)
+    return color + (255,) * (4 - len(color))
+
+
+def _add_texts(ax, img, layout, font_path, row=0, column=0):
+    """
+    Add the words of a layout (a WordCloud.layout_ list) to the axis as
+    matplotlib.text.Text instances, where the layout starts at the given
+    pixel of the _AxisImage (see _get_word_positions); the font sizes are
+    converted to points at the current size of the axis.
+    Returns the Text instances.
+    """
+    return _add_word_texts(ax, _get_word_positions(img, layout, font_path, row, column), font_path)
+
+
+def _get_word_positions(img, layout, font_path, row=0, column=0):
+    """
+    Convert the words of a layout (a WordCloud.layout_ list), which starts
+    at the given pixel of the _AxisImage, to data coordinates.
+
+    Returns a list of (word, x, y, font_size, rotation, color), where x, y
+    is the point on the baseline of the word drawn by WordCloud at the
+    centre of the word, font_size is the em size in data units, rotation is
+    in degrees counter-clockwise, and color is a hex string ('#rrggbb', or
+    '#rrggbbaa' if the colour is transparent).
+    """
+
+    # data units per image pixel (see _AxisImage.pixel_coordinates); rows start at the top (see _get_mask)
+    dx = (img.xlim[1] - img.xlim[0]) / (img.x_resolution - 1)
+    dy = (img.ylim[1] - img.ylim[0]) / (img.y_resolution - 1)
+
+    words = []
+    for (word, _), font_size, position, orientation, color in layout:
+        font_size = int(font_size)
+        height, width = _get_text_extents(word, font_path, font_size, orientation)
+        # WordCloud places the top of the glyphs at the top of the box (see _get_text_bbox);
+        # the baseline follows at this distance (in pixel centres)
+        baseline = -_get_font(font_path, font_size).getbbox(word, anchor='ls')[1] - 0.5
+        if orientation is None:
+            r, c = position[0] + baseline, position[1] + (width - 1) / 2.
+        else: # rotated counter-clockwise, i.e. the tops of the glyphs face left
+            r, c = position[0] + (height - 1) / 2., position[1] + baseline
+        ink = _get_ink(color)
+        words.append((word,
+                      img.xlim[0] + (column + c) * dx,
+                      img.ylim[1] - (row + r) * dy,
+                      font_size * dx,
+                      0 if orientation is None else 90,
+                      '#' + ''.join('{:02x}'.format(value) for value in (ink if ink[3] < 255 else ink[:3]))))
+    return words
+
+
+def _get_top_indices(frequencies, max_words):
+    """
+    Indices of the max_words largest frequencies, in ascending order.
+
+    The frequencies are partitioned rather than sorted. As WordCloud sorts
+    the words with a stable sort, ties are resolved in favour of the
+    words that come first; together with preserving the order of the
+    kept words, the packing algorithm hence places the same words as
+    without pruning.
+    """
+
+    total_words = len(frequencies)
+    if total_words <= max_words:
+        return np.arange(total_words)
+
+    threshold = frequencies[np.argpartition(frequencies, total_words - max_words)[total_words - max_words]]
+    larger = np.flatnonzero(frequencies > threshold)
+    tied = np.flatnonzero(frequencies == threshold)[:max_words - len(larger)]
+
+    return np.sort(np.concatenate([larger, tied]))
+
+
+class _AxisImage(object):
+    """
+    Create an image that spans the given axis.
+    """
+
+    def __init__(self, ax, resolution=1000, y_resolution=None):
+        self.ax = ax
+        self.x_resolution = resolution
+
+        # set resolution in y
+        xlim = self.xlim = tuple(ax.get_xlim())
+        ylim = self.ylim = tuple(ax.get_ylim())
+        width = xlim[1] - xlim[0]
+        height = ylim[1] - ylim[0]
+        if y_resolution is None:
+            y_resolution = int(height * self.x_resolution / width)
+        self.y_resolution = y_resolution
+
+        # initialise pixel array;
+        # values are kept as uint8 (as returned by wordcloud) to save memory
+        self.rgba = np.zeros((self.y_resolution, self.x_resolution, 4), dtype=np.uint8)
+
+        self._pixel_coordinates = None
+        self.image = None
+
+
+    @property
+    def pixel_coordinates(self):
+        # only computed on demand, as masks are usually cached
+        if self._pixel_coordinates is None:
+            x = np.linspace(self.xlim[0], self.xlim[1], self.x_resolution)
+            y = np.linspace(self.ylim[0], self.ylim[1], self.y_resolution)
+            xgrid, ygrid = np.meshgrid(x, y)
+            self._pixel_coordinates = np.c_[xgrid.ravel(), ygrid.ravel()]
+        return self._pixel_coordinates
+
+
+    def add(self, rgba, row=0, column=0):
+        """
+        Add the uint8 RGBA array to the image in place, starting at the given pixel;
+        values saturate at 255.
+        """
+        target = self.rgba[row:row+rgba.shape[0], column:column+rgba.shape[1]]
+        np.add(target, np.minimum(rgba, 255 - target), out=target)
+
+
+    def clear(self, mask, row=0, column=0):
+        """
+        Set the pixels within the region of the wordcloud mask (see _get_mask) to zero;
+        the mask can be cropped, starting at the given pixel.
+        """
+        r0, r1, c0, c1 = _get_mask_extent(mask)
+        self.rgba[row+r0:row+r1, column+c0:column+c1][mask[r0:r1, c0:c1] == 0] = 0
+
+
+    def update(self):
+        """
+        Redraw the image after its pixels have changed.
+        """
+        self.image.set_data(self.rgba)
+        self.draw_idle()
+
 
-        # initialise pixel array
-        self.rgba = np.zeros((self.y_resolution, self.x_resolution, 4), dtype=np.float64)
+    def draw_idle(self):
+        canvas = self.ax.get_figure().canvas
+        if canvas is not None:
+            canvas.draw_idle()
 
 
     def imshow(self, **imshow_kwargs):
@@ -526,7 +3188,7 @@ class _AxisImage(object):
         subax = fig.add_axes(bbox, facecolor=None)
 
         # plot image
-        subax.imshow(self.rgba, **imshow_kwargs)
+        self.image = subax.imshow(self.rgba, **imshow_kwargs)
 
         # make pretty
         subax.set_frame_on(False)
@@ -0,0 +1,295 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# _packing.py --- Pack the words of all subsets into one shared canvas.
+
+# Copyright (C) 2017 Paul Brodersen <paulbrodersen+matplotlib_venn_wordcloud@gmail.com>
+
+# Author: Paul Brodersen <paulbrodersen+matplotlib_venn_wordcloud@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# Except as contained in this notice, the name(s) of the above copyright
+# holders shall not be used in advertising or otherwise to promote the sale,
+# use or other dealings in this Software without prior written authorization.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+Pack the words of all subsets into one shared canvas.
+"""
+
+import numpy as np
+
+from operator import itemgetter
+from random import Random
+
+from matplotlib_venn_wordcloud._main import _get_glyph, _get_text_extents
+
+
+# same value as PIL.Image.ROTATE_90, which WordCloud uses for vertical words
+_ROTATE_90 = 2
+
+
+def pack_words(jobs, offsets, image_shape, max_font_size=None, min_font_size=None, **wordcloud_kwargs):
+    """
+    Lay out the words of all subsets on one canvas in a single pass,
+    in order of decreasing frequency across all subsets.
+
+    Each word is placed into the region of its subset, using a summed-area
+    table of the pixels of the shared occupancy map that are occupied or
+    lie outside of the region. The font size of each word is proportional
+    to its frequency to the power of relative_scaling; if a word does not
+    fit, its font size is decreased until it does, and the font sizes of
+    all following words are scaled down accordingly. Hence, the font sizes
+    are consistent with the word frequencies across all subsets by
+    construction, and no calibration pass is required. Once a word does not
+    fit into its region even at the minimum font size, no further words
+    are placed there.
+
+    WordCloud instead derives the font size of each word from the font size
+    of the previous word, which would make the font sizes depend on how the
+    words of the different subsets interleave. For Zipf distributed
+    frequencies, both rules result in similar font sizes.
+
+    Arguments:
+    ----------
+    jobs: list of (uid, mask, frequencies) tuples
+        wordcloud mask (see _main._get_mask) and dict word : frequency of each subset
+
+    offsets: dict uid : (row, column)
+        position of each mask within the canvas
+
+    image_shape: tuple
+        shape of the canvas (rows, columns, ...)
+
+    max_font_size: int or None (default: None)
+        font size of the most frequent word;
+        None determines it from the first two words, as in WordCloud
+
+    min_font_size: int or None (default: None)
+        smallest font size at which words are placed (default: 4, as in WordCloud)
+
+    **wordcloud_kwargs:
+        font_path, margin, prefer_horizontal, relative_scaling, font_step,
+        max_words (per subset), and random_state are used as in WordCloud;
+        the remaining arguments only affect how the words are drawn
+
+    Returns:
+    --------
+    layouts: dict uid : layout
+        layout of each subset in the format of WordCloud.layout_, with positions
+        relative to the offset of the mask; the colours are None (see WordCloud.recolor)
+
+    """
+
+    packer = _Packer(min_font_size=min_font_size, **wordcloud_kwargs)
+
+    # all words in order of decreasing frequency; ties are kept in the order of the subsets
+    entries = []
+    for uid, _, frequencies in jobs:
+        items = sorted(frequencies.items(), key=itemgetter(1), reverse=True)[:packer.max_words]
+        entries.extend((uid, word, frequency) for word, frequency in items if frequency > 0)
+    entries.sort(key=itemgetter(2), reverse=True)
+
+    if not entries:
+        return {uid : [] for uid, _, _ in jobs}
+
+    max_frequency = float(entries[0][2])
+    entries = [(uid, word, frequency / max_frequency) for uid, word, frequency in entries]
+
+    if max_font_size is None:
+        # As WordCloud, lay out the first two words with the largest possible
+        # font size, and start from the harmonic mean of their font sizes.
+        uids = {uid for uid, _, _ in entries[:2]}
+        trial_jobs = [job for job in jobs if job[0] in uids]
+        start = max(mask.shape[0] for _, mask, _ in trial_jobs)
+        trial = packer.place_words(_SharedCanvas(trial_jobs, offsets, image_shape), entries[:2], start)
+        sizes = [font_size for uid, _, _ in entries[:2] for _, font_size, _, _, _ in trial[uid]][:2]
+        if len(sizes) == 0:
+            return {uid : [] for uid, _, _ in jobs}
+        elif len(sizes) == 1:
+            max_font_size = sizes[0]
+        else:
+            max_font_size = int(2 * sizes[0] * sizes[1] / (sizes[0] + sizes[1]))
+
+    return packer.place_words(_SharedCanvas(jobs, offsets, image_shape), entries, max_font_size)
+
+
+class _SharedCanvas(object):
+    """
+    Occupancy map shared by the regions of all subsets.
+
+    For each region, a summed-area table (with a leading row and column of
+    zeros) counts the pixels within the bounding box of the region that
+    are either occupied or not part of the region, such that a box of any
+    size is checked in constant time, and all boxes at once in a few
+    vectorized operations.
+    """
+
+    def __init__(self, jobs, offsets, image_shape):
+        self.occupied = np.ones(image_shape[:2], dtype=bool)
+        self.extents = dict()
+        for uid, mask, _ in jobs:
+            row, column = offsets[uid]
+            self.extents[uid] = (slice(row, row + mask.shape[0]), slice(column, column + mask.shape[1]))
+            self.occupied[self.extents[uid]][mask != 255] = False
+
+        self.integrals = dict()
+        for uid, mask, _ in jobs:
+            blocked = self.occupied[self.extents[uid]] | (mask == 255)
+            integral = np.zeros((blocked.shape[0] + 1, blocked.shape[1] + 1), dtype=np.int32)
+            np.cumsum(np.cumsum(blocked, axis=0, dtype=np.int32), axis=1, out=integral[1:, 1:])
+            self.integrals[uid] = integral
+
+
+    def sample_position(self, uid, height, width, random_state):
+        """
+        Returns the top left corner (relative to the mask) of a randomly
+        chosen free box of the given size within the region, or None.
+        """
+        integral = self.integrals[uid]
+        height, width = max(height, 1), max(width, 1)
+        if (height >= integral.shape[0]) or (width >= integral.shape[1]):
+            return None
+        free = (integral.shape[0] - 1) * (integral.shape[1] - 1) - integral[-1, -1]
+        if free < height * width:
+            return None
+
+        blocked = integral[height:, width:] - integral[:-height, width:]
+        blocked -= integral[height:, :-width]
+        blocked += integral[:-height, :-width]
+        hits = np.flatnonzero(blocked == 0)
+        if len(hits) == 0:
+            return None
+        return divmod(int(hits[random_state.randrange(len(hits))]), blocked.shape[1])
+
+
+    def place(self, uid, glyph, row, column):
+        """
+        Mark the pixels of the glyph (a boolean array) at the given
+        position (relative to the mask) as occupied.
+        """
+        rows, columns = self.extents[uid]
+        height, width = glyph.shape
+        self.occupied[rows.start + row : rows.start + row + height,
+                      columns.start + column : columns.start + column + width] |= glyph
+
+        # The glyph lies within a free box, so the summed-area table increases
+        # by the cumulative sum of the glyph below and to the right of its corner.
+        added = np.cumsum(np.cumsum(glyph, axis=0, dtype=np.int32), axis=1)
+        integral = self.integrals[uid]
+        r0, c0 = row + 1, column + 1
+        r1, c1 = r0 + height, c0 + width
+        integral[r0:r1, c0:c1] += added
+        integral[r0:r1, c1:]   += added[:, -1:]
+        integral[r1:, c0:c1]   += added[-1:, :]
+        integral[r1:, c1:]     += added[-1, -1]
+
+
+class _Packer(object):
+    """
+    Places words onto a _SharedCanvas following the rules of WordCloud.generate_from_frequencies.
+    """
+
+    def __init__(self, font_path=None, margin=2, prefer_horizontal=0.9, relative_scaling='auto', font_step=1,
+                 max_words=200, min_font_size=None, random_state=None, repeat=False, **kwargs):
+
+        if not font_path:
+            from wordcloud.wordcloud import FONT_PATH
+            font_path = FONT_PATH
+
+        self.font_path         = font_path
+        self.margin            = margin
+        self.prefer_horizontal = prefer_horizontal
+        self.relative_scaling  = (0 if repeat else .5) if relative_scaling == 'auto' else relative_scaling
+        self.font_step         = font_step
+        self.max_words         = max_words
+        self.min_font_size     = 4 if min_font_size is None else min_font_size
+        self.random_state      = Random(random_state) if isinstance(random_state, int) else (random_state or Random())
+
+
+    def place_words(self, canvas, entries, font_size):
+        """
+        Place the words (uid, word, frequency) in the given order, with
+        frequencies normalised to at most one; font_size is the font size
+        of a word with frequency one. Returns the layout of each region.
+        """
+
+        layouts = {uid : [] for uid in canvas.extents}
+        full = set()
+        for uid, word, frequency in entries:
+            if uid in full:
+                continue
+
+            weight = frequency ** self.relative_scaling
+            size = int(round(font_size * weight))
+            if size < self.min_font_size:
+                # all remaining words would be smaller still
+                break
+
+            if self.random_state.random() < self.prefer_horizontal:
+                orientation = None
+            else:
+                orientation = _ROTATE_90
+
+            size, orientation, position = self._find_position(canvas, uid, word, size, orientation)
+            if position is None:
+                full.add(uid)
+                continue
+
+            glyph = _get_glyph(word, self.font_path, size, orientation) > 0
+            row, column = position[0] + self.margin // 2, position[1] + self.margin // 2
+            canvas.place(uid, glyph, row, column)
+            layouts[uid].append(((word, frequency), size, (row, column), orientation, None))
+
+            # the font size scale never increases, so the font sizes remain consistent across subsets
+            font_size = min(font_size, size / weight)
+
+        return layouts
+
+
+    def _find_position(self, canvas, uid, word, font_size, orientation):
+        # try the given orientation, then the other orientation,
+        # then the largest smaller font size at which the word fits horizontally
+        orientations = [orientation]
+        if self.prefer_horizontal < 1:
+            orientations.append(None if orientation == _ROTATE_90 else _ROTATE_90)
+        for orientation in orientations:
+            position = self._sample_position(canvas, uid, word, font_size, orientation)
+            if position is not None:
+                return font_size, orientation, position
+
+        # WordCloud decreases the font size one step at a time; as smaller
+        # words fit wherever larger words fit, a bisection finds the same size.
+        sizes = range(font_size - self.font_step, self.min_font_size - 1, -self.font_step)
+        lo, hi = 0, len(sizes)
+        found = None
+        while lo < hi:
+            mid = (lo + hi) // 2
+            position = self._sample_position(canvas, uid, word, sizes[mid], None)
+            if position is None:
+                lo = mid + 1
+            else:
+                hi = mid
+                found = sizes[mid], None, position
+        return found or (None, None, None)
+
+
+    def _sample_position(self, canvas, uid, word, font_size, orientation):
+        height, width = _get_text_extents(word, self.font_path, font_size, orientation)
+        return canvas.sample_position(uid, height + self.margin, width + self.margin, self.random_state)
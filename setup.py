@@ -13,11 +13,11 @@ setup(
         'Intended Audience :: Science/Research',
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
-        'Programming Language :: Python :: 2',
         'Programming Language :: Python :: 3',
         'Topic :: Scientific/Engineering :: Visualization'
     ],
     platforms=['Platform Independent'],
-    packages=find_packages(),
+    packages=find_packages(exclude=['tests', 'benchmarks']),
+    python_requires='>=3.7',
     install_requires=['numpy', 'matplotlib', 'matplotlib-venn', 'wordcloud'],
 )
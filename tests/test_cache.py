@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Check the persistent cache of word cloud layouts (see LayoutCache).
+"""
+
+import os
+import sys
+import subprocess
+import pytest
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from matplotlib_venn_wordcloud import venn2_wordcloud, LayoutCache
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SETS = [set('alpha beta gamma delta epsilon'.split()), set('gamma delta zeta eta theta'.split())]
+LAYOUTS = {'10': [[['alpha', 1.0], 20, [3, 4], None, 'rgb(10, 20, 30)']]}
+
+# prints the names of the cache entries written by a render
+RENDER = '''
+import os, sys
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib_venn_wordcloud import venn2_wordcloud
+sets = [set('alpha beta gamma delta epsilon'.split()), set('gamma delta zeta eta theta'.split())]
+venn2_wordcloud(sets, wordcloud_kwargs=dict(random_state=42), cache=sys.argv[1])
+print(sorted(os.listdir(sys.argv[1])))
+'''
+
+
+def get_rgba(seed=0):
+    return np.random.RandomState(seed).randint(0, 256, size=(40, 60, 4), dtype=np.uint8)
+
+
+def render(cache):
+    fig, ax = plt.subplots(1, 1)
+    venn = venn2_wordcloud(SETS, ax=ax, wordcloud_kwargs=dict(random_state=42), cache=cache)
+    plt.close(fig)
+    return venn
+
+
+def test_get_and_put(tmp_path):
+    cache = LayoutCache(str(tmp_path))
+    assert cache.get('key') is None
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    rgba = get_rgba()
+    cache.put('key', LAYOUTS, rgba, color_key='colormap=viridis')
+    entry = cache.get('key')
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert entry['layouts'] == LAYOUTS
+    assert np.array_equal(entry['rgba'], rgba)
+    assert entry['color_key'] == 'colormap=viridis'
+    assert len(cache) == 1
+
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_render_hit_after_miss(tmp_path):
+    cache = LayoutCache(str(tmp_path))
+    first = render(cache)
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert len(cache) == 1
+
+    second = render(cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert second.layouts == first.layouts
+
+
+def test_eviction(tmp_path):
+    cache = LayoutCache(str(tmp_path))
+    cache.put('a', LAYOUTS, get_rgba())
+    cache.put('b', LAYOUTS, get_rgba())
+    size = os.path.getsize(os.path.join(str(tmp_path), 'a.npz'))
+
+    # 'b' was used less recently than 'a'
+    os.utime(os.path.join(str(tmp_path), 'a.npz'), (1000, 1000))
+    os.utime(os.path.join(str(tmp_path), 'b.npz'), (2000, 2000))
+    assert cache.get('a') is not None
+
+    cache.max_size = 2 * size + size // 2
+    cache.put('c', LAYOUTS, get_rgba())
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+
+
+def test_key_stable_across_hash_seeds(tmp_path):
+    # the iteration order of sets of strings depends on the hash seed
+    entries = []
+    for seed in ('0', '1', '2'):
+        path = str(tmp_path / seed)
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+        output = subprocess.check_output([sys.executable, '-c', RENDER, path], env=env, cwd=ROOT)
+        entries.append(output.decode().strip())
+    assert entries[0] != '[]'
+    assert entries[1:] == entries[:1] * 2
+
+
+@pytest.mark.parametrize('corrupt', [
+    lambda data: data[:len(data) // 2],
+    lambda data: data[:200] + bytes(byte ^ 0xff for byte in data[200:400]) + data[400:],
+    lambda data: b'',
+], ids=['truncated', 'garbled', 'empty'])
+def test_corrupt_entry(tmp_path, corrupt):
+    cache = LayoutCache(str(tmp_path))
+    venn = render(cache)
+    (filename,) = [os.path.join(str(tmp_path), name) for name in os.listdir(str(tmp_path))]
+    with open(filename, 'rb') as fh:
+        data = fh.read()
+    with open(filename, 'wb') as fh:
+        fh.write(corrupt(data))
+
+    # the corrupt entry is treated as missing and replaced
+    assert render(cache).layouts == venn.layouts
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert render(cache).layouts == venn.layouts
+    assert cache.hits == 1
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Check that the font sizes chosen with the coarse calibration are within
+the documented tolerance (see _get_coarse_font_size_bounds) of the font
+sizes chosen with the exact (two-pass) calibration.
+"""
+
+import pytest
+
+from matplotlib_venn_wordcloud._main import (
+    _COARSE_RESOLUTION,
+    _DEFAULT_STYLES,
+    _WordcloudRenderer,
+    _get_extended_venn,
+    _get_headless_figure,
+)
+
+from benchmarks.bench_calibration import get_ex2_sets, get_ex3_sets, get_random_sets
+from benchmarks.bench_pipeline import get_sets
+
+
+# tolerance of the coarse calibration (see _get_coarse_font_size_bounds)
+RELATIVE_TOLERANCE = 0.1
+ABSOLUTE_TOLERANCE = 1000 // _COARSE_RESOLUTION # downsampling factor at the default resolution
+
+
+def get_renderer(sets, word_to_frequency, calibration):
+    fig, ax = _get_headless_figure()
+    set_colors, set_edgecolors, alpha = _DEFAULT_STYLES[len(sets)]
+    venn = _get_extended_venn(sets, None, set_colors, set_edgecolors, alpha, ax)
+    renderer = _WordcloudRenderer(venn, ax, word_to_frequency, calibration, random_state=42)
+    renderer.step() # calibration
+    renderer.step() # layout
+    return renderer
+
+
+def get_font_sizes(sets, word_to_frequency, calibration):
+    """
+    Returns the maximum and minimum font size chosen for each subset.
+    """
+    renderer = get_renderer(sets, word_to_frequency, calibration)
+    return renderer.max_font_sizes, renderer.min_font_sizes
+
+
+def assert_within_tolerance(result, expected, uid):
+    assert abs(result - expected) <= RELATIVE_TOLERANCE * expected + ABSOLUTE_TOLERANCE, \
+        "Subset {}: coarse font size {:.1f} differs from exact font size {:.1f}".format(uid, result, expected)
+
+
+@pytest.mark.parametrize('get_sets', [get_ex2_sets, get_ex3_sets, get_random_sets])
+def test_coarse_calibration(get_sets):
+    sets, word_to_frequency = get_sets()
+    exact = get_font_sizes(sets, word_to_frequency, 'exact')
+    coarse = get_font_sizes(sets, word_to_frequency, 'coarse')
+    # without word frequencies, the smallest font size is packing noise (see _get_coarse_font_size_bounds)
+    checked = zip(exact, coarse) if word_to_frequency else zip(exact[:1], coarse[:1])
+    for expected, result in checked:
+        assert set(result) == set(expected)
+        for uid in expected:
+            assert_within_tolerance(result[uid], expected[uid], uid)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_coarse_calibration_spread_frequencies(seed):
+    # Many words share the smallest font size, and which of them is
+    # returned can differ, such that only the font size bounds of each
+    # subset and the reconciled maximum font sizes are within tolerance.
+    # distinct frequencies spanning the full range (frequency ~ 1 / rank)
+    sets, word_to_frequency = get_sets(total_sets=2, total_words=300, seed=seed)
+    exact = get_renderer(sets, word_to_frequency, 'exact')
+    coarse = get_renderer(sets, word_to_frequency, 'coarse')
+    assert set(coarse.font_size_bounds) == set(exact.font_size_bounds)
+    for uid, expected in exact.font_size_bounds.items():
+        result = coarse.font_size_bounds[uid]
+        assert result[2] == expected[2], "Subset {}: words with the maximum font size differ".format(uid)
+        assert_within_tolerance(result[0], expected[0], uid)
+        assert_within_tolerance(result[1], expected[1], uid)
+        assert_within_tolerance(coarse.max_font_sizes[uid], exact.max_font_sizes[uid], uid)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Check that laying out each word cloud on a mask cropped to the bounding
+box of its patch (see _get_crop_extent) yields the same image as laying
+it out on the whole mask.
+"""
+
+import pytest
+import numpy as np
+
+from matplotlib_venn_wordcloud import _main
+from matplotlib_venn_wordcloud._main import (
+    _DEFAULT_STYLES,
+    _WordcloudRenderer,
+    _get_extended_venn,
+    _get_headless_figure,
+)
+
+from benchmarks.bench_pipeline import get_sets
+
+
+def get_full_extent(mask, alignment=1):
+    return 0, mask.shape[0], 0, mask.shape[1]
+
+
+def render(sets, word_to_frequency, calibration):
+    fig, ax = _get_headless_figure()
+    set_colors, set_edgecolors, alpha = _DEFAULT_STYLES[len(sets)]
+    venn = _get_extended_venn(sets, None, set_colors, set_edgecolors, alpha, ax)
+    renderer = _WordcloudRenderer(venn, ax, word_to_frequency, calibration, random_state=42)
+    while not renderer.done:
+        renderer.step()
+    return renderer
+
+
+@pytest.mark.parametrize('total_sets', [2, 3])
+@pytest.mark.parametrize('calibration', ['exact', 'coarse', 'estimate'])
+def test_cropped_masks(monkeypatch, total_sets, calibration):
+    sets, word_to_frequency = get_sets(total_sets=total_sets, total_words=300)
+    cropped = render(sets, word_to_frequency, calibration)
+    assert any(offset != (0, 0) for offset in cropped.offsets.values())
+
+    monkeypatch.setattr(_main, '_get_crop_extent', get_full_extent)
+    uncropped = render(sets, word_to_frequency, calibration)
+    assert all(offset == (0, 0) for offset in uncropped.offsets.values())
+
+    assert cropped.font_size_bounds == uncropped.font_size_bounds
+    assert np.array_equal(cropped.img.rgba, uncropped.img.rgba)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Check exporting the layouts of a diagram (see the .export_layout method
+of the diagrams returned by venn2_wordcloud and venn3_wordcloud) and
+drawing them again with load_layout.
+"""
+
+import json
+import pytest
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba
+
+from matplotlib_venn_wordcloud import venn2_wordcloud, venn3_wordcloud, load_layout
+
+from benchmarks.bench_pipeline import get_sets
+
+
+# precision of the exported coordinates (see .export_layout)
+PRECISION = 4
+
+
+@pytest.fixture(params=[2, 3])
+def venn(request):
+    sets, word_to_frequency = get_sets(total_sets=request.param, total_words=100)
+    venn_wordcloud = venn2_wordcloud if request.param == 2 else venn3_wordcloud
+    fig, ax = plt.subplots(1, 1)
+    yield venn_wordcloud(sets, ax=ax, word_to_frequency=word_to_frequency,
+                         wordcloud_kwargs=dict(random_state=42), output='text')
+    plt.close('all')
+
+
+def describe(texts):
+    return [(text.get_text(), text.get_position(), text.get_fontsize(), to_rgba(text.get_color()), text.get_rotation())
+            for text in texts]
+
+
+def assert_same_texts(result, expected):
+    # subsets without words may or may not have an entry
+    assert {uid for uid, texts in result.items() if texts} == {uid for uid, texts in expected.items() if texts}
+    for uid in result:
+        words = describe(result[uid])
+        expected_words = describe(expected.get(uid, []))
+        assert [word[0] for word in words] == [word[0] for word in expected_words], \
+            "Words of subset {} differ!".format(uid)
+        for (_, position, font_size, color, rotation), expected_word in zip(words, expected_words):
+            assert np.allclose(position, expected_word[1], rtol=0, atol=10**-PRECISION)
+            assert np.isclose(font_size, expected_word[2], rtol=1e-2)
+            assert (color, rotation) == expected_word[3:]
+
+
+def test_round_trip(venn):
+    data = venn.export_layout()
+    assert isinstance(data, str)
+
+    # the loaded words match the words that the diagram itself added as text
+    fig, ax = plt.subplots(1, 1)
+    word_texts = load_layout(data, ax=ax)
+    assert_same_texts(word_texts, venn.word_texts)
+
+    # as do the words loaded from the decoded layout
+    fig, ax = plt.subplots(1, 1)
+    assert_same_texts(load_layout(json.loads(data), ax=ax), word_texts)
+
+
+def test_version_mismatch(venn):
+    layout = json.loads(venn.export_layout())
+    layout['version'] += 1
+    with pytest.raises(AssertionError, match='version'):
+        load_layout(layout)
+
+
+def test_msgpack(venn):
+    msgpack = pytest.importorskip('msgpack')
+    data = venn.export_layout(fmt='msgpack')
+    assert isinstance(data, bytes)
+    assert msgpack.unpackb(data, raw=False) == json.loads(venn.export_layout())
+
+    fig, ax = plt.subplots(1, 1)
+    json_texts = load_layout(venn.export_layout(), ax=ax)
+    fig, ax = plt.subplots(1, 1)
+    assert_same_texts(load_layout(data, ax=ax), json_texts)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Check that the words drawn from the cached glyphs (see _draw_layout)
+are identical to the words drawn by WordCloud.to_array.
+"""
+
+import pytest
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from matplotlib_venn_wordcloud import venn3_wordcloud
+from matplotlib_venn_wordcloud._main import _draw_layout, _get_wordcloud_from_layout
+
+from benchmarks.bench_pipeline import get_sets
+
+
+COLORS = ['rgb(200, 30, 90)', (20, 120, 200, 128)]
+
+
+def get_layouts(layout_engine):
+    sets, word_to_frequency = get_sets(total_sets=3, total_words=300, seed=0)
+    fig, ax = plt.subplots(1, 1)
+    venn = venn3_wordcloud(sets, ax=ax, word_to_frequency=word_to_frequency,
+                           wordcloud_kwargs=dict(random_state=42),
+                           calibration='estimate', layout_engine=layout_engine)
+    plt.close(fig)
+    return venn.layouts
+
+
+@pytest.mark.parametrize('layout_engine', ['wordcloud', 'numpy'])
+def test_draw_layout(layout_engine):
+    mask = np.zeros((1000, 1000), dtype=np.uint8) # only the shape matters
+    shape, pad = (400, 600), 50
+    for uid, layout in get_layouts(layout_engine).items():
+        # alternate between colour strings and RGBA tuples with transparency
+        layout = [(item, font_size, position, orientation, COLORS[ii % 2])
+                  for ii, (item, font_size, position, orientation, _) in enumerate(layout)]
+        wc = _get_wordcloud_from_layout(mask, layout)
+        expected = np.pad(wc.to_array(), ((pad, 0), (pad, 0), (0, 0)))
+        # windows of the word cloud, to also check the clipping at the borders
+        for row, column in [(0, 0), (50, 100), (-20, -30)]:
+            actual = _draw_layout(layout, shape, wc.font_path, row, column)
+            window = expected[pad + row:pad + row + shape[0], pad + column:pad + column + shape[1]]
+            assert np.array_equal(actual, window), \
+                "Cached glyphs of subset {} differ from WordCloud at offset {}!".format(uid, (row, column))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Check the headless rendering into arrays (render_to_array, venn_wordcloud_batch).
+"""
+
+import pytest
+import numpy as np
+
+from matplotlib_venn_wordcloud import render_to_array, venn_wordcloud_batch
+from matplotlib_venn_wordcloud._main import (
+    _LRUCache,
+    _MIN_AUTO_RESOLUTION,
+    _get_axis_image,
+    _get_headless_figure,
+)
+
+
+SETS = [
+    set('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt'.split()),
+    set('ut labore et dolore magna aliqua enim ad minim veniam quis nostrud exercitation elit sed'.split()),
+    set('ullamco laboris nisi ut aliquip ex ea commodo consequat duis aute irure dolor in reprehenderit'.split()),
+]
+
+
+@pytest.mark.parametrize('size', [100, 240])
+def test_render_small_array(size):
+    rgba = render_to_array(SETS, width=size, height=size, wordcloud_kwargs=dict(random_state=42))
+    assert rgba.shape == (size, size, 4)
+    assert rgba.dtype == np.uint8
+
+
+@pytest.mark.parametrize('resolution', [300, 1200])
+def test_render_array_with_resolution(resolution):
+    rgba = render_to_array(SETS[:2], width=400, height=300, resolution=resolution,
+                           wordcloud_kwargs=dict(random_state=42))
+    assert rgba.shape == (300, 400, 4)
+
+
+def test_batch_small_arrays():
+    results = list(venn_wordcloud_batch([SETS, SETS[:2]], output='array', figsize=(1, 1), dpi=80,
+                                        wordcloud_kwargs=dict(random_state=42)))
+    assert [rgba.shape for rgba in results] == [(80, 80, 4), (80, 80, 4)]
+
+
+def test_auto_resolution():
+    # large axes are laid out at their pixel size, small axes at the minimum resolution
+    for size, expected in [(4000, None), (200, _MIN_AUTO_RESOLUTION)]:
+        fig, ax = _get_headless_figure((size / 100., size / 100.), 100)
+        img = _get_axis_image(ax, 'auto')
+        bbox = ax.get_window_extent()
+        assert img.x_resolution == (expected or int(round(bbox.x1)) - int(round(bbox.x0)))
+
+
+def test_lru_cache_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    cache = _LRUCache(maxsize=50)
+
+    def work(seed):
+        rng = np.random.RandomState(seed)
+        for key in rng.randint(0, 100, size=20000):
+            if cache.get(key) is None:
+                cache.put(key, key)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(work, range(8)))
+    assert cache.size == len(cache) == 50
+
+
+def test_render_array_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    expected = render_to_array(SETS, width=300, height=300, wordcloud_kwargs=dict(random_state=42))
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: render_to_array(SETS, width=300, height=300,
+                                                              wordcloud_kwargs=dict(random_state=42)), range(8)))
+    for rgba in results:
+        assert np.array_equal(rgba, expected)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Check that importing the package is fast, i.e. that the heavy
+dependencies are only imported once a diagram is rendered, and that
+the headless rendering does not create figures managed by pyplot.
+"""
+
+import os
+import sys
+import json
+import subprocess
+import pytest
+
+
+HEAVY_MODULES = ['matplotlib', 'matplotlib.pyplot', 'matplotlib_venn', 'wordcloud', 'PIL']
+
+# code paths that should not import any of the heavy modules
+LIGHTWEIGHT = {
+    'package'    : "import matplotlib_venn_wordcloud",
+    'main'       : "import matplotlib_venn_wordcloud._main",
+    'membership' : "from matplotlib_venn_wordcloud._main import _get_words_by_id; _get_words_by_id([{'a', 'b'}, {'b', 'c'}])",
+    'cache'      : "import tempfile; from matplotlib_venn_wordcloud import LayoutCache; LayoutCache(tempfile.mkdtemp()).get('0')",
+}
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# generous upper bound on the import time (in seconds), which includes numpy
+MAX_IMPORT_DURATION = 2.
+
+
+def get_imported_modules(statement):
+    """
+    Run the statement in a fresh interpreter, and return its duration and
+    the heavy modules that were imported.
+    """
+
+    code = "\n".join([
+        "import sys, time, json",
+        "tic = time.perf_counter()",
+        statement,
+        "duration = time.perf_counter() - tic",
+        "print(json.dumps([duration, [name for name in {!r} if name in sys.modules]]))".format(HEAVY_MODULES),
+    ])
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+@pytest.mark.parametrize('name', list(LIGHTWEIGHT))
+def test_lightweight_imports(name):
+    duration, modules = get_imported_modules(LIGHTWEIGHT[name])
+    assert not modules, "{} imports {}!".format(name, ', '.join(modules))
+    assert duration < MAX_IMPORT_DURATION, "{} takes {:.2f}s!".format(name, duration)
+
+
+def test_headless_without_pyplot_figures():
+    # matplotlib_venn imports pyplot itself, but no figures should be managed by pyplot
+    code = "\n".join([
+        "from matplotlib_venn_wordcloud import render_to_array",
+        "render_to_array([{'a', 'b'}, {'b', 'c'}])",
+        "import matplotlib.pyplot as plt",
+        "print(len(plt.get_fignums()))",
+    ])
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    assert output.split()[-1] == '0'
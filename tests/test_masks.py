@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Check that the analytic, bounding box limited mask rasterization
+matches testing every pixel of the axis with Path.contains_points.
+"""
+
+import pytest
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from matplotlib_venn import venn2, venn3
+from matplotlib_venn_wordcloud._main import (
+    _AxisImage,
+    _get_path,
+    _get_region_circles,
+    _rasterize,
+)
+
+
+def get_regions(total_sets, seed, resolution=1000):
+    """
+    Returns the axis image, and the uid, path and circles of each region
+    of a random venn diagram with the given number of sets.
+    """
+    rng = np.random.RandomState(seed)
+    sets = [set(rng.choice(200, rng.randint(1, 150), replace=False)) for _ in range(total_sets)]
+    fig, ax = plt.subplots(1,1)
+    venn = venn2(sets, ax=ax) if total_sets == 2 else venn3(sets, ax=ax)
+    img = _AxisImage(ax, resolution=resolution)
+    regions = []
+    for uid in ['10', '01', '11'] if total_sets == 2 else ['100', '010', '110', '001', '101', '011', '111']:
+        patch = venn.get_patch_by_id(uid)
+        if patch is not None:
+            regions.append((uid, _get_path(patch), _get_region_circles(venn, uid)))
+    plt.close(fig)
+    return img, regions
+
+
+@pytest.mark.parametrize('resolution', [333, 1000])
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('total_sets', [2, 3])
+def test_rasterize_matches_contains_points(total_sets, seed, resolution):
+    img, regions = get_regions(total_sets, seed, resolution)
+    assert regions
+    for uid, path, circles in regions:
+        expected = path.contains_points(img.pixel_coordinates).reshape((img.y_resolution, img.x_resolution))
+        assert np.array_equal(_rasterize(img, path, circles), expected), \
+            "Mask of region {} differs from contains_points (circles)!".format(uid)
+        assert np.array_equal(_rasterize(img, path), expected), \
+            "Mask of region {} differs from contains_points (bounding box)!".format(uid)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Check that laying out the word clouds in parallel (n_jobs, executor)
+yields the same layouts and pixels as the serial path.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from matplotlib_venn_wordcloud import venn3_wordcloud, render_to_array
+
+
+SETS = [
+    set('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt'.split()),
+    set('ut labore et dolore magna aliqua enim ad minim veniam quis nostrud exercitation elit sed'.split()),
+    set('ullamco laboris nisi ut aliquip ex ea commodo consequat duis aute irure dolor in reprehenderit'.split()),
+]
+
+
+def render(**kwargs):
+    """
+    Returns the layouts and the pixels of the drawn figure.
+    """
+    fig, ax = plt.subplots(1, 1)
+    venn = venn3_wordcloud(SETS, ax=ax, wordcloud_kwargs=dict(random_state=42), **kwargs)
+    fig.canvas.draw()
+    pixels = np.array(fig.canvas.buffer_rgba())
+    plt.close(fig)
+    return venn.layouts, pixels
+
+
+def test_n_jobs():
+    layouts, pixels = render()
+    parallel_layouts, parallel_pixels = render(n_jobs=2)
+    assert parallel_layouts == layouts
+    assert np.array_equal(parallel_pixels, pixels)
+
+
+@pytest.mark.parametrize('calibration', ['exact', 'coarse', 'estimate'])
+def test_executor(calibration):
+    layouts, pixels = render(calibration=calibration)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        parallel_layouts, parallel_pixels = render(calibration=calibration, executor=executor)
+    assert parallel_layouts == layouts
+    assert np.array_equal(parallel_pixels, pixels)
+
+
+def test_render_to_array():
+    expected = render_to_array(SETS, wordcloud_kwargs=dict(random_state=42))
+    assert np.array_equal(render_to_array(SETS, n_jobs=2, wordcloud_kwargs=dict(random_state=42)), expected)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert np.array_equal(render_to_array(SETS, executor=executor, wordcloud_kwargs=dict(random_state=42)), expected)
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Check that passing only the max_words most frequent words of each subset
+to the packing algorithm does not change the layouts.
+"""
+
+import pytest
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from matplotlib_venn_wordcloud._main import _get_top_indices
+
+from benchmarks.bench_pruning import get_sets, render
+
+
+@pytest.mark.parametrize('max_words', [None, 50])
+def test_pruning_keeps_layouts(max_words):
+    sets, word_to_frequency = get_sets(2000)
+    wordcloud_kwargs = dict() if max_words is None else dict(max_words=max_words)
+    pruned = render(sets, word_to_frequency, True, **wordcloud_kwargs)
+    unpruned = render(sets, word_to_frequency, False, **wordcloud_kwargs)
+    plt.close('all')
+    assert pruned.layouts == unpruned.layouts
+    for uid, words in pruned.words_by_id.items():
+        assert pruned.dropped_word_counts[uid] == max(0, len(words) - (max_words or 200))
+
+
+def test_top_indices_ties():
+    frequencies = np.array([1., 3., 2., 3., 2., 2., 1.])
+    assert _get_top_indices(frequencies, 4).tolist() == [1, 2, 3, 4]
+    assert _get_top_indices(frequencies, 10).tolist() == list(range(7))
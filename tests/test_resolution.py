@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Check that word clouds can be rendered onto small axes, i.e. at low resolutions.
+"""
+
+import warnings
+import pytest
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from matplotlib_venn_wordcloud import venn2_wordcloud, venn3_wordcloud
+
+
+def get_sets(seed):
+    # three sets of random sizes; depending on the overlaps, some regions are slivers
+    rng = np.random.RandomState(seed)
+    vocabulary = ['longerword{}'.format(ii) for ii in range(2000)]
+    return [set(rng.choice(vocabulary, size, replace=False)) for size in rng.randint(5, 400, size=3)]
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('resolution', ['auto', 200])
+@pytest.mark.parametrize('calibration', ['exact', 'coarse', 'estimate'])
+def test_small_axis(seed, resolution, calibration):
+    fig, ax = plt.subplots(figsize=(2, 2), dpi=100)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        venn = venn3_wordcloud(get_sets(seed), ax=ax, resolution=resolution, calibration=calibration,
+                               wordcloud_kwargs=dict(random_state=42))
+    plt.close(fig)
+
+    # regions that are too small for any word are skipped with a warning
+    skipped = [uid for uid in venn.uids if uid not in venn.layouts]
+    assert len(caught) >= len(skipped)
+    assert len(venn.layouts) > 0
+
+
+@pytest.mark.parametrize('calibration', ['exact', 'coarse', 'estimate'])
+def test_region_without_free_pixels(calibration):
+    # at this resolution, the intersection does not cover a single pixel of the mask
+    sets = [set(map(str, range(0, 1000))), set(map(str, range(999, 2000)))]
+    fig, ax = plt.subplots(1, 1)
+    with pytest.warns(UserWarning, match="subset 11 is too small to fit any word"):
+        venn = venn2_wordcloud(sets, ax=ax, resolution=60, calibration=calibration,
+                               wordcloud_kwargs=dict(random_state=42))
+    plt.close(fig)
+    assert set(venn.layouts) == {'10', '01'}
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Check plotting Venn diagrams from streams of tokens (venn_wordcloud_from_tokens).
+"""
+
+import pytest
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from matplotlib_venn_wordcloud import venn2_wordcloud, venn3_wordcloud, venn_wordcloud_from_tokens
+
+from benchmarks.bench_pipeline import get_sets
+
+
+def get_sources(total_sets, total_words=200):
+    """
+    Returns a list of tokens for each set, in which each word occurs
+    as often as its (distinct) rank, and the sets.
+    """
+    sets, word_to_frequency = get_sets(total_sets=total_sets, total_words=total_words)
+    counts = {word : int(round(1. / frequency)) for word, frequency in word_to_frequency.items()}
+    sources = [[word for word in sorted(words) for _ in range(counts[word])] for words in sets]
+    return sources, sets
+
+
+def render(sources, **kwargs):
+    fig, ax = plt.subplots(1, 1)
+    venn = venn_wordcloud_from_tokens(sources, ax=ax, wordcloud_kwargs=dict(random_state=42), **kwargs)
+    plt.close(fig)
+    return venn
+
+
+def get_subsets(sets):
+    subsets = dict()
+    for word in set.union(*sets):
+        uid = ''.join('1' if word in words else '0' for words in sets)
+        subsets.setdefault(uid, set()).add(word)
+    return subsets
+
+
+def test_file_sources(tmp_path):
+    lines = [['Alpha beta BETA gamma', 'delta'], ['gamma DELTA', 'epsilon Epsilon']]
+    paths = []
+    for ii, source in enumerate(lines):
+        path = tmp_path / 'source_{}.txt'.format(ii)
+        path.write_text('\n'.join(source), encoding='utf-8')
+        paths.append(str(path))
+
+    venn = render(paths, tokenize=lambda line: line.lower().split())
+    assert {uid : set(words) for uid, words in venn.words_by_id.items() if words} == \
+        {'10' : {'alpha', 'beta'}, '11' : {'gamma', 'delta'}, '01' : {'epsilon'}}
+    assert venn.subset_sizes == {'10' : 2, '01' : 1, '11' : 2}
+
+    # without tokenize, the lines are split at whitespace
+    venn = render(paths)
+    assert set(venn.words_by_id['10']) == {'Alpha', 'beta', 'BETA', 'delta'}
+
+    # the same tokens given as iterables
+    venn = render([' '.join(source).lower().split() for source in lines])
+    assert {uid : set(words) for uid, words in venn.words_by_id.items() if words} == \
+        {'10' : {'alpha', 'beta'}, '11' : {'gamma', 'delta'}, '01' : {'epsilon'}}
+
+
+@pytest.mark.parametrize('total_sets', [2, 3])
+def test_top_k(total_sets):
+    sources, sets = get_sources(total_sets)
+    counts = dict()
+    for source in sources:
+        for word in source:
+            counts[word] = counts.get(word, 0) + 1
+
+    top_k = 5
+    venn = render(sources, top_k=top_k)
+    subsets = get_subsets(sets)
+    assert venn.subset_sizes == {uid : len(subsets.get(uid, ())) for uid in venn.subset_sizes}
+    for uid, words in subsets.items():
+        expected = sorted(words, key=counts.__getitem__, reverse=True)[:top_k]
+        assert set(venn.words_by_id[uid]) == set(expected)
+        for (word, _), _, _, _, _ in venn.layouts.get(uid, []):
+            assert word in expected
+
+    # None keeps all words
+    venn = render(sources, top_k=None)
+    assert {uid : set(words) for uid, words in venn.words_by_id.items() if words} == subsets
+
+
+@pytest.mark.parametrize('total_sets', [2, 3])
+def test_geometry_from_subset_sizes(total_sets):
+    # the areas of the diagram reflect the full subsets, not the top_k words
+    sources, sets = get_sources(total_sets)
+    venn = render(sources, top_k=3)
+
+    venn_wordcloud = venn2_wordcloud if total_sets == 2 else venn3_wordcloud
+    fig, ax = plt.subplots(1, 1)
+    expected = venn_wordcloud(sets, ax=ax, wordcloud_kwargs=dict(random_state=42))
+    plt.close(fig)
+
+    for uid in expected.uids:
+        patch, expected_patch = venn.get_patch_by_id(uid), expected.get_patch_by_id(uid)
+        assert (patch is None) == (expected_patch is None)
+        if patch is not None:
+            assert np.allclose(patch.get_path().vertices, expected_patch.get_path().vertices)
+
+
+def test_empty_sources(tmp_path):
+    with pytest.raises(AssertionError, match='tokens'):
+        render([[], []])
+
+    paths = []
+    for ii in range(2):
+        path = tmp_path / 'empty_{}.txt'.format(ii)
+        path.write_text('\n \n', encoding='utf-8')
+        paths.append(str(path))
+    with pytest.raises(AssertionError, match='tokens'):
+        render(paths)
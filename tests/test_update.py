@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Check the incremental updates of a diagram (see the .update method of
+the diagrams returned by venn2_wordcloud and venn3_wordcloud).
+"""
+
+import copy
+import pytest
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from matplotlib_venn_wordcloud import venn2_wordcloud
+
+
+SETS = [set('alpha beta gamma delta epsilon'.split()), set('gamma delta zeta eta theta'.split())]
+WORD_TO_FREQUENCY = dict(alpha=5, beta=1, gamma=3, delta=2, epsilon=1, zeta=4, eta=1, theta=2)
+
+
+@pytest.fixture
+def venn():
+    fig, ax = plt.subplots(1, 1)
+    yield venn2_wordcloud(SETS, ax=ax, word_to_frequency=WORD_TO_FREQUENCY, wordcloud_kwargs=dict(random_state=42))
+    plt.close(fig)
+
+
+def get_state(venn):
+    return copy.deepcopy(venn.words_by_id), set(venn.uids), {uid : list(layout) for uid, layout in venn.layouts.items()}
+
+
+def test_add_word_without_frequency(venn):
+    before = get_state(venn)
+    with pytest.raises(AssertionError, match='iota'):
+        venn.update(added=[{'iota'}, None])
+    assert get_state(venn) == before
+
+    # the diagram can still be updated
+    venn.update(added=[{'iota'}, None], new_frequencies=dict(iota=3))
+    assert 'iota' in venn.words_by_id['10']
+    assert 'iota' in [word for (word, _), _, _, _, _ in venn.layouts['10']]
+
+
+def test_add_and_remove_words(venn):
+    venn.update(added=[None, {'alpha'}], removed=[{'beta'}, None])
+    words = {uid : set(words) for uid, words in venn.words_by_id.items()}
+    assert 'alpha' in words['11']
+    assert all('beta' not in subset for subset in words.values())
+    for uid, layout in venn.layouts.items():
+        assert {word for (word, _), _, _, _, _ in layout} <= words[uid]
+
+
+def test_remove_unknown_word(venn):
+    before = get_state(venn)
+    venn.update(removed=[{'nonexistent'}, None])
+    assert get_state(venn) == before
+
+    venn.update(removed=[['beta', 'nonexistent'], None])
+    assert all('beta' not in words for words in venn.words_by_id.values())
+    assert all('beta' not in [word for (word, _), _, _, _, _ in layout] for layout in venn.layouts.values())
+
+    # the diagram can still be updated
+    venn.update(added=[{'beta'}, None])
+    assert 'beta' in venn.words_by_id['10']